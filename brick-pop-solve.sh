@@ -1,8 +1,8 @@
 #!/usr/bin/env bash
 
 set -e
+set -o pipefail
 
 adb devices
-adb shell screencap -p | sed 's/\r$//' > brick-pop.png
-python src/solve.py brick-pop.png
-rm brick-pop.png
+# Pipe raw framebuffer output straight into the solver, skipping PNG encoding and temporary files
+adb exec-out screencap | python src/solve.py -
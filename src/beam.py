@@ -0,0 +1,84 @@
+import heapq
+
+from budget import Budget
+from budget import BudgetExhaustedException
+from budget import DEADLINE_CHECK_INTERVAL
+from prune import Pruner
+from solution import EmptySolution
+from solution import ScoredSolution
+
+# Default number of boards kept at each depth of a beam search
+DEFAULT_BEAM_WIDTH = 128
+
+
+def squared_pool_score(pool):
+    """
+    Score a single pop by the size of the pool it removes. The score grows with the square of the
+    size, so that building up and popping large pools is rewarded over popping many small ones.
+
+    :param pool: The Pool being popped.
+    :return: The number of points awarded for the pop.
+    """
+    return pool.size * pool.size
+
+
+def beam_solve(board, width=DEFAULT_BEAM_WIDTH, score=squared_pool_score, deadline=None,
+               pruner=None):
+    """
+    Search for the highest scoring solution with a beam search. The search proceeds one move at a
+    time, expanding every board in the beam and keeping only the width highest scoring boards that
+    result, so that both memory and time per move are bounded by the width.
+
+    Unlike the DFS solvers, beam search is not exhaustive: an EmptySolution means that no solution
+    was found within the beam, not that the board has none.
+
+    :param board: The board to solve.
+    :param width: The maximum number of boards to keep at each depth.
+    :param score: Function that takes the Pool popped by a move and returns the points awarded for
+                  it; the score of a solution is the sum of the points of its moves.
+    :param deadline: Wall clock time, as returned by time.time(), after which the search must stop
+                     and return the best solution found so far; or None for no time limit.
+    :param pruner: Pruner used to drop boards that can never be solved from the beam. A new Pruner
+                   with the default rules is created if none is specified.
+    :return: A ScoredSolution with the highest score found, or an EmptySolution if no solution was
+             found.
+    """
+    if pruner is None:
+        pruner = Pruner()
+    budget = Budget(deadline, check_interval=DEADLINE_CHECK_INTERVAL)
+
+    if board.is_solved():
+        return ScoredSolution(tuple([]), 0)
+
+    best = EmptySolution()
+    beam = [(0, tuple([]), board)]
+
+    try:
+        while beam:
+            # Keep only the highest scoring way of reaching each board
+            candidates = {}
+            for beam_score, steps, beam_board in beam:
+                for move in beam_board.iter_moves():
+                    budget.tick()
+
+                    new_board = move.result()
+                    new_score = beam_score + score(move.pool)
+                    new_steps = steps + (move.coord,)
+
+                    if new_board.is_solved():
+                        if best.is_empty() or new_score > best.score:
+                            best = ScoredSolution(new_steps, new_score)
+                        continue
+
+                    if pruner.prune(new_board):
+                        continue
+
+                    key = new_board.zobrist()
+                    if key not in candidates or candidates[key][0] < new_score:
+                        candidates[key] = (new_score, new_steps, new_board)
+
+            beam = heapq.nlargest(width, candidates.values(), key=lambda candidate: candidate[0])
+    except BudgetExhaustedException:
+        pass
+
+    return best
@@ -0,0 +1,529 @@
+from functools import partial
+
+from board import Board
+from board import InvalidPopException
+from board import Move
+from board import Pool
+from color import EmptyColor
+from coordinate import Coordinate
+from zobrist import mask_zobrist_keys
+
+
+def popcount(mask):
+    """
+    Count the number of set bits in an integer mask.
+
+    :param mask: A non-negative integer.
+    :return: The number of bits set in the mask.
+    """
+    return bin(mask).count('1')
+
+
+class BitBoard:
+    """
+    Representation of the game board as one integer bitmask per color.
+
+    Cells are laid out column-major, starting from the bottom-left corner of the board. The cell at
+    row-from-bottom r in column j occupies bit j * (height + 1) + r; e.g. for the standard 10x10
+    board, each column takes 11 bits and the whole board fits in 110 bits. The extra bit at the top
+    of every column is a guard bit that is never set, so shifting a mask by one position never
+    carries a cell from one column into the next.
+
+    Coordinates accepted and returned by this class use the same (i, j) convention as Board, so
+    solutions generated against a BitBoard can be replayed on the equivalent Board.
+    """
+
+    def __init__(self, height, width, colors, masks):
+        """
+        Construct a BitBoard directly from its masks.
+        Do not call this method directly; rather, use the static from_board method on BitBoard.
+
+        :param height: The number of rows on the board.
+        :param width: The number of columns on the board.
+        :param colors: A tuple of the Colors on the board.
+        :param masks: A tuple of integer masks, one for each element of colors.
+        """
+        self.height = height
+        self.width = width
+        self.colors = colors
+        self.masks = masks
+        self._key = None
+        self._pools = None
+        self._color_counts = None
+        self._zobrist = None
+        self.stride = height + 1
+        self.column_mask = (1 << height) - 1
+
+    @staticmethod
+    def from_board(board):
+        """
+        Create a BitBoard describing the same configuration as a Board.
+
+        :param board: A Board instance.
+        :return: A BitBoard instance describing the input.
+        """
+        height = len(board.board)
+        width = len(board.board[0]) if height else 0
+        stride = height + 1
+
+        colors = []
+        masks = []
+        for i, row in enumerate(board.board):
+            for j, elem in enumerate(row):
+                if elem.is_empty():
+                    continue
+
+                if elem not in colors:
+                    colors.append(elem)
+                    masks.append(0)
+
+                masks[colors.index(elem)] |= 1 << (j * stride + height - 1 - i)
+
+        return BitBoard(height, width, tuple(colors), tuple(masks))
+
+    def to_board(self):
+        """
+        Create a Board describing the same configuration as this BitBoard.
+
+        :return: A Board instance describing this BitBoard.
+        """
+        if self.is_solved():
+            return Board.from_grid([])
+
+        empty = EmptyColor()
+        grid = [[empty] * self.width for _ in range(self.height)]
+        for color, mask in zip(self.colors, self.masks):
+            for idx in self._bit_indices(mask):
+                coord = self._index_to_coordinate(idx)
+                grid[coord.i][coord.j] = color
+
+        return Board.from_grid(grid)
+
+    def key(self):
+        """
+        Get a compact, canonical encoding of this board: its dimensions followed by the mask of
+        every color present on the board, ordered by color index. The key is computed once and
+        cached, since boards are never mutated.
+
+        :return: A hashable tuple that is equal for two boards if and only if the boards are equal.
+        """
+        if self._key is None:
+            self._key = (self.height, self.width) + tuple(sorted(
+                (color.index, mask)
+                for color, mask in zip(self.colors, self.masks)
+                if mask
+            ))
+
+        return self._key
+
+    def zobrist(self):
+        """
+        Get the Zobrist hash of this board, which is identical to that of the equivalent Board.
+        BitBoards created by a pop derive their hash from their parent by only accounting for the
+        cells whose contents changed.
+
+        :return: A 64-bit integer; zero for a board with no bricks.
+        """
+        if self._zobrist is None:
+            self._zobrist = self._zobrist_delta(tuple(0 for _ in self.masks), self.masks)
+
+        return self._zobrist
+
+    def color_counts(self):
+        """
+        Get the number of bricks remaining of each color. BitBoards created by a pop inherit the
+        counts of their parent less the popped pool.
+
+        :return: A dict mapping each Color on the board to its number of bricks.
+        """
+        if self._color_counts is None:
+            self._color_counts = {
+                color: popcount(mask)
+                for color, mask in zip(self.colors, self.masks)
+                if mask
+            }
+
+        return self._color_counts
+
+    def is_solved(self):
+        """
+        Determine if the board is in a solved state.
+
+        :return: True if the board is solved; False otherwise.
+        """
+        return not any(self.masks)
+
+    def flood_mask(self, seed, mask):
+        """
+        Expand a seed mask to its full flood pool within a color mask by repeatedly shifting the
+        flood in all four directions and masking off anything not of the same color.
+
+        :param seed: A mask with the starting bit(s) set.
+        :param mask: The mask of the color being flooded.
+        :return: A mask of all cells in the flood pool containing the seed.
+        """
+        stride = self.stride
+        flood = seed
+        while True:
+            grown = (flood | flood << 1 | flood >> 1 | flood << stride | flood >> stride) & mask
+            if grown == flood:
+                return flood
+            flood = grown
+
+    def pools(self):
+        """
+        Get every distinct flood pool on the board. Pools are computed the first time they are
+        requested, and cached thereafter.
+
+        :return: A list of MaskPools, ordered by the row-major position of their representative
+                 coordinates.
+        """
+        if self._pools is None:
+            pools = []
+            for color_idx, mask in enumerate(self.masks):
+                remaining = mask
+                while remaining:
+                    pool = self.flood_mask(remaining & -remaining, mask)
+                    remaining &= ~pool
+                    pools.append((self._representative(pool), color_idx, pool))
+
+            self._pools = [
+                MaskPool(Coordinate(i, j), self.colors[color_idx], color_idx, pool_mask)
+                for (i, j), color_idx, pool_mask in sorted(pools)
+            ]
+
+        return self._pools
+
+    def iter_moves(self):
+        """
+        Lazily generate the available moves. Exactly one move is generated for each flood pool
+        that can be popped, and the board resulting from a move is only built when it is first
+        requested.
+
+        :return: A generator of Moves.
+        """
+        for pool in self.pools():
+            if pool.size > 1:
+                yield Move(pool, partial(self._pop_mask, pool.color_idx, pool.mask))
+
+    def available_moves(self):
+        """
+        Get a list of available moves and resulting board configurations. Exactly one move is
+        generated for each flood pool that can be popped.
+
+        :return: A list of tuples, each of which is of the shape (Coordinate, BitBoard). The first
+                 element represents the coordinate from which a flood pool was popped, and the
+                 second element represents the BitBoard instance resulting from that action.
+        """
+        return [(move.coord, move.result()) for move in self.iter_moves()]
+
+    def pop_from(self, coord):
+        """
+        Determine the board configuration resulting from an attempted flood pool pop at the
+        specified coordinate.
+
+        :param coord: Coordinate on this board.
+        :return: A new BitBoard resulting from popping the flood pool at the given location.
+        :raises InvalidPopException: If a pop is not allowed from the given coordinate.
+        """
+        seed = 1 << (coord.j * self.stride + self.height - 1 - coord.i)
+        for color_idx, mask in enumerate(self.masks):
+            if mask & seed:
+                pool = self.flood_mask(seed, mask)
+                if pool == seed:
+                    break
+                return self._pop_mask(color_idx, pool)
+
+        raise InvalidPopException('Unable to pop from a flood group with only one element')
+
+    def _pop_mask(self, color_idx, pool):
+        """
+        Remove a flood pool from the board and apply column gravity and empty column removal.
+
+        :param color_idx: Index of the color whose mask contains the pool.
+        :param pool: Mask of the cells to remove.
+        :return: A new, contracted BitBoard with the pool removed.
+        """
+        masks, width = self._remove_mask(color_idx, pool)
+        new_board = BitBoard(self.height, width, self.colors, masks)
+        new_board._color_counts = self._color_counts_after(color_idx, pool)
+        if self._zobrist is not None:
+            new_board._zobrist = self._zobrist ^ self._zobrist_delta(self.masks, masks)
+
+        return new_board
+
+    def _remove_mask(self, color_idx, pool):
+        """
+        Compute the masks resulting from removing a flood pool from the board and applying column
+        gravity and empty column removal.
+
+        :param color_idx: Index of the color whose mask contains the pool.
+        :param pool: Mask of the cells to remove.
+        :return: A tuple of the shape (masks, width) describing the contracted board.
+        """
+        return self._remove_from(self.masks, self.width, color_idx, pool)
+
+    def _remove_from(self, masks, width, color_idx, pool):
+        """
+        Compute the masks resulting from removing a flood pool from any configuration of this
+        board's colors and applying column gravity and empty column removal, without building a
+        new board.
+
+        :param masks: A tuple of color masks, one for each color on this board.
+        :param width: The number of columns occupied by the masks.
+        :param color_idx: Index of the color whose mask contains the pool.
+        :param pool: Mask of the cells to remove.
+        :return: A tuple of the shape (masks, width) describing the contracted configuration.
+        """
+        masks = list(masks)
+        masks[color_idx] &= ~pool
+
+        occupied = 0
+        for mask in masks:
+            occupied |= mask
+
+        stride = self.stride
+        column_mask = self.column_mask
+
+        # Walk columns right to left, so that removing a column never shifts the position of a
+        # column that has yet to be visited
+        for j in reversed(range(width)):
+            shift = j * stride
+            col = (occupied >> shift) & column_mask
+
+            if not col:
+                # The column is entirely empty; shift all columns to its right one column left
+                low_mask = (1 << shift) - 1
+                masks = [
+                    (mask & low_mask) | ((mask >> (shift + stride)) << shift)
+                    for mask in masks
+                ]
+                occupied = (occupied & low_mask) | ((occupied >> (shift + stride)) << shift)
+                width -= 1
+            elif col & (col + 1):
+                # The occupied cells are not a contiguous run from the bottom of the column, so
+                # compact each run of occupied cells down onto the one beneath it
+                masks = [
+                    self._compact_column(mask, shift, col)
+                    for mask in masks
+                ]
+
+        return tuple(masks), width
+
+    def _color_counts_after(self, color_idx, pool):
+        """
+        Derive the per-color brick counts after a flood pool is removed from the counts of this
+        board, if they have already been computed.
+
+        :param color_idx: Index of the color whose mask contains the pool.
+        :param pool: Mask of the cells to remove.
+        :return: A dict mapping each Color to its number of bricks, or None if the counts of this
+                 board have not been computed.
+        """
+        if self._color_counts is None:
+            return None
+
+        color = self.colors[color_idx]
+        color_counts = dict(self._color_counts)
+        color_counts[color] -= popcount(pool)
+        if not color_counts[color]:
+            del color_counts[color]
+
+        return color_counts
+
+    def _zobrist_delta(self, old_masks, new_masks):
+        """
+        Compute the change to the Zobrist hash between two configurations of this board's colors.
+        A cell only contributes if its contents differ between the two configurations, so the
+        cost is proportional to the number of bricks removed or moved.
+
+        :param old_masks: A tuple of color masks, one for each color on this board.
+        :param new_masks: A tuple of color masks, one for each color on this board.
+        :return: A 64-bit integer to XOR into the hash of the old configuration.
+        """
+        num_bits = self.width * self.stride
+        delta = 0
+        for color, old_mask, new_mask in zip(self.colors, old_masks, new_masks):
+            changed = old_mask ^ new_mask
+            if not changed:
+                continue
+
+            keys = mask_zobrist_keys(self.stride, color.index, num_bits)
+            while changed:
+                low = changed & -changed
+                delta ^= keys[low.bit_length() - 1]
+                changed ^= low
+
+        return delta
+
+    def _compact_column(self, mask, shift, col):
+        """
+        Apply gravity to a single column of a single color mask.
+
+        :param mask: The color mask to compact.
+        :param shift: The bit offset of the column within the mask.
+        :param col: The occupancy of the column across all colors, shifted down to bit zero.
+        :return: The color mask with the column compacted.
+        """
+        segment = (mask >> shift) & self.column_mask
+        compacted = 0
+        target = 0
+        while col:
+            start = (col & -col).bit_length() - 1
+            run = col >> start
+            length = ((run + 1) & ~run).bit_length() - 1
+            compacted |= ((segment >> start) & ((1 << length) - 1)) << target
+            target += length
+            col &= ~(((1 << length) - 1) << start)
+
+        return (mask & ~(self.column_mask << shift)) | (compacted << shift)
+
+    def _representative(self, pool):
+        """
+        Find the first coordinate of a pool in row-major order.
+
+        :param pool: Mask of the cells in the pool.
+        :return: An (i, j) tuple of the top-most, then left-most cell in the pool.
+        """
+        return min(
+            (coord.i, coord.j)
+            for coord in map(self._index_to_coordinate, self._bit_indices(pool))
+        )
+
+    def _index_to_coordinate(self, idx):
+        """
+        Convert a bit index to the Coordinate it represents.
+
+        :param idx: Bit index within a mask.
+        :return: The corresponding Coordinate on this board.
+        """
+        j, r = divmod(idx, self.stride)
+        return Coordinate(self.height - 1 - r, j)
+
+    @staticmethod
+    def _bit_indices(mask):
+        """
+        Generate the indices of all set bits in a mask.
+
+        :param mask: A non-negative integer.
+        :return: A generator of set bit indices, lowest first.
+        """
+        while mask:
+            low = mask & -mask
+            yield low.bit_length() - 1
+            mask ^= low
+
+    def __repr__(self):
+        """
+        Generate a string representation of the board, identical to that of the equivalent Board.
+
+        :return: A string representation of the board.
+        """
+        return repr(self.to_board())
+
+    def __eq__(self, other):
+        """
+        BitBoards are equal if their canonical keys are identical.
+
+        :param other: The other BitBoard against which to compare.
+        :return: True if the boards are equal; False otherwise.
+        """
+        return isinstance(other, BitBoard) and self.key() == other.key()
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self.key())
+
+
+class MutableBitBoard(BitBoard):
+    """
+    A BitBoard that is modified in place as pools are popped, keeping an undo log so that each pop
+    can be reverted when a search backtracks. Popping a pool on a MutableBitBoard never allocates a
+    new board; the undo log only records the handful of masks and cached values that changed.
+    """
+
+    def __init__(self, height, width, colors, masks):
+        """
+        Construct a MutableBitBoard directly from its masks.
+        Do not call this method directly; rather, use the static from_bitboard method.
+
+        :param height: The number of rows on the board.
+        :param width: The number of columns on the board.
+        :param colors: A tuple of the Colors on the board.
+        :param masks: A tuple of integer masks, one for each element of colors.
+        """
+        BitBoard.__init__(self, height, width, colors, masks)
+        self.undo_log = []
+
+    @staticmethod
+    def from_bitboard(bitboard):
+        """
+        Create a MutableBitBoard starting from the same configuration as a BitBoard.
+
+        :param bitboard: A BitBoard instance.
+        :return: A MutableBitBoard instance describing the input.
+        """
+        return MutableBitBoard(bitboard.height, bitboard.width, bitboard.colors, bitboard.masks)
+
+    def apply(self, pool):
+        """
+        Pop a flood pool in place.
+
+        :param pool: A MaskPool on the current configuration of this board.
+        """
+        self.undo_log.append(
+            (self.masks, self.width, self._key, self._pools, self._color_counts, self._zobrist)
+        )
+
+        masks = self.masks
+        color_counts = self._color_counts_after(pool.color_idx, pool.mask)
+        self.masks, self.width = self._remove_mask(pool.color_idx, pool.mask)
+        self._key = None
+        self._pools = None
+        self._color_counts = color_counts
+        if self._zobrist is not None:
+            self._zobrist ^= self._zobrist_delta(masks, self.masks)
+
+    def undo(self):
+        """
+        Revert the most recent pop applied to this board, along with all values cached since.
+        """
+        self.masks, self.width, self._key, self._pools, self._color_counts, self._zobrist = \
+            self.undo_log.pop()
+
+    def snapshot(self):
+        """
+        Create an immutable copy of the current configuration of this board.
+
+        :return: A BitBoard describing the current configuration.
+        """
+        bitboard = BitBoard(self.height, self.width, self.colors, self.masks)
+        bitboard._color_counts = self._color_counts
+        bitboard._zobrist = self._zobrist
+
+        return bitboard
+
+
+class MaskPool(Pool):
+    """
+    Representation of a single flood pool on a BitBoard, whose cells are described by a mask
+    rather than a set of Coordinates.
+    """
+
+    def __init__(self, coord, color, color_idx, mask):
+        """
+        Create a new MaskPool.
+
+        :param coord: The representative Coordinate of the pool, i.e. its first coordinate in
+                      row-major order.
+        :param color: The Color shared by every element of the pool.
+        :param color_idx: Index of the color within the colors of the owning BitBoard.
+        :param mask: Mask of all cells in the pool.
+        """
+        self.coord = coord
+        self.color = color
+        self.color_idx = color_idx
+        self.mask = mask
+        self.size = popcount(mask)
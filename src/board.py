@@ -1,7 +1,10 @@
+from array import array
 from collections import deque
+from functools import partial
 
 from color import EmptyColor
 from coordinate import Coordinate
+from zobrist import zobrist_key
 
 
 def coordinate_map_to_grid(coordinate_map):
@@ -55,6 +58,10 @@ class Board:
         :param grid: The grid of colors representing the board.
         """
         self.board = grid
+        self._pools = None
+        self._key = None
+        self._color_counts = None
+        self._zobrist = None
 
     @staticmethod
     def from_coordinate_map(coordinate_map):
@@ -76,6 +83,63 @@ class Board:
         """
         return Board(grid)
 
+    def key(self):
+        """
+        Get a compact, canonical encoding of this board: its dimensions followed by the index of
+        the color at each cell in row-major order, packed as unsigned 16-bit integers into a byte
+        string. Color indices never exceed MAX_COLORS, so every index fits. The key is computed
+        once and cached, since boards are never mutated.
+
+        :return: A byte string that is equal for two boards if and only if the boards are equal.
+        """
+        if self._key is None:
+            height = len(self.board)
+            width = len(self.board[0]) if height else 0
+            self._key = array(
+                'H',
+                [height, width] + [elem.index for row in self.board for elem in row],
+            ).tostring()
+
+        return self._key
+
+    def zobrist(self):
+        """
+        Get the Zobrist hash of this board: the XOR of the keys of every brick, where each key is
+        determined by the brick's color and its column and row from the bottom of the board.
+        Boards created by pop_from derive their hash from their parent by only accounting for the
+        bricks that were removed or moved, so the grid only needs to be hashed once per search.
+
+        :return: A 64-bit integer; zero for a board with no bricks.
+        """
+        if self._zobrist is None:
+            height = len(self.board)
+            zobrist = 0
+            for i, row in enumerate(self.board):
+                for j, elem in enumerate(row):
+                    if not elem.is_empty():
+                        zobrist ^= zobrist_key(j, height - 1 - i, elem.index)
+            self._zobrist = zobrist
+
+        return self._zobrist
+
+    def color_counts(self):
+        """
+        Get the number of bricks remaining of each color. Boards created by pop_from inherit the
+        counts of their parent less the popped pool, so the grid only needs to be scanned once
+        per search.
+
+        :return: A dict mapping each Color on the board to its number of bricks.
+        """
+        if self._color_counts is None:
+            counts = {}
+            for row in self.board:
+                for elem in row:
+                    if not elem.is_empty():
+                        counts[elem] = counts.get(elem, 0) + 1
+            self._color_counts = counts
+
+        return self._color_counts
+
     def is_solved(self):
         """
         Determine if the board is in a solved state.
@@ -108,30 +172,41 @@ class Board:
 
         return flood
 
+    def pools(self):
+        """
+        Get every distinct flood pool on the board. The pool index is built with a single
+        union-find pass over the grid the first time it is requested, and cached thereafter.
+
+        :return: A list of Pools, ordered by the row-major position of their representative
+                 coordinates.
+        """
+        if self._pools is None:
+            self._pools = self._label_pools()
+
+        return self._pools
+
+    def iter_moves(self):
+        """
+        Lazily generate the available moves. Exactly one move is generated for each flood pool
+        that can be popped, and the board resulting from a move is only built when it is first
+        requested.
+
+        :return: A generator of Moves.
+        """
+        for pool in self.pools():
+            if pool.size > 1:
+                yield Move(pool, partial(self._pop_indices, pool.indices))
+
     def available_moves(self):
         """
-        Get a list of available moves and resulting board configurations.
+        Get a list of available moves and resulting board configurations. Exactly one move is
+        generated for each flood pool that can be popped.
 
         :return: A list of tuples, each of which is of the shape (Coordinate, Board). The first
                  element represents the coordinate from which a flood pool was popped, and the
                  second element represents the Board instance resulting from that action.
         """
-        pools = set([])
-        moves = []
-
-        for i, row in enumerate(self.board):
-            for j, elem in enumerate(self.board[i]):
-                if not elem.is_empty():
-                    coord = Coordinate(i, j)
-                    try:
-                        new_board = self.pop_from(coord)
-                        if str(new_board) not in pools:
-                            pools.add(str(new_board))
-                            moves.append((coord, new_board))
-                    except InvalidPopException:
-                        pass
-
-        return moves
+        return [(move.coord, move.result()) for move in self.iter_moves()]
 
     def pop_from(self, coord):
         """
@@ -149,17 +224,7 @@ class Board:
         if len(to_pop) == 1:
             raise InvalidPopException('Unable to pop from a flood group with only one element')
 
-        # Create a new grid with popped items changed to EmptyColors
-        empty = EmptyColor()
-        update_grid = [
-            [
-                empty if Coordinate(i, j) in to_pop else self.board[i][j]
-                for j in range(len(self.board[i]))
-            ]
-            for i in range(len(self.board))
-        ]
-
-        return Board.from_grid(update_grid).contract()
+        return self._pop_indices(to_pop)
 
     def contract(self):
         """
@@ -191,7 +256,12 @@ class Board:
         )
 
         # In order to create a grid again, the columns generated above need to be transposed
-        return Board.from_grid(zip(*cols_contracted))
+        new_board = Board.from_grid(zip(*cols_contracted))
+
+        if self._zobrist is not None:
+            new_board._zobrist = self._zobrist ^ self._contraction_zobrist_delta()
+
+        return new_board
 
     def at(self, coord):
         """
@@ -202,6 +272,114 @@ class Board:
         """
         return self.board[coord.i][coord.j]
 
+    def _pop_indices(self, to_pop):
+        """
+        Remove a set of coordinates from the board, without regard to whether they form a valid
+        flood pool.
+
+        :param to_pop: A set of Coordinates to remove.
+        :return: A new, contracted Board with the specified coordinates emptied.
+        """
+        # Create a new grid with popped items changed to EmptyColors
+        empty = EmptyColor()
+        update_grid = [list(row) for row in self.board]
+        height = len(self.board)
+        popped = {}
+        zobrist = self._zobrist
+        for coord in to_pop:
+            elem = update_grid[coord.i][coord.j]
+            popped[elem] = popped.get(elem, 0) + 1
+            update_grid[coord.i][coord.j] = empty
+            if zobrist is not None:
+                zobrist ^= zobrist_key(coord.j, height - 1 - coord.i, elem.index)
+
+        popped_board = Board.from_grid(update_grid)
+        popped_board._zobrist = zobrist
+        new_board = popped_board.contract()
+
+        if self._color_counts is not None:
+            new_board._color_counts = {
+                color: count - popped.get(color, 0)
+                for color, count in self._color_counts.items()
+                if count > popped.get(color, 0)
+            }
+
+        return new_board
+
+    def _contraction_zobrist_delta(self):
+        """
+        Compute the change to the Zobrist hash caused by contracting this board. Only bricks that
+        are moved by the contraction, either down into a gap in their column or left into the place
+        of a removed column, contribute to the change.
+
+        :return: A 64-bit integer to XOR into the hash of this board.
+        """
+        height = len(self.board)
+        delta = 0
+        new_col = 0
+        for col in range(len(self.board[0])):
+            bricks = [
+                (height - 1 - i, elem)
+                for i, elem in enumerate(self._extract_col(col))
+                if not elem.is_empty()
+            ]
+            if not bricks:
+                continue
+
+            for new_row, (row, elem) in enumerate(reversed(bricks)):
+                if (col, row) != (new_col, new_row):
+                    delta ^= zobrist_key(col, row, elem.index) ^ \
+                        zobrist_key(new_col, new_row, elem.index)
+            new_col += 1
+
+        return delta
+
+    def _label_pools(self):
+        """
+        Partition the non-empty cells of the board into flood pools with union-find. Each cell is
+        unioned with its right and lower neighbors when they share its color; the root of every
+        set is kept as the smallest row-major index in the set, so that it doubles as the pool's
+        representative coordinate.
+
+        :return: A list of Pools, ordered by the row-major position of their representatives.
+        """
+        height = len(self.board)
+        width = len(self.board[0]) if height else 0
+        parent = list(range(height * width))
+
+        def find(idx):
+            while parent[idx] != idx:
+                parent[idx] = parent[parent[idx]]
+                idx = parent[idx]
+            return idx
+
+        def union(one, two):
+            one, two = find(one), find(two)
+            if one != two:
+                parent[max(one, two)] = min(one, two)
+
+        for i, row in enumerate(self.board):
+            for j, elem in enumerate(row):
+                if elem.is_empty():
+                    continue
+                if j + 1 < width and row[j + 1] == elem:
+                    union(i * width + j, i * width + j + 1)
+                if i + 1 < height and self.board[i + 1][j] == elem:
+                    union(i * width + j, (i + 1) * width + j)
+
+        members = {}
+        for i, row in enumerate(self.board):
+            for j, elem in enumerate(row):
+                if not elem.is_empty():
+                    members.setdefault(find(i * width + j), set([])).add(Coordinate(i, j))
+
+        pools = []
+        for root in sorted(members.keys()):
+            coord = Coordinate(*divmod(root, width))
+            pools.append(Pool(coord, self.at(coord), members[root]))
+
+        return pools
+
     def _is_coordinate_valid(self, coord):
         """
         Check if the specified coordinate is valid on this board.
@@ -261,13 +439,83 @@ class Board:
 
     def __eq__(self, other):
         """
-        A simple, shallow equality check on Boards is that their string representations are
-        identical.
+        Boards are equal if their canonical keys are identical.
 
         :param other: The other Board against which to compare.
         :return: True if the boards are equal; False otherwise.
         """
-        return repr(self) == repr(other)
+        return isinstance(other, Board) and self.key() == other.key()
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self.key())
+
+
+class Pool:
+    """
+    Representation of a single flood pool on a board.
+    """
+
+    def __init__(self, coord, color, indices):
+        """
+        Create a new Pool.
+
+        :param coord: The representative Coordinate of the pool, i.e. its first coordinate in
+                      row-major order.
+        :param color: The Color shared by every element of the pool.
+        :param indices: A set of all Coordinates in the pool.
+        """
+        self.coord = coord
+        self.color = color
+        self.indices = indices
+        self.size = len(indices)
+
+    def __repr__(self):
+        return 'Pool({coord}, {color}, {size})'.format(
+            coord=self.coord,
+            color=self.color,
+            size=self.size,
+        )
+
+
+class Move:
+    """
+    Representation of a single available move, whose resulting board is built on demand.
+
+    A Move can be unpacked like the (Coordinate, Board) tuples returned by available_moves, which
+    builds the resulting board at that point.
+    """
+
+    def __init__(self, pool, pop):
+        """
+        Create a new Move.
+
+        :param pool: The Pool popped by this move.
+        :param pop: A callable taking no arguments that builds the board resulting from the move.
+        """
+        self.coord = pool.coord
+        self.pool = pool
+        self._pop = pop
+        self._result = None
+
+    def result(self):
+        """
+        Get the board resulting from this move, building it the first time it is requested.
+
+        :return: The board resulting from popping this move's pool.
+        """
+        if self._result is None:
+            self._result = self._pop()
+
+        return self._result
+
+    def __iter__(self):
+        return iter((self.coord, self.result()))
+
+    def __repr__(self):
+        return 'Move({pool})'.format(pool=self.pool)
 
 
 class InvalidPopException(Exception):
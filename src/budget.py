@@ -0,0 +1,208 @@
+import multiprocessing
+import time
+
+from solution import EmptySolution
+from solution import Solution
+
+# Result status of a solve that found a valid solution
+SOLVED = 'solved'
+# Result status of a solve that proved the board has no solution
+UNSOLVABLE = 'unsolvable'
+# Result status of a solve that ran out of time or nodes before reaching an answer
+BUDGET_EXHAUSTED = 'budget_exhausted'
+
+# Number of nodes expanded between checks of the wall clock
+DEADLINE_CHECK_INTERVAL = 256
+
+
+class Budget:
+    """
+    Limit on the amount of work a search may perform. The search reports each node it expands to
+    the budget, which raises BudgetExhaustedException once the limit is reached.
+    """
+
+    def __init__(self, deadline=None, node_budget=None, check_interval=DEADLINE_CHECK_INTERVAL):
+        """
+        Create a new Budget.
+
+        :param deadline: Wall clock time, as returned by time.time(), after which the search must
+                         stop; or None for no time limit.
+        :param node_budget: Maximum number of nodes the search may expand; or None for no limit.
+        :param check_interval: Number of nodes expanded between checks of the deadline, so that
+                               the clock is not read on every node.
+        """
+        self.deadline = deadline
+        self.node_budget = node_budget
+        self.check_interval = check_interval
+        self.nodes = 0
+
+    def tick(self):
+        """
+        Account for a single expanded node.
+
+        :raises BudgetExhaustedException: If the node or time budget has run out.
+        """
+        self.nodes += 1
+
+        if self.node_budget is not None and self.nodes > self.node_budget:
+            raise BudgetExhaustedException('Node budget of {node_budget} exhausted'.format(
+                node_budget=self.node_budget,
+            ))
+
+        if self.deadline is not None and self.nodes % self.check_interval == 0 and \
+                time.time() >= self.deadline:
+            raise BudgetExhaustedException('Deadline exceeded')
+
+
+class SharedNodeBudget:
+    """
+    Limit on the total number of nodes expanded by every worker process of a parallel solve,
+    counted in shared memory. Workers charge the nodes they expand in batches, so that they do not
+    contend for the counter on every node; the search may therefore overshoot the budget by up to
+    one batch per worker.
+    """
+
+    def __init__(self, node_budget=None):
+        """
+        Create a new SharedNodeBudget.
+
+        :param node_budget: Maximum number of nodes the workers may expand in total; or None for no
+                            limit, in which case nodes are only counted.
+        """
+        self.node_budget = node_budget
+        self.counter = multiprocessing.Value('L', 0)
+
+    @property
+    def nodes(self):
+        """
+        :return: The number of nodes charged so far, across every process.
+        """
+        return self.counter.value
+
+    def charge(self, nodes):
+        """
+        Account for a batch of expanded nodes.
+
+        :param nodes: The number of nodes expanded since the last charge.
+        :raises BudgetExhaustedException: If the node budget has run out.
+        """
+        with self.counter.get_lock():
+            self.counter.value += nodes
+            total = self.counter.value
+
+        if self.node_budget is not None and total > self.node_budget:
+            raise BudgetExhaustedException('Node budget of {node_budget} exhausted'.format(
+                node_budget=self.node_budget,
+            ))
+
+
+class SolveResult:
+    """
+    Outcome of a budgeted solve.
+    """
+
+    def __init__(self, status, solution, nodes, elapsed):
+        """
+        Create a new SolveResult.
+
+        :param status: One of SOLVED, UNSOLVABLE, or BUDGET_EXHAUSTED.
+        :param solution: The Solution found, or an EmptySolution if none was found.
+        :param nodes: Number of nodes expanded by the search.
+        :param elapsed: Wall clock duration of the search, in seconds.
+        """
+        self.status = status
+        self.solution = solution
+        self.nodes = nodes
+        self.elapsed = elapsed
+
+    def __repr__(self):
+        return 'SolveResult({status}, {solution}, nodes={nodes}, elapsed={elapsed:.3f})'.format(
+            status=self.status,
+            solution=self.solution,
+            nodes=self.nodes,
+            elapsed=self.elapsed,
+        )
+
+    def __str__(self):
+        return repr(self)
+
+
+def budget_solve(board, deadline=None, node_budget=None, search=None):
+    """
+    Solve the board within a time and/or node budget. The search stops cleanly as soon as either
+    budget runs out.
+
+    See parallel_budget_solve to bound a parallel solve in the same way.
+
+    :param board: The board to solve.
+    :param deadline: Wall clock time, as returned by time.time(), after which the search must
+                     stop; or None for no time limit.
+    :param node_budget: Maximum number of nodes the search may expand; or None for no limit.
+    :param search: Search function with the signature of serial_solve to run under the budget;
+                   defaults to serial_solve.
+    :return: A SolveResult describing the outcome of the search.
+    """
+    if search is None:
+        # Imported here so that budgets can be used without loading OpenCV via the solve module
+        from solve import serial_solve
+        search = serial_solve
+
+    budget = Budget(deadline, node_budget, DEADLINE_CHECK_INTERVAL)
+    start_time = time.time()
+
+    try:
+        solution = search(board, budget=budget)
+        status = UNSOLVABLE if solution.is_empty() else SOLVED
+    except BudgetExhaustedException:
+        solution = EmptySolution()
+        status = BUDGET_EXHAUSTED
+
+    return SolveResult(status, solution, budget.nodes, time.time() - start_time)
+
+
+def parallel_budget_solve(board, deadline=None, node_budget=None, num_processes=None,
+                          ordering=None):
+    """
+    Solve the board in parallel within a time and/or node budget, as budget_solve does for a
+    serial search. Nodes are counted across every worker process, and every worker is stopped as
+    soon as either budget runs out.
+
+    :param board: The board to solve.
+    :param deadline: Wall clock time, as returned by time.time(), after which the search must
+                     stop; or None for no time limit.
+    :param node_budget: Maximum number of nodes the workers may expand in total; or None for no
+                        limit.
+    :param num_processes: Number of worker processes to use; defaults to the number of CPUs.
+    :param ordering: MoveOrdering used by every worker to decide which moves to try first; or None
+                     to try moves in row-major order.
+    :return: A SolveResult describing the outcome of the search.
+    """
+    # Imported here, since the parallel solver itself depends on this module
+    from parallel import SolveHandle
+    from parallel import SolveTimeoutException
+
+    start_time = time.time()
+    if board.is_solved():
+        return SolveResult(SOLVED, Solution(tuple([])), 0, time.time() - start_time)
+
+    handle = SolveHandle(board, num_processes, ordering=ordering, node_budget=node_budget)
+    try:
+        timeout = max(0, deadline - time.time()) if deadline is not None else None
+        solution = handle.result(timeout)
+        status = UNSOLVABLE if solution.is_empty() else SOLVED
+    except (SolveTimeoutException, BudgetExhaustedException):
+        handle.cancel()
+        solution = EmptySolution()
+        status = BUDGET_EXHAUSTED
+    except BaseException:
+        handle.cancel()
+        raise
+
+    return SolveResult(status, solution, handle.budget.nodes, time.time() - start_time)
+
+
+class BudgetExhaustedException(Exception):
+    """
+    Raised from within a search when its budget has run out.
+    """
+    pass
@@ -1,3 +1,38 @@
+# Maximum number of distinct color names, including the empty color, so that every color index
+# fits in an unsigned 16-bit integer
+MAX_COLORS = 1 << 16
+
+# Registry assigning every distinct color name a small integer index, used for compact encodings
+# of boards. The empty color is always assigned index zero.
+_color_indices = {'EMPTY': 0}
+
+
+def color_index(name):
+    """
+    Look up the integer index for a color name, assigning the next unused index if the name has
+    never been seen before.
+
+    Indices are never reused, since encodings of boards built from a color may outlive it, so
+    the registry is bounded by MAX_COLORS instead.
+
+    :param name: Name of the color.
+    :return: A small non-negative integer that uniquely identifies the name in this process.
+    :raises ColorRegistryFullException: If the name is new, and MAX_COLORS names have already been
+                                        assigned indices.
+    """
+    index = _color_indices.get(name)
+    if index is None:
+        if len(_color_indices) >= MAX_COLORS:
+            raise ColorRegistryFullException(
+                'No more than {max_colors} distinct colors can be used'.format(
+                    max_colors=MAX_COLORS,
+                )
+            )
+        index = _color_indices[name] = len(_color_indices)
+
+    return index
+
+
 class Color:
     """
     Representation of an element on the game board.
@@ -10,6 +45,7 @@ class Color:
         :param name: Hexadecimal representation of the color, e.g. 'FFFFFF'.
         """
         self.name = name
+        self.index = color_index(name)
 
     def is_empty(self):
         """
@@ -57,3 +93,10 @@ class EmptyColor(Color):
         :return: True, always.
         """
         return True
+
+
+class ColorRegistryFullException(Exception):
+    """
+    Raised when a new color is created once the registry of color indices is full.
+    """
+    pass
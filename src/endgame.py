@@ -0,0 +1,158 @@
+from bitboard import BitBoard
+from transposition import TranspositionTable
+
+# Default number of bricks at or below which a board may be handed to the endgame solver
+DEFAULT_ENDGAME_BRICKS = 16
+# Default number of colors at or below which a board may be handed to the endgame solver
+DEFAULT_ENDGAME_COLORS = 2
+# Default maximum number of endgame positions whose outcome is retained
+DEFAULT_ENDGAME_TABLE_SIZE = 1 << 16
+
+# Returned by table lookups of positions whose outcome is not known
+_UNKNOWN = object()
+
+
+class EndgameSolver:
+    """
+    Dedicated solver for boards near the leaves of the search, with only a few colors and a few
+    bricks left.
+
+    The endgame is searched directly over the color masks of a BitBoard: pools are flooded and
+    popped as plain integers, and no Pool, Coordinate, or board object is built for any position
+    except along the solution that is returned. A board with a single color is decided in closed
+    form: once contracted, its bricks rest along the bottom row with no empty columns between
+    them, so they always form a single pool, and the board is solvable in one pop exactly when it
+    has at least two bricks.
+
+    The outcome of every endgame position, solvable or not, is recorded in a bounded
+    TranspositionTable, which evicts the least recently used position once it is full. Positions
+    are keyed by their masks alone, without the colors they belong to, since two boards that
+    differ only by a relabeling of their colors have exactly the same solutions; the table can
+    therefore be kept across several searches, even of different boards.
+    """
+
+    def __init__(self, max_bricks=DEFAULT_ENDGAME_BRICKS, max_colors=DEFAULT_ENDGAME_COLORS,
+                 max_size=DEFAULT_ENDGAME_TABLE_SIZE):
+        """
+        Create a new EndgameSolver.
+
+        :param max_bricks: Boards with at most this many bricks, and at most max_colors colors,
+                           are solved by the endgame solver.
+        :param max_colors: Boards with at most this many colors, and at most max_bricks bricks,
+                           are solved by the endgame solver.
+        :param max_size: The maximum number of endgame positions whose outcome is retained.
+        """
+        self.max_bricks = max_bricks
+        self.max_colors = max_colors
+        # Maps the key of each endgame position to the bit indices of the cells to pop to solve
+        # it, or to None if it has no solution
+        self.table = TranspositionTable(max_size)
+
+    @property
+    def hits(self):
+        """
+        :return: The number of endgame positions whose outcome was found in the table.
+        """
+        return self.table.hits
+
+    @property
+    def misses(self):
+        """
+        :return: The number of endgame positions that had to be searched.
+        """
+        return self.table.misses
+
+    def applies(self, board):
+        """
+        Determine if a board is small enough to be handed to the endgame solver.
+
+        :param board: The board to test.
+        :return: True if the board has at most max_colors colors and at most max_bricks bricks.
+        """
+        counts = board.color_counts()
+        return len(counts) <= self.max_colors and sum(counts.values()) <= self.max_bricks
+
+    def solve(self, board):
+        """
+        Solve a board exactly.
+
+        :param board: A Board, BitBoard, or RegionGraph to solve.
+        :return: A tuple of Coordinates that solve the board, or None if it has no solution.
+        """
+        if not isinstance(board, BitBoard):
+            board = board.bitboard if hasattr(board, 'bitboard') else BitBoard.from_board(board)
+
+        indices = self._solve_masks(board, board.masks, board.width)
+        if indices is None:
+            return None
+
+        return tuple(board._index_to_coordinate(idx) for idx in indices)
+
+    def _solve_masks(self, bitboard, masks, width):
+        """
+        Solve a configuration of a BitBoard's colors.
+
+        :param bitboard: The BitBoard whose geometry the masks are laid out in.
+        :param masks: A tuple of color masks, one for each color on the BitBoard.
+        :param width: The number of columns occupied by the masks.
+        :return: A tuple of the bit indices of a cell in each pool to pop, in order, or None if the
+                 configuration has no solution.
+        """
+        present = [mask for mask in masks if mask]
+        if not present:
+            return tuple([])
+
+        if len(present) == 1:
+            # The bottom-left cell is occupied on every contracted board
+            return (0,) if present[0] & (present[0] - 1) else None
+
+        key = (bitboard.stride,) + tuple(sorted(present))
+        steps = self.table.get(key, _UNKNOWN)
+        if steps is not _UNKNOWN:
+            return steps
+
+        steps = None
+        if all(mask & (mask - 1) for mask in present):
+            steps = self._search(bitboard, masks, width)
+
+        self.table.put(key, steps)
+        return steps
+
+    def _search(self, bitboard, masks, width):
+        """
+        Try every pop from a configuration of a BitBoard's colors until one leads to a solution.
+
+        :param bitboard: The BitBoard whose geometry the masks are laid out in.
+        :param masks: A tuple of color masks, one for each color on the BitBoard.
+        :param width: The number of columns occupied by the masks.
+        :return: A tuple of the bit indices of a cell in each pool to pop, in order, or None if the
+                 configuration has no solution.
+        """
+        for color_idx, mask in enumerate(masks):
+            remaining = mask
+            while remaining:
+                seed = remaining & -remaining
+                pool = bitboard.flood_mask(seed, mask)
+                remaining &= ~pool
+                if pool == seed:
+                    continue
+
+                new_masks, new_width = bitboard._remove_from(masks, width, color_idx, pool)
+                steps = self._solve_masks(bitboard, new_masks, new_width)
+                if steps is not None:
+                    return (seed.bit_length() - 1,) + steps
+
+        return None
+
+    def __len__(self):
+        return len(self.table)
+
+    def __repr__(self):
+        return 'EndgameSolver(size={size}, hits={hits}, misses={misses})'.format(
+            size=len(self),
+            hits=self.hits,
+            misses=self.misses,
+        )
+
+    def __str__(self):
+        return repr(self)
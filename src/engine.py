@@ -0,0 +1,100 @@
+from bitboard import BitBoard
+from bitboard import MutableBitBoard
+from prune import Pruner
+from region import RegionGraph
+from solution import EmptySolution
+from solution import Solution
+from transposition import TranspositionTable
+
+
+def poppable_pools(board, ordering=None):
+    """
+    Get the pools that can be popped from the current configuration of a MutableBitBoard, in the
+    order they should be tried.
+
+    :param board: A MutableBitBoard.
+    :param ordering: MoveOrdering used to decide which moves to try first; or None to try moves in
+                     row-major order.
+    :return: A list of MaskPools with more than one brick.
+    """
+    if ordering is None:
+        return [pool for pool in board.pools() if pool.size > 1]
+
+    # Orderings may look ahead at the boards resulting from each move, which must not disturb the
+    # board being searched
+    snapshot = board.snapshot()
+    return [move.pool for move in ordering.order(snapshot, snapshot.iter_moves())]
+
+
+def iterative_solve(board, table=None, pruner=None, budget=None, ordering=None):
+    """
+    Solve the board using a DFS with an explicit stack over a single board that is modified in
+    place. Each pop is applied to the board directly and undone when the search backtracks, so no
+    board is copied per node and the depth of the search is not bounded by the recursion limit.
+
+    :param board: The board to solve; a Board, BitBoard, or RegionGraph.
+    :param table: TranspositionTable of board states known to have no solution. A new table is
+                  created if none is specified.
+    :param pruner: Pruner used to reject boards that can never be solved before expanding them. A
+                   new Pruner with the default rules is created if none is specified.
+    :param budget: Budget that is charged for every node expanded, and stops the search by raising
+                   BudgetExhaustedException once it runs out; or None for an unbounded search.
+    :param ordering: MoveOrdering used to decide which moves to try first; or None to try moves in
+                     row-major order.
+    :return: A Solution containing the steps that solve the board, or an EmptySolution if the
+             board has no solution.
+    """
+    if table is None:
+        table = TranspositionTable()
+    if pruner is None:
+        pruner = Pruner()
+
+    if isinstance(board, RegionGraph):
+        board = board.bitboard
+    elif not isinstance(board, BitBoard):
+        board = BitBoard.from_board(board)
+    board = MutableBitBoard.from_bitboard(board)
+
+    if board.is_solved():
+        return Solution(tuple([]))
+
+    if table.lookup(board) or pruner.prune(board):
+        return EmptySolution()
+
+    if budget is not None:
+        budget.tick()
+
+    # Each level of the stack is an iterator over the pools left to try at that depth; steps holds
+    # the coordinate of the pool popped to descend into each level below the root
+    stack = [iter(poppable_pools(board, ordering))]
+    steps = []
+
+    while stack:
+        pool = next(stack[-1], None)
+
+        if pool is None:
+            # Every move from the current board has been exhausted; backtrack to its parent
+            stack.pop()
+            table.store(board)
+            if steps:
+                board.undo()
+                steps.pop()
+            continue
+
+        board.apply(pool)
+        steps.append(pool.coord)
+
+        if board.is_solved():
+            return Solution(tuple(steps))
+
+        if table.lookup(board) or pruner.prune(board):
+            board.undo()
+            steps.pop()
+            continue
+
+        if budget is not None:
+            budget.tick()
+
+        stack.append(iter(poppable_pools(board, ordering)))
+
+    return EmptySolution()
@@ -0,0 +1,310 @@
+import json
+import os
+import tempfile
+
+import numpy
+
+# The number of rows and columns of color blocks on the board
+BOARD_SIZE = 10
+# The BGR color of the background behind the board
+BACKGROUND_BGR = (0xe4, 0xef, 0xf7)
+# Minimum difference from the background in any channel for a pixel to be part of a block
+FOREGROUND_THRESHOLD = 24
+# Minimum sum of the channels of a pixel that is part of a block, which excludes the black status
+# and navigation bars
+FOREGROUND_MIN_BRIGHTNESS = 150
+# Range of plausible pitches between blocks, as fractions of the width of the screenshot divided
+# by the number of columns of blocks; the board spans nearly the full width of the screen
+MIN_PITCH_FRACTION = 0.5
+MAX_PITCH_FRACTION = 1.05
+# Maximum distance, as a fraction of the pitch, of the center of any run of blocks from the grid
+MAX_GRID_ERROR = 0.2
+
+
+class GridGeometry:
+    """
+    Position of the board within screenshots of a single resolution: the pixel location of the
+    center of the top-left block, and the pitch between the centers of adjacent blocks.
+    """
+
+    def __init__(self, start_i, start_j, offset, size=BOARD_SIZE):
+        """
+        Create a new GridGeometry.
+
+        :param start_i: The vertical pixel offset from the top of the screen of the first block.
+        :param start_j: The horizontal pixel offset from the left of the screen of the first block.
+        :param offset: The pixel distance between any two adjacent blocks, which need not be a
+                       whole number of pixels.
+        :param size: The number of rows and columns of blocks.
+        """
+        self.start_i = start_i
+        self.start_j = start_j
+        self.offset = offset
+        self.size = size
+
+    def rows(self):
+        """
+        Get the rows of pixels that are sampled to parse the board, one through the middle of each
+        row of blocks.
+
+        :return: An array of pixel row indices, from top to bottom.
+        """
+        return numpy.rint(self.start_i + self.offset * numpy.arange(self.size)).astype(int)
+
+    def columns(self):
+        """
+        Get the columns of pixels that are sampled to parse the board, one through the middle of
+        each column of blocks.
+
+        :return: An array of pixel column indices, from left to right.
+        """
+        return numpy.rint(self.start_j + self.offset * numpy.arange(self.size)).astype(int)
+
+    def locate(self, coord):
+        """
+        Find the pixel at the center of a block, e.g. to simulate a touch on it.
+
+        :param coord: Coordinate of the block on the board.
+        :return: A tuple of the shape (x, y) of pixel offsets from the left and top of the screen.
+        """
+        return (
+            int(round(self.start_j + self.offset * coord.j)),
+            int(round(self.start_i + self.offset * coord.i)),
+        )
+
+    def __repr__(self):
+        return 'GridGeometry(start_i={start_i}, start_j={start_j}, offset={offset})'.format(
+            start_i=self.start_i,
+            start_j=self.start_j,
+            offset=self.offset,
+        )
+
+    def __str__(self):
+        return repr(self)
+
+    def __eq__(self, other):
+        return isinstance(other, GridGeometry) and self.__dict__ == other.__dict__
+
+    def __ne__(self, other):
+        return not self == other
+
+
+def calibrate(img):
+    """
+    Find the geometry of the board in a screenshot by projecting its blocks onto each axis.
+
+    Pixels that differ from the background are counted along every row of pixels, and the rows of
+    blocks show up as runs of rows with a high count, separated by the gaps between the blocks.
+    The columns of blocks are found the same way within those rows. The pitch between blocks is
+    the spacing between the centers of consecutive runs, and the grid is anchored at the
+    bottom-left block, which column gravity keeps occupied on any board that is not yet solved.
+
+    The geometry is validated before it is returned: the runs must fall on a regular grid of at
+    most BOARD_SIZE rows and columns, whose pitch is plausible for the width of the screenshot and
+    whose blocks all have their centers within it.
+
+    :param img: The screenshot as a BGR image array.
+    :return: The GridGeometry of the board.
+    :raises CalibrationException: If too few blocks are visible to determine the geometry, or the
+                                  blocks found do not form a plausible board.
+    """
+    pixels = img.astype(numpy.int16)
+    foreground = (
+        (numpy.abs(pixels - numpy.array(BACKGROUND_BGR)).max(axis=2) > FOREGROUND_THRESHOLD) &
+        (pixels.sum(axis=2) > FOREGROUND_MIN_BRIGHTNESS)
+    )
+
+    row_runs = _runs(foreground.sum(axis=1))
+    if not row_runs:
+        raise CalibrationException('No blocks found in the screenshot')
+
+    in_blocks = numpy.zeros(len(foreground), dtype=bool)
+    for start, end in row_runs:
+        in_blocks[start:end] = True
+    column_runs = _runs(foreground[in_blocks].sum(axis=0))
+
+    row_centers = [(start + end - 1) / 2.0 for start, end in row_runs]
+    column_centers = [(start + end - 1) / 2.0 for start, end in column_runs]
+    spacings = numpy.diff(row_centers).tolist() + numpy.diff(column_centers).tolist()
+    if not spacings:
+        raise CalibrationException('Too few blocks found in the screenshot to find their pitch')
+
+    # Runs may be more than one block apart where entire rows or columns of blocks are empty
+    shortest = min(spacings)
+    offset = numpy.mean([spacing / round(spacing / shortest) for spacing in spacings])
+
+    geometry = GridGeometry(
+        int(round(row_centers[-1] - offset * (BOARD_SIZE - 1))),
+        int(round(column_centers[0])),
+        float(offset),
+    )
+    _validate(geometry, img.shape[:2], row_centers, column_centers)
+
+    return geometry
+
+
+def _validate(geometry, shape, row_centers, column_centers):
+    """
+    Check that a calibrated geometry describes a plausible board.
+
+    :param geometry: The GridGeometry found by calibrating the screenshot.
+    :param shape: A tuple of the shape (height, width) of the screenshot, in pixels.
+    :param row_centers: The pixel rows of the centers of the runs of blocks, in order.
+    :param column_centers: The pixel columns of the centers of the runs of blocks, in order.
+    :raises CalibrationException: If the geometry does not describe a plausible board.
+    """
+    height, width = shape
+    pitch = float(width) / geometry.size
+    if not MIN_PITCH_FRACTION * pitch <= geometry.offset <= MAX_PITCH_FRACTION * pitch:
+        raise CalibrationException(
+            'Implausible pitch of {offset} pixels between blocks for a screenshot {width} pixels '
+            'wide'.format(offset=geometry.offset, width=width)
+        )
+
+    for axis, centers in [('rows', row_centers), ('columns', column_centers)]:
+        positions = (numpy.array(centers) - centers[0]) / geometry.offset
+        if numpy.abs(positions - numpy.rint(positions)).max() > MAX_GRID_ERROR:
+            raise CalibrationException(
+                'The {axis} of blocks found are not evenly spaced'.format(axis=axis)
+            )
+        if int(round(positions[-1])) >= geometry.size:
+            raise CalibrationException('More than {size} {axis} of blocks found'.format(
+                size=geometry.size,
+                axis=axis,
+            ))
+
+    rows, columns = geometry.rows(), geometry.columns()
+    if rows[0] < 0 or rows[-1] >= height or columns[0] < 0 or columns[-1] >= width:
+        raise CalibrationException('The board found does not fit within the screenshot')
+
+
+def _runs(profile):
+    """
+    Find the runs of a projection profile that belong to blocks: those where the count is at least
+    half of its maximum, discarding runs less than half as long as the longest, such as thin lines
+    or text.
+
+    :param profile: A one-dimensional array of foreground pixel counts.
+    :return: A list of tuples of the shape (start, end) of each run, in order.
+    """
+    if not profile.any():
+        return []
+
+    mask = (profile >= profile.max() / 2.0).astype(numpy.int8)
+    edges = numpy.diff(numpy.concatenate(([0], mask, [0])))
+    runs = zip(numpy.flatnonzero(edges == 1).tolist(), numpy.flatnonzero(edges == -1).tolist())
+    longest = max(end - start for start, end in runs)
+
+    return [(start, end) for start, end in runs if 2 * (end - start) > longest]
+
+
+class GeometryProfiles:
+    """
+    Cache of the board geometry of each screenshot resolution, so that screenshots are only
+    calibrated the first time their resolution is seen. Profiles can be persisted to a JSON file,
+    so that they are kept across runs. A profile that turns out to be wrong can be replaced by
+    recalibrating, which discards the known profile of each resolution the first time it is seen.
+    """
+
+    def __init__(self, path=None, profiles=None, recalibrate=False):
+        """
+        Create a new GeometryProfiles.
+
+        :param path: Path of the JSON file in which profiles are persisted; or None to keep them in
+                     memory only. Profiles already in the file are loaded.
+        :param profiles: A dict mapping (height, width) tuples to known GridGeometries, used
+                         wherever the file has no profile of its own.
+        :param recalibrate: True to calibrate the first screenshot of every resolution again,
+                            replacing its known profile, rather than trusting it.
+        """
+        self.path = path
+        self.profiles = dict(profiles or {})
+        self.recalibrate = recalibrate
+        self.calibrations = 0
+        # Resolutions calibrated since the profiles were created
+        self.calibrated = set()
+
+        if path is not None and os.path.exists(path):
+            with open(path) as profiles_file:
+                for resolution, fields in json.load(profiles_file).items():
+                    width, height = map(int, resolution.split('x'))
+                    self.profiles[(height, width)] = GridGeometry(**fields)
+
+    def lookup(self, height, width):
+        """
+        Look up the geometry of a resolution, without calibrating.
+
+        :param height: The height of the screenshot, in pixels.
+        :param width: The width of the screenshot, in pixels.
+        :return: The GridGeometry of the resolution, or None if it has no profile, or if it must be
+                 calibrated again before its profile is trusted.
+        """
+        if self.recalibrate and (height, width) not in self.calibrated:
+            return None
+
+        return self.profiles.get((height, width))
+
+    def geometry(self, img):
+        """
+        Get the geometry of the board in a screenshot, calibrating it and storing its profile if
+        its resolution has not been seen before.
+
+        :param img: The screenshot as a BGR image array.
+        :return: The GridGeometry of the board.
+        :raises CalibrationException: If the screenshot needs calibrating, but too few blocks are
+                                      visible to determine its geometry, or they do not form a
+                                      plausible board. Any known profile is then left unchanged.
+        """
+        height, width = img.shape[:2]
+        geometry = self.lookup(height, width)
+        if geometry is None:
+            geometry = calibrate(img)
+            self.calibrations += 1
+            self.calibrated.add((height, width))
+            self.store(height, width, geometry)
+
+        return geometry
+
+    def store(self, height, width, geometry):
+        """
+        Store the geometry of a resolution, and persist every profile if a path was given.
+
+        :param height: The height of the screenshot, in pixels.
+        :param width: The width of the screenshot, in pixels.
+        :param geometry: The GridGeometry of the resolution.
+        """
+        self.profiles[(height, width)] = geometry
+        if self.path is None:
+            return
+
+        # Write to a uniquely named temporary file first, so that a concurrent run never reads a
+        # partial file, and two runs storing at once never write to the same file
+        descriptor, temporary_path = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(self.path)),
+        )
+        try:
+            with os.fdopen(descriptor, 'w') as profiles_file:
+                json.dump({
+                    '{width}x{height}'.format(width=width, height=height): vars(geometry)
+                    for (height, width), geometry in self.profiles.items()
+                }, profiles_file, indent=2, sort_keys=True)
+            os.rename(temporary_path, self.path)
+        except BaseException:
+            os.remove(temporary_path)
+            raise
+
+    def __repr__(self):
+        return 'GeometryProfiles(size={size}, calibrations={calibrations})'.format(
+            size=len(self.profiles),
+            calibrations=self.calibrations,
+        )
+
+    def __str__(self):
+        return repr(self)
+
+
+class CalibrationException(Exception):
+    """
+    Raised when the geometry of the board cannot be found in a screenshot.
+    """
+    pass
@@ -0,0 +1,153 @@
+import random
+
+
+class MoveOrdering:
+    """
+    Strategy for ordering the moves available from a board, so that a DFS tries the most promising
+    moves first. Moves are sorted by descending score; moves with equal scores keep the row-major
+    order in which they were generated.
+    """
+
+    # Name of the strategy, used to select it with get_ordering
+    name = None
+
+    def score(self, board, move):
+        """
+        Score a single move. Strategies that only need the popped pool should avoid calling
+        move.result(), so that the resulting board is not built until the search reaches it.
+
+        :param board: The board the move is made from.
+        :param move: The Move to score.
+        :return: A sortable score; higher scores are tried first.
+        """
+        raise NotImplementedError
+
+    def order(self, board, moves):
+        """
+        Order the moves available from a board.
+
+        :param board: The board the moves are made from.
+        :param moves: An iterable of Moves, as generated by iter_moves.
+        :return: A new list of the same moves, most promising first.
+        """
+        return sorted(moves, key=lambda move: self.score(board, move), reverse=True)
+
+
+class LargestPoolOrdering(MoveOrdering):
+    """
+    Try the moves that pop the most bricks first.
+    """
+
+    name = 'largest_pool'
+
+    def score(self, board, move):
+        return move.pool.size
+
+
+class ClearsColorOrdering(MoveOrdering):
+    """
+    Try the moves that remove every remaining brick of a color first, since each color cleared
+    removes a constraint from the rest of the board.
+    """
+
+    name = 'clears_color'
+
+    def score(self, board, move):
+        return move.pool.size == board.color_counts()[move.pool.color]
+
+
+class MergesPoolsOrdering(MoveOrdering):
+    """
+    Try the moves that join the most previously separate same-colored pools first.
+    """
+
+    name = 'merges_pools'
+
+    def score(self, board, move):
+        # Popping a pool removes it from the board; any further drop in the number of pools is due
+        # to pools that were brought into contact by the contraction
+        return len(board.pools()) - 1 - len(move.result().pools())
+
+
+class FewestSingletonsOrdering(MoveOrdering):
+    """
+    Try the moves that leave the fewest isolated single bricks first.
+    """
+
+    name = 'fewest_singletons'
+
+    def score(self, board, move):
+        return -sum(1 for pool in move.result().pools() if pool.size == 1)
+
+
+class RandomOrdering(MoveOrdering):
+    """
+    Try moves in a random order, so that repeated searches of the same board explore it
+    differently. Combined after other orderings, it breaks their ties at random.
+    """
+
+    name = 'random'
+
+    def __init__(self, seed=None):
+        """
+        Create a new RandomOrdering.
+
+        :param seed: Seed for the random number generator, for reproducible orders; or None to
+                     seed it from the system.
+        """
+        self.rng = random.Random(seed)
+
+    def score(self, board, move):
+        return self.rng.random()
+
+
+class CombinedOrdering(MoveOrdering):
+    """
+    Order moves by several strategies at once, using each subsequent strategy to break ties left
+    by the ones before it.
+    """
+
+    def __init__(self, orderings):
+        """
+        Create a new CombinedOrdering.
+
+        :param orderings: A list of MoveOrderings, in decreasing order of priority.
+        """
+        self.orderings = orderings
+        self.name = '+'.join(ordering.name for ordering in orderings)
+
+    def score(self, board, move):
+        return tuple(ordering.score(board, move) for ordering in self.orderings)
+
+
+# All single orderings, by name
+ORDERINGS = {
+    ordering.name: ordering
+    for ordering in [
+        LargestPoolOrdering,
+        ClearsColorOrdering,
+        MergesPoolsOrdering,
+        FewestSingletonsOrdering,
+        RandomOrdering,
+    ]
+}
+
+
+def get_ordering(name):
+    """
+    Look up a move ordering by name. Several orderings can be combined by joining their names with
+    '+', e.g. 'clears_color+largest_pool'.
+
+    :param name: Name of the ordering.
+    :return: A MoveOrdering instance.
+    :raises ValueError: If any of the named orderings does not exist.
+    """
+    names = name.split('+')
+    unknown = [ordering for ordering in names if ordering not in ORDERINGS]
+    if unknown:
+        raise ValueError('Unknown move ordering: {unknown}'.format(unknown=', '.join(unknown)))
+
+    if len(names) == 1:
+        return ORDERINGS[name]()
+
+    return CombinedOrdering([ORDERINGS[ordering]() for ordering in names])
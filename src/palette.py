@@ -0,0 +1,121 @@
+import numpy
+
+from color import Color
+from color import EmptyColor
+
+# The hexadecimal BGR codes of the colors of the blocks in the game
+GAME_COLOR_CODES = ('36b2fd', '726dff', '9cb10e', 'f2964f', 'ee6fb3', '748897')
+# The hexadecimal BGR code of the background color shown in place of a cleared block
+EMPTY_COLOR_CODE = 'e4eff7'
+# Maximum Euclidean distance in BGR space between a pixel and a color of the palette for the pixel
+# to be classified as that color. The closest two game colors are about 91 apart, so no pixel is
+# ever within the tolerance of two of them.
+DEFAULT_TOLERANCE = 40
+# Number of most significant bits of each channel used to index the lookup table
+LOOKUP_TABLE_BITS = 5
+# Index in the lookup table of pixels that are not within the tolerance of any color of the palette
+UNMATCHED = 0xff
+
+
+def parse_color_code(code):
+    """
+    Convert a hexadecimal BGR color code into its channel values.
+
+    :param code: Hexadecimal BGR color code, e.g. 'e4eff7'.
+    :return: A tuple of the shape (b, g, r).
+    """
+    return tuple(int(code[idx:idx + 2], 16) for idx in range(0, 6, 2))
+
+
+class ColorClassifier:
+    """
+    Classifier of the pixels sampled from a screenshot into a fixed palette of colors, tolerant of
+    compression noise and differences in display gamma between devices.
+
+    Every pixel is classified as the nearest color of the palette, unless it is further than the
+    tolerance from all of them. The nearest color is precomputed for every cell of a quantized BGR
+    lookup table, so classifying a pixel takes a single table lookup, however many colors are in
+    the palette.
+    """
+
+    def __init__(self, color_codes=GAME_COLOR_CODES, empty_code=EMPTY_COLOR_CODE,
+                 tolerance=DEFAULT_TOLERANCE, patch_radius=0, bits=LOOKUP_TABLE_BITS):
+        """
+        Create a new ColorClassifier.
+
+        :param color_codes: Hexadecimal BGR codes of the colors of the blocks.
+        :param empty_code: Hexadecimal BGR code of the background shown in place of a cleared
+                           block, which is classified as the EmptyColor.
+        :param tolerance: Maximum Euclidean distance in BGR space between a pixel and the color it
+                          is classified as.
+        :param patch_radius: Number of pixels on either side of the center of each block that are
+                             averaged with it along its sampled row, to smooth out noise; or 0 to
+                             sample only the center pixel.
+        :param bits: Number of most significant bits of each channel used to index the lookup
+                     table, which has 2^(3 * bits) cells.
+        """
+        self.codes = (empty_code,) + tuple(color_codes)
+        self.colors = [EmptyColor()] + [Color(code) for code in color_codes]
+        self.tolerance = tolerance
+        self.patch_radius = patch_radius
+        self.bits = bits
+        self.table = self._build_table()
+
+    def _build_table(self):
+        """
+        Precompute the classification of the pixel at the center of every cell of the lookup table.
+
+        :return: A uint8 array with one entry for each cell, holding the index into colors of the
+                 nearest color, or UNMATCHED if the cell is not within the tolerance of any color.
+        """
+        levels = 1 << self.bits
+        width = 256 >> self.bits
+        centers = numpy.arange(levels) * width + (width - 1) / 2.0
+        cells = numpy.stack(numpy.meshgrid(centers, centers, centers, indexing='ij'), axis=-1)
+        cells = cells.reshape(-1, 1, 3)
+
+        palette = numpy.array([parse_color_code(code) for code in self.codes], dtype=float)
+        distances = numpy.sqrt(((cells - palette) ** 2).sum(axis=2))
+        nearest = distances.argmin(axis=1)
+
+        table = nearest.astype(numpy.uint8)
+        table[distances.min(axis=1) > self.tolerance] = UNMATCHED
+        return table
+
+    def sample(self, rows, columns):
+        """
+        Sample the pixel at the center of every block from the rows of a screenshot, averaging
+        the patch around it if a patch radius was given.
+
+        :param rows: The rows of pixels through the middle of each row of blocks, as a BGR image
+                     array.
+        :param columns: An array of the pixel columns through the middle of each column of blocks.
+        :return: A BGR image array with one pixel for each block.
+        """
+        if not self.patch_radius:
+            return rows[:, columns]
+
+        offsets = numpy.arange(-self.patch_radius, self.patch_radius + 1)
+        patches = numpy.clip(columns[:, numpy.newaxis] + offsets, 0, rows.shape[1] - 1)
+        return numpy.rint(rows[:, patches].mean(axis=2)).astype(numpy.uint8)
+
+    def classify(self, samples):
+        """
+        Classify pixels into the palette.
+
+        :param samples: A BGR image array of pixels.
+        :return: An integer array of the same shape, without its channels, holding the index into
+                 colors of the color of each pixel, or UNMATCHED if it matches no color.
+        """
+        cells = (samples >> (8 - self.bits)).astype(numpy.intp)
+        idx = (cells[..., 0] << (2 * self.bits)) | (cells[..., 1] << self.bits) | cells[..., 2]
+        return self.table[idx]
+
+    def __repr__(self):
+        return 'ColorClassifier(colors={colors}, tolerance={tolerance})'.format(
+            colors=len(self.codes) - 1,
+            tolerance=self.tolerance,
+        )
+
+    def __str__(self):
+        return repr(self)
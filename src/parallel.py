@@ -0,0 +1,394 @@
+import Queue
+import multiprocessing
+import threading
+import time
+
+from budget import BudgetExhaustedException
+from budget import SharedNodeBudget
+from prune import Pruner
+from solution import EmptySolution
+from solution import Solution
+from transposition import DEFAULT_SHARED_TABLE_SLOTS
+from transposition import SharedTranspositionTable
+from transposition import TranspositionTable
+
+# Number of nodes a worker expands between checks for idle peers and cancellation
+SPLIT_CHECK_INTERVAL = 64
+# Number of seconds to wait for a worker to stop cooperatively before it is terminated
+WORKER_JOIN_TIMEOUT = 5
+# Number of seconds to wait on the result queue at a time before checking that the workers are alive
+RESULT_POLL_INTERVAL = 0.1
+
+
+class SearchFrame:
+    """
+    A single level of a worker's explicit DFS stack.
+    """
+
+    def __init__(self, steps, board, ordering=None):
+        """
+        Create a new frame and generate the moves available from its board.
+
+        :param steps: The steps taken to reach the board.
+        :param board: The board being expanded at this level.
+        :param ordering: MoveOrdering used to decide which moves to try first; or None to try
+                         moves in row-major order.
+        """
+        self.steps = steps
+        self.board = board
+        self.moves = list(board.iter_moves())
+        if ordering is not None:
+            self.moves = ordering.order(board, self.moves)
+        # Set once any of this frame's moves are handed to another worker, since the frame's board
+        # can then no longer be proven unsolvable by this worker alone
+        self.split = False
+
+
+def split_stack(stack, tasks, outstanding):
+    """
+    Hand part of a worker's remaining work to idle peers. The shallowest frame with unexplored
+    moves is chosen, since it holds the largest subtrees, and half of its remaining moves are
+    pushed onto the shared task queue.
+
+    :param stack: The worker's DFS stack, a list of SearchFrames from shallowest to deepest.
+    :param tasks: Shared queue of (steps, board) tasks.
+    :param outstanding: Shared counter of tasks that have been queued but not yet completed.
+    :return: The number of tasks handed off.
+    """
+    for depth, frame in enumerate(stack):
+        if not frame.moves:
+            continue
+
+        num_donated = max(1, len(frame.moves) // 2)
+        donated = frame.moves[-num_donated:]
+        del frame.moves[-num_donated:]
+
+        with outstanding.get_lock():
+            outstanding.value += num_donated
+        for move in donated:
+            tasks.put((frame.steps + (move.coord,), move.result()))
+
+        for ancestor in stack[:depth + 1]:
+            ancestor.split = True
+
+        return num_donated
+
+    return 0
+
+
+def search_task(steps, board, tasks, stop, outstanding, idle, table, pruner, ordering=None,
+                budget=None):
+    """
+    Run a DFS over a single task's subtree with an explicit stack, periodically splitting off
+    work for idle peers, checking for cancellation, and charging the nodes expanded to the budget.
+
+    :param steps: The steps taken to reach the task's board.
+    :param board: The root board of the task.
+    :param tasks: Shared queue of (steps, board) tasks.
+    :param stop: Shared event that is set once the search should be abandoned.
+    :param outstanding: Shared counter of tasks that have been queued but not yet completed.
+    :param idle: Shared counter of workers waiting for a task.
+    :param table: This worker's TranspositionTable.
+    :param pruner: This worker's Pruner.
+    :param ordering: MoveOrdering used to decide which moves to try first; or None to try moves in
+                     row-major order.
+    :param budget: SharedNodeBudget charged for the nodes expanded, every SPLIT_CHECK_INTERVAL
+                   nodes; or None to leave the search unbounded.
+    :return: A Solution if one was found; None if the subtree has no solution or the search was
+             cancelled.
+    :raises BudgetExhaustedException: If the budget runs out.
+    """
+    if board.is_solved():
+        return Solution(steps)
+
+    if table.lookup(board) or pruner.prune(board):
+        return None
+
+    stack = [SearchFrame(steps, board, ordering)]
+    nodes = 0
+
+    while stack:
+        frame = stack[-1]
+        if not frame.moves:
+            stack.pop()
+            if not frame.split:
+                table.store(frame.board)
+            continue
+
+        nodes += 1
+        if nodes % SPLIT_CHECK_INTERVAL == 0:
+            if stop.is_set():
+                return None
+            if budget is not None:
+                budget.charge(SPLIT_CHECK_INTERVAL)
+            if idle.value > 0:
+                split_stack(stack, tasks, outstanding)
+                continue
+
+        move = frame.moves.pop(0)
+        child = move.result()
+        child_steps = frame.steps + (move.coord,)
+        if child.is_solved():
+            return Solution(child_steps)
+
+        if table.lookup(child) or pruner.prune(child):
+            continue
+
+        stack.append(SearchFrame(child_steps, child, ordering))
+
+    if budget is not None:
+        budget.charge(nodes % SPLIT_CHECK_INTERVAL)
+
+    return None
+
+
+def worker(tasks, results, stop, outstanding, idle, table=None, ordering=None, budget=None):
+    """
+    Main loop of a single worker process. Tasks are pulled from the shared queue until a sentinel
+    is received or the search is stopped.
+
+    :param tasks: Shared queue of (steps, board) tasks. A None task signals the worker to exit.
+    :param results: Shared queue into which the final Solution or EmptySolution is inserted.
+    :param stop: Shared event that is set once the search should be abandoned.
+    :param outstanding: Shared counter of tasks that have been queued but not yet completed.
+    :param idle: Shared counter of workers waiting for a task.
+    :param table: SharedTranspositionTable used by every worker in the pool. A private
+                  TranspositionTable is created if none is specified.
+    :param ordering: MoveOrdering used to decide which moves to try first; or None to try moves in
+                     row-major order.
+    :param budget: SharedNodeBudget shared by every worker in the pool; or None to leave the
+                   search unbounded. If it runs out, the search is stopped and a
+                   BudgetExhaustedException is inserted into the results in place of a solution.
+    """
+    try:
+        _work(tasks, results, stop, outstanding, idle, table, ordering, budget)
+    except BaseException as e:
+        # The task this worker was searching is lost, so the solve can never finish on its own
+        results.put(WorkerFailedException('A worker process failed: {error!r}'.format(error=e)))
+        raise
+    finally:
+        # Tasks left in the queue are of no use once the search is over; don't block process
+        # exit waiting for them to be consumed
+        tasks.cancel_join_thread()
+
+
+def _work(tasks, results, stop, outstanding, idle, table, ordering, budget):
+    """
+    Pull and search tasks until a sentinel is received, the search is stopped, or a solution is
+    found.
+
+    :param tasks: Shared queue of (steps, board) tasks. A None task signals the worker to exit.
+    :param results: Shared queue into which the final Solution or EmptySolution is inserted.
+    :param stop: Shared event that is set once the search should be abandoned.
+    :param outstanding: Shared counter of tasks that have been queued but not yet completed.
+    :param idle: Shared counter of workers waiting for a task.
+    :param table: SharedTranspositionTable used by every worker in the pool, or None.
+    :param ordering: MoveOrdering used to decide which moves to try first, or None.
+    :param budget: SharedNodeBudget shared by every worker in the pool, or None.
+    """
+    table = table if table is not None else TranspositionTable()
+    pruner = Pruner()
+
+    while True:
+        with idle.get_lock():
+            idle.value += 1
+        task = tasks.get()
+        with idle.get_lock():
+            idle.value -= 1
+
+        if task is None or stop.is_set():
+            break
+
+        steps, board = task
+        try:
+            solution = search_task(
+                steps,
+                board,
+                tasks,
+                stop,
+                outstanding,
+                idle,
+                table,
+                pruner,
+                ordering,
+                budget,
+            )
+        except BudgetExhaustedException as e:
+            # Stop every other worker too, since the budget is shared
+            stop.set()
+            results.put(e)
+            break
+
+        if solution is not None:
+            results.put(solution)
+            break
+
+        with outstanding.get_lock():
+            outstanding.value -= 1
+            if not outstanding.value:
+                # Every task has been exhausted without finding a solution
+                results.put(EmptySolution())
+
+
+class SolveHandle:
+    """
+    Handle to a parallel solve running in a pool of worker processes. The solve starts as soon as
+    the handle is created; callers can block on its result or cancel it from any thread.
+    """
+
+    def __init__(self, board, num_processes=None, table_slots=DEFAULT_SHARED_TABLE_SLOTS,
+                 ordering=None, node_budget=None):
+        """
+        Start solving a board in parallel.
+
+        :param board: An instance of the game board.
+        :param num_processes: Number of worker processes to use; defaults to the number of CPUs.
+        :param table_slots: Number of slots in the transposition table shared by all workers.
+        :param ordering: MoveOrdering used by every worker to decide which moves to try first; or
+                         None to try moves in row-major order.
+        :param node_budget: Maximum number of nodes the workers may expand in total; or None for
+                            no limit.
+        """
+        self.tasks = multiprocessing.Queue()
+        self.results = multiprocessing.Queue()
+        self.stop = multiprocessing.Event()
+        self.outstanding = multiprocessing.Value('i', 1)
+        self.idle = multiprocessing.Value('i', 0)
+        self.table = SharedTranspositionTable(table_slots)
+        self.budget = SharedNodeBudget(node_budget)
+        self.solution = None
+        self.error = None
+        self.cancelled = False
+        self.reaped = False
+        self._lock = threading.Lock()
+
+        # The entire search starts out as a single task
+        self.tasks.put((tuple([]), board))
+
+        self.processes = [
+            multiprocessing.Process(
+                target=worker,
+                args=(
+                    self.tasks,
+                    self.results,
+                    self.stop,
+                    self.outstanding,
+                    self.idle,
+                    self.table,
+                    ordering,
+                    self.budget,
+                ),
+            )
+            for _ in range(num_processes or multiprocessing.cpu_count())
+        ]
+        for p in self.processes:
+            p.start()
+
+    def result(self, timeout=None):
+        """
+        Wait for the solve to finish. The calling thread sleeps on the result queue, waking up every
+        RESULT_POLL_INTERVAL seconds to check that no worker has died, and does not otherwise use
+        any CPU while the workers search.
+
+        :param timeout: Maximum number of seconds to wait, or None to wait indefinitely.
+        :return: A valid Solution, or an EmptySolution if the board has no solution or the solve
+                 was cancelled.
+        :raises SolveTimeoutException: If the solve has not finished within the timeout.
+        :raises BudgetExhaustedException: If the workers expanded more nodes than the node budget
+                                          allows.
+        :raises WorkerFailedException: If a worker raised an exception or exited unexpectedly, so
+                                       that the solve can never finish.
+        """
+        if self.error is not None:
+            raise self.error
+
+        if self.solution is None:
+            deadline = time.time() + timeout if timeout is not None else None
+            while True:
+                wait = RESULT_POLL_INTERVAL
+                if deadline is not None:
+                    wait = min(wait, max(0, deadline - time.time()))
+                try:
+                    # Either some worker finds a valid solution, the last worker to finish a task
+                    # reports that every task was exhausted without one, a worker reports that it
+                    # failed or ran out of budget, or a cancellation wakes this thread up with a
+                    # None
+                    solution = self.results.get(timeout=wait)
+                    break
+                except Queue.Empty:
+                    if self._worker_died():
+                        solution = WorkerFailedException('A worker process exited unexpectedly')
+                        break
+                    if deadline is not None and time.time() >= deadline:
+                        raise SolveTimeoutException('The solve did not finish within the timeout')
+
+            self._shutdown()
+            if isinstance(solution, (BudgetExhaustedException, WorkerFailedException)):
+                self.error = solution
+                raise solution
+            self.solution = solution if solution is not None else EmptySolution()
+
+        return self.solution
+
+    def _worker_died(self):
+        """
+        Check if any worker has exited while the search was still running. Workers only ever exit
+        on their own once they report a result, or once the solve is stopped.
+
+        :return: True if a worker exited with an error before the solve was stopped.
+        """
+        return not self.stop.is_set() and any(p.exitcode for p in self.processes)
+
+    def cancel(self):
+        """
+        Abort the solve, stopping and reaping all worker processes. Any thread blocked on the
+        result of this handle is woken up with an EmptySolution.
+        """
+        self.cancelled = True
+        self._shutdown()
+        self.results.put(None)
+
+    def done(self):
+        """
+        Check if the solve has finished, without blocking.
+
+        :return: True if a result is available or the solve was cancelled; False otherwise.
+        """
+        return self.solution is not None or self.cancelled or not self.results.empty()
+
+    def _shutdown(self):
+        """
+        Signal every worker to stop cooperatively and reap all of them. Workers that do not stop
+        within WORKER_JOIN_TIMEOUT seconds are terminated. Calling this more than once is safe.
+        """
+        with self._lock:
+            # Workers may set the stop event themselves, e.g. once the budget runs out, so it does
+            # not tell whether the workers have been reaped yet
+            if self.reaped:
+                return
+            self.reaped = True
+
+            # Stop workers in the middle of a search, and wake up any that are waiting for a task
+            self.stop.set()
+            for _ in self.processes:
+                self.tasks.put(None)
+
+            for p in self.processes:
+                p.join(WORKER_JOIN_TIMEOUT)
+                if p.is_alive():
+                    p.terminate()
+                    p.join()
+
+
+class SolveTimeoutException(Exception):
+    """
+    Raised when waiting on the result of a solve times out.
+    """
+    pass
+
+
+class WorkerFailedException(Exception):
+    """
+    Raised when a worker process of a solve fails, so that the solve can never finish.
+    """
+    pass
@@ -0,0 +1,231 @@
+import Queue
+import multiprocessing
+import time
+
+from beam import DEFAULT_BEAM_WIDTH
+from beam import beam_solve
+from ordering import get_ordering
+from parallel import RESULT_POLL_INTERVAL
+from parallel import SolveTimeoutException
+from restart import restart_solve
+from solution import EmptySolution
+from solve import serial_solve
+
+# Name of the move ordering used by the heuristic DFS strategy of the default portfolio
+DEFAULT_PORTFOLIO_ORDERING = 'clears_color+merges_pools'
+
+
+class Strategy:
+    """
+    A single way of searching a board, run by one process of a portfolio solve.
+    """
+
+    # Unique name of the strategy, reported when it wins a portfolio solve
+    name = None
+    # True if an EmptySolution from the strategy proves the board has no solution
+    complete = True
+
+    def search(self, board):
+        """
+        Search the board for a solution.
+
+        :param board: The board to solve.
+        :return: A Solution, or an EmptySolution if none was found.
+        """
+        raise NotImplementedError
+
+    def __repr__(self):
+        return 'Strategy({name})'.format(name=self.name)
+
+    def __str__(self):
+        return repr(self)
+
+
+class DFSStrategy(Strategy):
+    """
+    Serial DFS, trying moves in row-major order or by a named move ordering.
+    """
+
+    def __init__(self, ordering=None):
+        """
+        Create a new DFSStrategy.
+
+        :param ordering: Name of the move ordering, as accepted by get_ordering; or None to try
+                         moves in row-major order.
+        """
+        self.ordering = ordering
+        self.name = 'dfs:{ordering}'.format(ordering=ordering) if ordering else 'dfs'
+
+    def search(self, board):
+        ordering = get_ordering(self.ordering) if self.ordering else None
+        return serial_solve(board, ordering=ordering)
+
+
+class RestartStrategy(Strategy):
+    """
+    Randomized restarts of serial DFS, with move orders drawn from a seeded generator.
+    """
+
+    def __init__(self, seed):
+        """
+        Create a new RestartStrategy.
+
+        :param seed: Seed for the random move orders of every restart.
+        """
+        self.seed = seed
+        self.name = 'restart:{seed}'.format(seed=seed)
+
+    def search(self, board):
+        return restart_solve(board, seed=self.seed)
+
+
+class BeamStrategy(Strategy):
+    """
+    Beam search for the highest scoring solution. Beam search is not exhaustive, so failing to
+    find a solution does not prove the board has none.
+    """
+
+    complete = False
+
+    def __init__(self, width):
+        """
+        Create a new BeamStrategy.
+
+        :param width: The maximum number of boards to keep at each depth.
+        """
+        self.width = width
+        self.name = 'beam:{width}'.format(width=width)
+
+    def search(self, board):
+        return beam_solve(board, width=self.width)
+
+
+class PortfolioResult:
+    """
+    Outcome of a portfolio solve.
+    """
+
+    def __init__(self, strategy, solution, elapsed):
+        """
+        Create a new PortfolioResult.
+
+        :param strategy: Name of the strategy that decided the solve, or None if no strategy
+                         could.
+        :param solution: The Solution found, or an EmptySolution if the board has no solution.
+        :param elapsed: Wall clock duration of the solve, in seconds.
+        """
+        self.strategy = strategy
+        self.solution = solution
+        self.elapsed = elapsed
+
+    def __repr__(self):
+        return 'PortfolioResult({strategy}, {solution}, elapsed={elapsed:.3f})'.format(
+            strategy=self.strategy,
+            solution=self.solution,
+            elapsed=self.elapsed,
+        )
+
+    def __str__(self):
+        return repr(self)
+
+
+def default_strategies(num_processes=None):
+    """
+    Build the default portfolio: plain DFS, heuristic-ordered DFS, and beam search, with the
+    remaining processes running randomized restarts under different seeds.
+
+    :param num_processes: Total number of strategies to run; defaults to the number of CPUs. At
+                          least one randomized restart is always included.
+    :return: A list of Strategies.
+    """
+    strategies = [
+        DFSStrategy(),
+        DFSStrategy(DEFAULT_PORTFOLIO_ORDERING),
+        BeamStrategy(DEFAULT_BEAM_WIDTH),
+    ]
+    num_restarts = max(1, (num_processes or multiprocessing.cpu_count()) - len(strategies))
+
+    return strategies + [RestartStrategy(seed) for seed in range(num_restarts)]
+
+
+def portfolio_worker(strategy, board, results):
+    """
+    Run a single strategy of a portfolio solve in a worker process.
+
+    :param strategy: The Strategy to run.
+    :param board: The board to solve.
+    :param results: Shared queue into which a tuple of the shape (name, solution) is inserted. The
+                    solution is None if the strategy failed, so that the race does not wait on it.
+    """
+    try:
+        solution = strategy.search(board)
+    except BaseException:
+        results.put((strategy.name, None))
+        raise
+
+    results.put((strategy.name, solution))
+
+
+def portfolio_solve(board, strategies=None, timeout=None):
+    """
+    Race several search strategies against each other, one worker process per strategy. The first
+    strategy to find a valid solution wins, and every other strategy is stopped. A complete
+    strategy that exhausts the board without finding a solution also ends the race, since it
+    proves that no strategy can find one.
+
+    The results are polled every RESULT_POLL_INTERVAL seconds, so that a strategy whose process
+    was killed outright, without reporting, is counted as failed instead of waited on forever.
+
+    :param board: The board to solve.
+    :param strategies: A list of Strategies with distinct names; defaults to default_strategies().
+    :param timeout: Maximum number of seconds to wait, or None to wait indefinitely.
+    :return: A PortfolioResult naming the strategy that won.
+    :raises SolveTimeoutException: If no strategy has decided the solve within the timeout.
+    """
+    if strategies is None:
+        strategies = default_strategies()
+
+    start_time = time.time()
+    deadline = start_time + timeout if timeout is not None else None
+
+    results = multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(target=portfolio_worker, args=(strategy, board, results))
+        for strategy in strategies
+    ]
+    for p in processes:
+        p.start()
+
+    complete = set(strategy.name for strategy in strategies if strategy.complete)
+
+    # Names of the strategies that finished without deciding the race, or whose process died
+    finished = set()
+    try:
+        while len(finished) < len(strategies):
+            wait = RESULT_POLL_INTERVAL
+            if deadline is not None:
+                wait = min(wait, max(0, deadline - time.time()))
+            try:
+                name, solution = results.get(timeout=wait)
+            except Queue.Empty:
+                finished.update(
+                    strategy.name
+                    for strategy, p in zip(strategies, processes)
+                    if p.exitcode
+                )
+                if deadline is not None and time.time() >= deadline:
+                    raise SolveTimeoutException('No strategy finished within the timeout')
+                continue
+
+            if solution is not None and (not solution.is_empty() or name in complete):
+                return PortfolioResult(name, solution, time.time() - start_time)
+            finished.add(name)
+
+        # Every strategy finished without finding a solution, and none of them could prove that
+        # the board has none
+        return PortfolioResult(None, EmptySolution(), time.time() - start_time)
+    finally:
+        # The losing strategies have no cooperative way to stop, and hold no shared state
+        for p in processes:
+            p.terminate()
+            p.join()
@@ -0,0 +1,69 @@
+class PruningRule:
+    """
+    A cheap test that proves a board configuration can never be solved. Rules must be sound: a
+    rule may fail to detect a dead board, but must never reject a board that has a solution.
+    """
+
+    # Name of the rule, used to report how many boards it has pruned
+    name = None
+
+    def is_dead(self, board):
+        """
+        Determine if the board can be proven to have no solution.
+
+        :param board: The board to test.
+        :return: True if the board can never be solved; False if it may be solvable.
+        """
+        raise NotImplementedError
+
+
+class SingletonColorRule(PruningRule):
+    """
+    Bricks can only be removed in flood pools of at least two, so a color with exactly one brick
+    remaining can never be cleared.
+    """
+
+    name = 'singleton_color'
+
+    def is_dead(self, board):
+        return 1 in board.color_counts().values()
+
+
+class Pruner:
+    """
+    Pruning stage run against each board before it is expanded by the search. Each rule is tried
+    in order, and the number of boards rejected by each rule is tracked individually.
+    """
+
+    def __init__(self, rules=None):
+        """
+        Create a new Pruner.
+
+        :param rules: A list of PruningRules to apply, in order. The default rules are used if
+                      none are specified.
+        """
+        self.rules = rules if rules is not None else [SingletonColorRule()]
+        self.counts = {rule.name: 0 for rule in self.rules}
+
+    def prune(self, board):
+        """
+        Determine if a board should be pruned from the search.
+
+        :param board: The board to test.
+        :return: True if any rule proves the board can never be solved; False otherwise.
+        """
+        for rule in self.rules:
+            if rule.is_dead(board):
+                self.counts[rule.name] += 1
+                return True
+
+        return False
+
+    def __repr__(self):
+        return 'Pruner({counts})'.format(counts=', '.join(
+            '{name}={count}'.format(name=rule.name, count=self.counts[rule.name])
+            for rule in self.rules
+        ))
+
+    def __str__(self):
+        return repr(self)
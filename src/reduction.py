@@ -0,0 +1,150 @@
+from bitboard import MaskPool
+
+
+class SleepSetReduction:
+    """
+    Partial-order reduction for the DFS, based on sleep sets.
+
+    Two moves from the same board are independent if popping either one leaves the other's pool
+    exactly in place, so that the two pops can be made in either order and lead to the same board.
+    This is typically the case for pools in distant columns, when neither pop moves any brick into
+    contact with the other pool.
+
+    Once the search has explored a move, every later sibling that is independent of it puts the
+    explored move to sleep in its own subtree: any board reachable by making the explored move
+    beneath the sibling is also reachable by making it first, and has already been searched.
+    Sleeping moves stay asleep down the tree for as long as they remain independent of the moves
+    taken, so each set of mutually independent pops is only ever explored in a single order.
+
+    Sleep sets never hide a board that could lead to a solution, so they remain sound alongside a
+    transposition table of boards known to have no solution.
+    """
+
+    def __init__(self):
+        """
+        Create a new SleepSetReduction.
+        """
+        self.skipped = 0
+
+    def expand(self, board, moves, sleep):
+        """
+        Filter the moves from a board down to those that must be explored.
+
+        :param board: The board the moves are made from.
+        :param moves: An iterable of Moves, in the order the search will try them.
+        :param sleep: A sequence of Pools on the board whose moves need not be explored.
+        :return: A generator of tuples of the shape (Move, sleep), one for each move that must be
+                 explored, where sleep is the sequence of Pools to pass down to the board
+                 resulting from the move.
+        """
+        awake = []
+        asleep = []
+        for move in moves:
+            if any(self._same_pool(move.pool, pool) for pool in sleep):
+                asleep.append(move)
+            else:
+                awake.append(move)
+        self.skipped += len(asleep)
+
+        explored = []
+        for move in awake:
+            yield move, tuple(
+                other.pool
+                for other in asleep + explored
+                if self.independent(move, other, board)
+            )
+            explored.append(move)
+
+    def independent(self, one, two, board=None):
+        """
+        Determine if two moves from the same board can be made in either order with the same
+        outcome.
+
+        Flood pools are connected, so each spans a contiguous range of columns. Pools that share a
+        column are always dependent, since popping the lower of two bricks in a column drops the
+        one above it. Pools at least one column apart are always independent, unless the pool on
+        the left could empty a column and shift the other pool left: bricks only move within the
+        columns of the pool popped, so none of them can come to touch the other pool. Only pools in
+        neighboring columns, or whose columns may be emptied, are popped to compare the resulting
+        boards.
+
+        :param one: A Move.
+        :param two: Another Move from the same board.
+        :param board: The board both moves are made from, used to compare the columns of their
+                      pools without popping either; or None to always compare the popped boards.
+        :return: True if each move leaves the other's pool exactly in place; False otherwise.
+        """
+        if board is not None:
+            left, right = sorted([self._span(board, one.pool), self._span(board, two.pool)])
+            first_left, last_left, touches_bottom_left = left
+            first_right = right[0]
+
+            if last_left >= first_right:
+                return False
+            if first_right - last_left > 1 and not touches_bottom_left:
+                return True
+
+        return self._has_pool(one.result(), two.pool) and self._has_pool(two.result(), one.pool)
+
+    @staticmethod
+    def _span(board, pool):
+        """
+        Find the columns a pool occupies, without popping it.
+
+        :param board: The board the pool is on.
+        :param pool: A Pool or MaskPool on the board.
+        :return: A tuple of the shape (first, last, touches_bottom), where first and last are the
+                 leftmost and rightmost columns of the pool, and touches_bottom is True if the pool
+                 includes a brick on the bottom row, which is required to empty a column.
+        """
+        if isinstance(pool, MaskPool):
+            stride = getattr(board, 'bitboard', board).stride
+            first = ((pool.mask & -pool.mask).bit_length() - 1) // stride
+            last = (pool.mask.bit_length() - 1) // stride
+            bottom = sum(1 << (column * stride) for column in range(first, last + 1))
+
+            return first, last, bool(pool.mask & bottom)
+
+        columns = [coord.j for coord in pool.indices]
+        bottom_row = len(board.board) - 1
+
+        return min(columns), max(columns), any(coord.i == bottom_row for coord in pool.indices)
+
+    def _has_pool(self, board, pool):
+        """
+        Check if a board contains a pool with exactly the same bricks in the same place.
+
+        :param board: The board to search.
+        :param pool: A Pool from another board.
+        :return: True if the board has an identical pool; False otherwise.
+        """
+        return any(self._same_pool(other, pool) for other in board.pools())
+
+    @staticmethod
+    def _same_pool(one, two):
+        """
+        Check if two pools consist of the same color in the same cells.
+
+        :param one: A Pool.
+        :param two: Another Pool.
+        :return: True if the pools are identical; False otherwise.
+        """
+        return one.size == two.size and one.color == two.color and \
+            SleepSetReduction._cells(one) == SleepSetReduction._cells(two)
+
+    @staticmethod
+    def _cells(pool):
+        """
+        Get the cells of a pool, in a form that can be compared to those of other pools from the
+        same kind of board.
+
+        :param pool: A Pool.
+        :return: The mask of a MaskPool, or the set of Coordinates of any other Pool.
+        """
+        return pool.mask if isinstance(pool, MaskPool) else pool.indices
+
+    def __repr__(self):
+        return 'SleepSetReduction(skipped={skipped})'.format(skipped=self.skipped)
+
+    def __str__(self):
+        return repr(self)
@@ -0,0 +1,301 @@
+from functools import partial
+
+from bitboard import BitBoard
+from bitboard import MaskPool
+from board import InvalidPopException
+from board import Move
+from coordinate import Coordinate
+
+
+class RegionGraph:
+    """
+    Representation of the game board as a graph of regions. Each node is a flood pool, carrying
+    its color and size, and an edge joins every pair of pools that touch. After the first few pops
+    a board consists of far fewer regions than cells, and a pop only ever disturbs the regions in
+    the columns it empties or shifts.
+
+    The geometry of the board is held by a BitBoard, which applies column gravity and empty column
+    removal exactly as Board.contract does. After each pop, regions whose cells were not moved by
+    the contraction and that were not brought into contact with a brick of their own color are
+    carried over to the new graph unchanged, along with the edges between them; only the rest of
+    the board is flooded again. Regions and edges are only built once they are first requested,
+    so that graphs rejected by a transposition table or pruning rule cost no more than a BitBoard;
+    graphs created by a pop derive both from those of their parent.
+
+    RegionGraph can be searched by every solver in place of a Board or BitBoard.
+    """
+
+    def __init__(self, bitboard, regions):
+        """
+        Construct a RegionGraph directly from its regions.
+        Do not call this method directly; rather, use the static from_board method on RegionGraph.
+
+        :param bitboard: The BitBoard describing the geometry of the board.
+        :param regions: A list of MaskPools partitioning every brick on the board, ordered by the
+                        row-major position of their representative coordinates.
+        """
+        self.bitboard = bitboard
+        self._regions = regions
+        self._edges = None
+        # The graph and region popped to create this graph, until its regions are first built
+        self._origin = None
+
+    @staticmethod
+    def from_board(board):
+        """
+        Create a RegionGraph describing the same configuration as a Board or BitBoard.
+
+        :param board: A Board or BitBoard instance.
+        :return: A RegionGraph instance describing the input.
+        """
+        if not isinstance(board, BitBoard):
+            board = BitBoard.from_board(board)
+
+        return RegionGraph(board, board.pools())
+
+    def to_board(self):
+        """
+        Create a Board describing the same configuration as this RegionGraph.
+
+        :return: A Board instance describing this RegionGraph.
+        """
+        return self.bitboard.to_board()
+
+    def key(self):
+        """
+        Get a compact, canonical encoding of this board, identical to that of its BitBoard.
+
+        :return: A hashable tuple that is equal for two boards if and only if the boards are equal.
+        """
+        return self.bitboard.key()
+
+    def zobrist(self):
+        """
+        Get the Zobrist hash of this board, which is identical to that of the equivalent Board.
+
+        :return: A 64-bit integer; zero for a board with no bricks.
+        """
+        return self.bitboard.zobrist()
+
+    def color_counts(self):
+        """
+        Get the number of bricks remaining of each color.
+
+        :return: A dict mapping each Color on the board to its number of bricks.
+        """
+        return self.bitboard.color_counts()
+
+    def is_solved(self):
+        """
+        Determine if the board is in a solved state.
+
+        :return: True if the board is solved; False otherwise.
+        """
+        return self.bitboard.is_solved()
+
+    def pools(self):
+        """
+        Get every region of the board. Regions of a graph created by a pop are derived from its
+        parent the first time they are requested, and cached thereafter.
+
+        :return: A list of MaskPools, ordered by the row-major position of their representative
+                 coordinates.
+        """
+        if self._regions is None:
+            parent, region = self._origin
+            self._origin = None
+            self._derive(parent, region)
+
+        return self._regions
+
+    def edges(self):
+        """
+        Get the adjacency of every region. Edges are computed the first time they are requested,
+        and cached thereafter.
+
+        :return: A dict mapping each region to the set of regions it touches.
+        """
+        if self._edges is None:
+            self._edges = self._link(self.pools(), {})
+
+        return self._edges
+
+    def neighbors(self, region):
+        """
+        Get the regions that touch a region. Regions that touch always have different colors,
+        since touching bricks of the same color belong to the same region.
+
+        :param region: A MaskPool on this graph.
+        :return: A set of MaskPools.
+        """
+        return self.edges()[region]
+
+    def iter_moves(self):
+        """
+        Lazily generate the available moves. Exactly one move is generated for each region that
+        can be popped, and the graph resulting from a move is only built when it is first
+        requested.
+
+        :return: A generator of Moves.
+        """
+        for region in self.pools():
+            if region.size > 1:
+                yield Move(region, partial(self._pop_region, region))
+
+    def available_moves(self):
+        """
+        Get a list of available moves and resulting board configurations. Exactly one move is
+        generated for each region that can be popped.
+
+        :return: A list of tuples, each of which is of the shape (Coordinate, RegionGraph). The
+                 first element represents the coordinate from which a region was popped, and the
+                 second element represents the RegionGraph instance resulting from that action.
+        """
+        return [(move.coord, move.result()) for move in self.iter_moves()]
+
+    def pop_from(self, coord):
+        """
+        Determine the board configuration resulting from an attempted flood pool pop at the
+        specified coordinate.
+
+        :param coord: Coordinate on this board.
+        :return: A new RegionGraph resulting from popping the region at the given location.
+        :raises InvalidPopException: If a pop is not allowed from the given coordinate.
+        """
+        bitboard = self.bitboard
+        seed = 1 << (coord.j * bitboard.stride + bitboard.height - 1 - coord.i)
+        for region in self.pools():
+            if region.mask & seed:
+                if region.size == 1:
+                    break
+                return self._pop_region(region)
+
+        raise InvalidPopException('Unable to pop from a flood group with only one element')
+
+    def _pop_region(self, region):
+        """
+        Remove a region from the board. The geometry of the new board is computed immediately,
+        but its regions are only derived once they are first requested.
+
+        :param region: The MaskPool to pop.
+        :return: A new RegionGraph with the region removed.
+        """
+        new_graph = RegionGraph(self.bitboard._pop_mask(region.color_idx, region.mask), None)
+        new_graph._origin = (self, region)
+
+        return new_graph
+
+    def _derive(self, parent, popped):
+        """
+        Build the regions of this graph from those of the graph it was popped from, carrying over
+        every region and edge that the contraction left untouched.
+
+        :param parent: The RegionGraph this graph was created from.
+        :param popped: The MaskPool popped from the parent to create this graph.
+        """
+        bitboard = self.bitboard
+        stride = bitboard.stride
+
+        stable = []
+        stable_masks = [0] * len(bitboard.masks)
+        for other in parent.pools():
+            if other is popped:
+                continue
+
+            old_mask = parent.bitboard.masks[other.color_idx]
+            new_mask = bitboard.masks[other.color_idx]
+
+            # The region is unchanged if none of its cells differ after the contraction, and no
+            # brick of the same color has been moved into contact with it
+            if other.mask & (old_mask ^ new_mask) or self._border(other.mask, stride) & new_mask:
+                continue
+
+            stable.append(other)
+            stable_masks[other.color_idx] |= other.mask
+
+        created = []
+        for color_idx, mask in enumerate(bitboard.masks):
+            remaining = mask & ~stable_masks[color_idx]
+            while remaining:
+                pool = bitboard.flood_mask(remaining & -remaining, remaining)
+                remaining &= ~pool
+                i, j = bitboard._representative(pool)
+                created.append(
+                    MaskPool(Coordinate(i, j), bitboard.colors[color_idx], color_idx, pool)
+                )
+
+        self._regions = sorted(stable + created, key=lambda pool: (pool.coord.i, pool.coord.j))
+
+        if parent._edges is not None:
+            # Edges between two carried over regions are unaffected by the pop, since neither
+            # region's cells have moved
+            stable_set = set(stable)
+            self._edges = self._link(created, {
+                other: parent._edges[other] & stable_set
+                for other in stable
+            })
+
+    def _link(self, created, edges):
+        """
+        Add the edges of newly created regions to a set of edges.
+
+        :param created: The regions on this graph whose edges are not yet recorded.
+        :param edges: A dict mapping each region whose edges are already recorded to the set of
+                      regions it touches; modified in place.
+        :return: The dict of edges, with an entry for every region.
+        """
+        for region in created:
+            border = self._border(region.mask, self.bitboard.stride)
+            edges.setdefault(region, set([]))
+
+            for other in self._regions:
+                if other is not region and other.mask & border:
+                    edges[region].add(other)
+                    edges.setdefault(other, set([])).add(region)
+
+        return edges
+
+    @staticmethod
+    def _border(mask, stride):
+        """
+        Find the cells that neighbor a region without belonging to it.
+
+        :param mask: Mask of the cells in the region.
+        :param stride: Number of bits occupied by each column of the mask.
+        :return: A mask of every cell immediately above, below, or beside the region.
+        """
+        return (mask << 1 | mask >> 1 | mask << stride | mask >> stride) & ~mask
+
+    def __getstate__(self):
+        """
+        Build the regions of this graph before it is pickled, e.g. to hand it to another worker
+        process, so that the graph it was popped from is not pickled along with it.
+
+        :return: The attributes of this graph.
+        """
+        self.pools()
+
+        return self.__dict__
+
+    def __repr__(self):
+        """
+        Generate a string representation of the board, identical to that of the equivalent Board.
+
+        :return: A string representation of the board.
+        """
+        return repr(self.bitboard)
+
+    def __eq__(self, other):
+        """
+        RegionGraphs are equal if their canonical keys are identical.
+
+        :param other: The other RegionGraph against which to compare.
+        :return: True if the boards are equal; False otherwise.
+        """
+        return isinstance(other, RegionGraph) and self.key() == other.key()
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self.key())
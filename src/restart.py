@@ -0,0 +1,113 @@
+import random
+import time
+
+from budget import Budget
+from budget import BudgetExhaustedException
+from budget import DEADLINE_CHECK_INTERVAL
+from ordering import RandomOrdering
+from prune import Pruner
+from transposition import TranspositionTable
+
+# Default number of nodes in a single unit of a Luby restart schedule
+DEFAULT_RESTART_UNIT = 256
+
+
+def luby(index):
+    """
+    Get a single term of the Luby sequence: 1, 1, 2, 1, 1, 2, 4, 1, 1, 2, 1, 1, 2, 4, 8, ...
+
+    :param index: One-based index of the term.
+    :return: The term of the sequence at the index.
+    """
+    while True:
+        # Find the smallest k such that the index falls within the first 2^k - 1 terms
+        k = 1
+        while (1 << k) - 1 < index:
+            k += 1
+
+        if index == (1 << k) - 1:
+            return 1 << (k - 1)
+        # The terms after the first 2^(k - 1) - 1 repeat the sequence from its start
+        index -= (1 << (k - 1)) - 1
+
+
+def luby_schedule(unit=DEFAULT_RESTART_UNIT):
+    """
+    Generate node limits following the Luby sequence, which is within a logarithmic factor of the
+    optimal restart schedule for any distribution of search times.
+
+    :param unit: Number of nodes in a single unit of the sequence.
+    :return: An infinite generator of node limits.
+    """
+    index = 1
+    while True:
+        yield unit * luby(index)
+        index += 1
+
+
+def geometric_schedule(initial=DEFAULT_RESTART_UNIT, factor=2):
+    """
+    Generate node limits that grow geometrically.
+
+    :param initial: Node limit of the first run.
+    :param factor: Ratio between the node limits of consecutive runs.
+    :return: An infinite generator of node limits.
+    """
+    limit = initial
+    while True:
+        yield int(limit)
+        limit *= factor
+
+
+def restart_solve(board, schedule=None, seed=None, deadline=None, table=None, pruner=None):
+    """
+    Solve the board with a series of DFS runs, each trying moves in a new random order and
+    restarted once it has expanded as many nodes as the schedule allows. A fixed move order can
+    spend a very long time in a single unlucky subtree; restarting with a fresh order bounds how
+    long any one unlucky choice can stall the search.
+
+    Dead states recorded by each run are kept for all of the runs that follow, so no work proving
+    a subtree has no solution is ever repeated. Since the node limits of the schedule grow without
+    bound, the search remains complete.
+
+    :param board: The board to solve.
+    :param schedule: Iterable of node limits, one for each run; defaults to luby_schedule().
+    :param seed: Seed for the random number generator that orders the moves of every run, for
+                 reproducible searches; or None to seed it from the system.
+    :param deadline: Wall clock time, as returned by time.time(), after which the search must
+                     stop; or None for no time limit.
+    :param table: TranspositionTable of board states known to have no solution, shared by every
+                  run. A new table is created if none is specified.
+    :param pruner: Pruner used to reject boards that can never be solved before expanding them. A
+                   new Pruner with the default rules is created if none is specified.
+    :return: A Solution containing the steps that solve the board, or an EmptySolution if the
+             board has no solution.
+    :raises BudgetExhaustedException: If the deadline passes, or every run of a finite schedule
+                                      is restarted, before the search finishes.
+    """
+    # Imported here so that restarts can be used without loading OpenCV via the solve module
+    from solve import serial_solve
+
+    if schedule is None:
+        schedule = luby_schedule()
+    if table is None:
+        table = TranspositionTable()
+    if pruner is None:
+        pruner = Pruner()
+
+    rng = random.Random(seed)
+    for node_budget in schedule:
+        ordering = RandomOrdering(rng.random())
+        try:
+            return serial_solve(
+                board,
+                table=table,
+                pruner=pruner,
+                budget=Budget(deadline, node_budget, DEADLINE_CHECK_INTERVAL),
+                ordering=ordering,
+            )
+        except BudgetExhaustedException:
+            if deadline is not None and time.time() >= deadline:
+                raise
+
+    raise BudgetExhaustedException('Restart schedule exhausted')
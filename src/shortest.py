@@ -0,0 +1,265 @@
+import multiprocessing
+
+from prune import Pruner
+from solution import EmptySolution
+from solution import Solution
+from transposition import DEFAULT_TRANSPOSITION_TABLE_SIZE
+from transposition import SharedTranspositionTable
+from transposition import TranspositionTable
+
+# Returned in place of a solution length by searches that were never cut off by their limit
+UNBOUNDED = float('inf')
+
+# Minimum number of frontier boards to search per worker process in each iteration of a parallel
+# shortest solve, so that the load stays balanced when some subtrees are much larger than others
+FRONTIER_TASKS_PER_PROCESS = 4
+
+# Shared transposition table of each worker process of a parallel shortest solve
+_worker_table = None
+# Known move bounds of each worker process of a parallel shortest solve, kept across iterations
+_worker_bounds = None
+
+
+def lower_bound(board):
+    """
+    Admissible lower bound on the number of moves needed to solve a board. Every pop removes
+    bricks of exactly one color, so at least one pop is needed for each color left on the board.
+
+    :param board: The board to estimate.
+    :return: A number of moves that is never more than the length of the shortest solution.
+    """
+    return len(board.color_counts())
+
+
+def bounded_search(board, steps, limit, table, bounds, pruner, budget=None, ordering=None):
+    """
+    Search for a solution of at most limit moves with a depth-first search that cuts off every
+    path whose length plus lower bound exceeds the limit.
+
+    :param board: The board to solve.
+    :param steps: The steps taken thus far to reach the input board configuration.
+    :param limit: Maximum total number of moves of the solution, including the steps taken.
+    :param table: TranspositionTable of board states known to have no solution at all.
+    :param bounds: TranspositionTable mapping the Zobrist hash of each board to the largest number
+                   of moves it is known to be unsolvable within; updated in place.
+    :param pruner: Pruner used to reject boards that can never be solved before expanding them.
+    :param budget: Budget that is charged for every node expanded; or None for an unbounded
+                   search.
+    :param ordering: MoveOrdering used to decide which moves to try first; or None to try moves in
+                     row-major order.
+    :return: A tuple of the shape (solution, next_limit). The solution is a Solution of at most
+             limit moves, or None if there is none. next_limit is the smallest solution length
+             that could still exist beyond the limit, or UNBOUNDED if no path was cut off by the
+             limit, i.e. the board has no solution at all.
+    """
+    if board.is_solved():
+        return Solution(steps), UNBOUNDED
+
+    if table.lookup(board) or pruner.prune(board):
+        return None, UNBOUNDED
+
+    remaining = limit - len(steps)
+    estimate = max(lower_bound(board), bounds.get(board.zobrist(), -1) + 1)
+    if estimate > remaining:
+        return None, len(steps) + estimate
+
+    if budget is not None:
+        budget.tick()
+
+    moves = board.iter_moves()
+    if ordering is not None:
+        moves = ordering.order(board, moves)
+
+    next_limit = UNBOUNDED
+    for move in moves:
+        solution, child_limit = bounded_search(
+            move.result(),
+            steps + (move.coord,),
+            limit,
+            table,
+            bounds,
+            pruner,
+            budget,
+            ordering,
+        )
+        if solution is not None:
+            return solution, child_limit
+        next_limit = min(next_limit, child_limit)
+
+    if next_limit == UNBOUNDED:
+        table.store(board)
+    else:
+        bounds.put(board.zobrist(), remaining)
+
+    return None, next_limit
+
+
+def shortest_solve(board, step=1, table=None, pruner=None, budget=None, ordering=None,
+                   bounds_size=DEFAULT_TRANSPOSITION_TABLE_SIZE):
+    """
+    Find a solution with the fewest moves using iterative deepening A* (IDA*). Each iteration runs
+    a depth-first search bounded by a move limit, which starts at the lower bound of the board and
+    is raised to the shortest length that could still exist whenever an iteration fails.
+
+    Raising the limit by more than the minimum trades optimality for fewer iterations: with a step
+    of k, the solution returned is at most k - 1 moves longer than the shortest solution.
+
+    :param board: The board to solve.
+    :param step: Number of moves by which the limit is raised past the shortest length that could
+                 still exist after each failed iteration; 1 for an optimal solution.
+    :param table: TranspositionTable of board states known to have no solution. A new table is
+                  created if none is specified.
+    :param pruner: Pruner used to reject boards that can never be solved before expanding them. A
+                   new Pruner with the default rules is created if none is specified.
+    :param budget: Budget that is charged for every node expanded, across all iterations; or None
+                   for an unbounded search.
+    :param ordering: MoveOrdering used to decide which moves to try first; or None to try moves in
+                     row-major order.
+    :param bounds_size: The maximum number of boards whose move bounds are kept across iterations.
+    :return: A Solution with the fewest moves, or an EmptySolution if the board has no solution.
+    """
+    if table is None:
+        table = TranspositionTable()
+    if pruner is None:
+        pruner = Pruner()
+
+    bounds = TranspositionTable(bounds_size)
+    limit = lower_bound(board) + step - 1
+    while True:
+        solution, next_limit = bounded_search(
+            board,
+            tuple([]),
+            limit,
+            table,
+            bounds,
+            pruner,
+            budget,
+            ordering,
+        )
+        if solution is not None:
+            return solution
+        if next_limit == UNBOUNDED:
+            return EmptySolution()
+
+        limit = next_limit + step - 1
+
+
+def parallel_shortest_solve(board, step=1, num_processes=None, ordering=None,
+                            bounds_size=DEFAULT_TRANSPOSITION_TABLE_SIZE):
+    """
+    Find a solution with the fewest moves using IDA* across a pool of worker processes. The board
+    is expanded into a frontier of boards a few moves deep, and each iteration searches every
+    frontier board under the same move limit in parallel. Dead states found by any worker are
+    shared through a SharedTranspositionTable.
+
+    :param board: The board to solve.
+    :param step: Number of moves by which the limit is raised past the shortest length that could
+                 still exist after each failed iteration; 1 for an optimal solution.
+    :param num_processes: Number of worker processes to use; defaults to the number of CPUs.
+    :param ordering: MoveOrdering used by every worker to decide which moves to try first; or None
+                     to try moves in row-major order.
+    :param bounds_size: The maximum number of boards whose move bounds each worker process keeps
+                        across iterations.
+    :return: A Solution with the fewest moves, or an EmptySolution if the board has no solution.
+    """
+    if board.is_solved():
+        return Solution(tuple([]))
+
+    num_processes = num_processes or multiprocessing.cpu_count()
+    frontier = expand_frontier(board, num_processes * FRONTIER_TASKS_PER_PROCESS)
+
+    # Every frontier board is the same number of moves deep, and none of the boards above them was
+    # solved, so a solved frontier board is already a shortest solution
+    for steps, frontier_board in frontier:
+        if frontier_board.is_solved():
+            return Solution(steps)
+
+    table = SharedTranspositionTable()
+    pool = multiprocessing.Pool(num_processes, _init_worker, (table, bounds_size))
+
+    try:
+        limit = lower_bound(board) + step - 1
+        while frontier:
+            next_limit = UNBOUNDED
+            live = []
+            results = pool.imap_unordered(
+                _bounded_task,
+                [(steps, frontier_board, limit, ordering) for steps, frontier_board in frontier],
+            )
+            for steps, frontier_board, solution, task_limit in results:
+                if solution is not None:
+                    return solution
+                if task_limit != UNBOUNDED:
+                    live.append((steps, frontier_board))
+                next_limit = min(next_limit, task_limit)
+
+            # Frontier boards proven to have no solution at all need not be searched again
+            frontier = live
+            limit = next_limit + step - 1
+
+        return EmptySolution()
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def expand_frontier(board, size):
+    """
+    Expand a board breadth-first into the boards a few moves deep, until there are at least a
+    given number of them, one of them is solved, or the board cannot be expanded any further.
+
+    :param board: The board to expand.
+    :param size: The minimum number of boards to generate.
+    :return: A list of tuples of the shape (steps, board), where steps is the tuple of Coordinates
+             leading from the input board to each board. Every board is the same number of moves
+             deep.
+    """
+    frontier = [(tuple([]), board)]
+    while len(frontier) < size:
+        expanded = [
+            (steps + (move.coord,), move.result())
+            for steps, frontier_board in frontier
+            for move in frontier_board.iter_moves()
+        ]
+
+        if len(expanded) <= len(frontier):
+            break
+        frontier = expanded
+        if any(frontier_board.is_solved() for _, frontier_board in frontier):
+            break
+
+    return frontier
+
+
+def _init_worker(table, bounds_size):
+    """
+    Initialize a worker process of a parallel shortest solve.
+
+    :param table: SharedTranspositionTable shared by every worker process.
+    :param bounds_size: The maximum number of boards whose move bounds the worker keeps.
+    """
+    global _worker_table, _worker_bounds
+    _worker_table = table
+    _worker_bounds = TranspositionTable(bounds_size)
+
+
+def _bounded_task(task):
+    """
+    Search a single frontier board in a worker process of a parallel shortest solve.
+
+    :param task: A tuple of the shape (steps, board, limit, ordering).
+    :return: A tuple of the shape (steps, board, solution, next_limit), as returned by
+             bounded_search for the frontier board.
+    """
+    steps, board, limit, ordering = task
+    solution, next_limit = bounded_search(
+        board,
+        steps,
+        limit,
+        _worker_table,
+        _worker_bounds,
+        Pruner(),
+        ordering=ordering,
+    )
+
+    return steps, board, solution, next_limit
@@ -37,6 +37,25 @@ class Solution:
         return repr(self)
 
 
+class ScoredSolution(Solution):
+    """
+    Wrapper class representing a defined solution along with the score it achieves.
+    """
+
+    def __init__(self, steps, score):
+        """
+        Create a scored solution.
+
+        :param steps: An iterable of Coordinates representing a solution.
+        :param score: The total score of the solution.
+        """
+        Solution.__init__(self, steps)
+        self.score = score
+
+    def __repr__(self):
+        return 'ScoredSolution({steps}, {score})'.format(steps=repr(self.steps), score=self.score)
+
+
 class EmptySolution(Solution):
     """
     Wrapper class representing a null solution.
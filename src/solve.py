@@ -1,18 +1,24 @@
-import Queue
-import multiprocessing
-import struct
+import os
 import subprocess
 import sys
 import time
 
 import cv2
+import numpy
 
 from board import Board
 from color import Color
-from color import EmptyColor
-from coordinate import Coordinate
+from geometry import GeometryProfiles
+from geometry import GridGeometry
+from palette import ColorClassifier
+from palette import UNMATCHED
+from parallel import SolveHandle
+from prune import Pruner
+from region import RegionGraph
+from shortest import parallel_shortest_solve
 from solution import EmptySolution
 from solution import Solution
+from transposition import TranspositionTable
 
 # The pixel offset distance between any two color blocks
 IMAGE_BLOCK_OFFSET = 142
@@ -20,49 +26,147 @@ IMAGE_BLOCK_OFFSET = 142
 IMAGE_BLOCK_START_I = 625
 # The horizontal pixel offset from the left of the screen of the first color block
 IMAGE_BLOCK_START_J = 70
-
-
-def solution_search(queue, available_moves, steps=tuple([])):
+# The resolution, as (height, width), of the screenshots the offsets above were measured on
+IMAGE_RESOLUTION = (2560, 1440)
+# Geometry of the board in screenshots of IMAGE_RESOLUTION, which never need to be calibrated
+DEFAULT_GEOMETRY = GridGeometry(IMAGE_BLOCK_START_I, IMAGE_BLOCK_START_J, IMAGE_BLOCK_OFFSET)
+# Path of the file in which the board geometry of every other resolution is kept across runs
+PROFILES_PATH = os.path.join(os.path.expanduser('~'), '.brick-pop-solver-profiles.json')
+# File name under which the screenshot is read from standard input instead of from a file
+STDIN_FILE_NAME = '-'
+# The signature at the start of every PNG file
+PNG_SIGNATURE = '\x89PNG\r\n\x1a\n'
+# The pixel format code of raw RGBA_8888 screencap output
+RAW_FORMAT_RGBA_8888 = 1
+# Possible sizes of the header of raw screencap output: width, height, and format, followed by the
+# color space on newer versions of Android
+RAW_HEADER_SIZES = (12, 16)
+# Number of bytes read at a time when skipping over unneeded parts of a screenshot stream
+STREAM_CHUNK_SIZE = 1 << 16
+# Number of most significant bits of each channel kept in the color of a pixel that matches no
+# color of the palette. Since color indices are never released, this bounds the number of such
+# colors a process can ever create, however many screenshots it parses, to 2^(3 * bits).
+UNMATCHED_COLOR_BITS = 4
+
+# Board geometry of each resolution seen by this process, used when no other profiles are given
+_profiles = GeometryProfiles(profiles={IMAGE_RESOLUTION: DEFAULT_GEOMETRY})
+# Classifier of the pixels of every screenshot into the colors of the game
+_classifier = ColorClassifier()
+
+
+def solution_search(queue, available_moves, steps=tuple([]), table=None, pruner=None):
     """
     Find a solution to the board given a list of available moves. This is a parallel-friendly
     implementation that executes a DFS search with defined starting points.
 
     :param queue: A queue into which a solution will be inserted when found.
-    :param available_moves: A list of the shape [(Coordinate, Board), ...] representing a potential
-                            solution step and the resulting board, respectively.
+    :param available_moves: An iterable of the shape [(Coordinate, Board), ...] representing a
+                            potential solution step and the resulting board, respectively. Moves
+                            as generated by iter_moves are also accepted, in which case each
+                            resulting board is only built once the search reaches it.
     :param steps: The steps taken thus far to reach the board configurations specified by
                   available_moves.
-    :return: Return value is unused.
+    :param table: TranspositionTable of board states known to have no solution. A new table is
+                  created if none is specified.
+    :param pruner: Pruner used to reject boards that can never be solved before expanding them. A
+                   new Pruner with the default rules is created if none is specified.
+    :return: True if a solution was found and inserted into the queue; False otherwise.
     """
+    if table is None:
+        table = TranspositionTable()
+    if pruner is None:
+        pruner = Pruner()
+
     for step, board in available_moves:
         solution_steps = steps + (step,)
         if board.is_solved():
-            return queue.put(Solution(solution_steps))
+            queue.put(Solution(solution_steps))
+            return True
+
+        if table.lookup(board) or pruner.prune(board):
+            continue
+
+        if solution_search(queue, board.iter_moves(), solution_steps, table, pruner):
+            return True
 
-        solution_search(queue, board.available_moves(), solution_steps)
+        table.store(board)
 
     if not steps:
         # If logic reaches this point in execution and there are no valid steps built up yet, the
         # input board configuration is not solvable. An EmptySolution is inserted into the queue,
         # and logic higher up the stack handles this appropriately.
-        return queue.put(EmptySolution())
+        queue.put(EmptySolution())
 
+    return False
 
-def serial_solve(board, steps=tuple([])):
+
+def serial_solve(board, steps=tuple([]), table=None, pruner=None, budget=None, ordering=None,
+                 reduction=None, sleep=tuple([]), endgame=None):
     """
     Solve the board using a serial DFS search. This is a single-threaded implementation that
     explores all possible solutions from a starting board configuration.
 
     :param board: The board to solve.
     :param steps: The steps taken thus far to reach the input board configuration.
+    :param table: TranspositionTable of board states known to have no solution. A new table is
+                  created if none is specified; pass one explicitly to inspect its hit and miss
+                  counts after the search.
+    :param pruner: Pruner used to reject boards that can never be solved before expanding them. A
+                   new Pruner with the default rules is created if none is specified; pass one
+                   explicitly to inspect how many boards each rule pruned.
+    :param budget: Budget that is charged for every node expanded, and stops the search by raising
+                   BudgetExhaustedException once it runs out; or None for an unbounded search.
+    :param ordering: MoveOrdering used to decide which moves to try first; or None to try moves in
+                     row-major order.
+    :param reduction: SleepSetReduction used to avoid exploring independent moves in more than one
+                      order; or None to explore every order.
+    :param sleep: Pools on the input board whose moves the reduction has determined need not be
+                  explored. Only used by the recursion.
+    :param endgame: EndgameSolver that boards with few colors and bricks are handed to; or None to
+                    search every board the same way.
     :return: A tuple of Coordinates representing steps that can be used to solve the board.
     """
+    if table is None:
+        table = TranspositionTable()
+    if pruner is None:
+        pruner = Pruner()
+
     if board.is_solved():
         return Solution(steps)
 
+    if table.lookup(board) or pruner.prune(board):
+        return EmptySolution()
+
+    if budget is not None:
+        budget.tick()
+
+    if endgame is not None and endgame.applies(board):
+        endgame_steps = endgame.solve(board)
+        return Solution(steps + endgame_steps) if endgame_steps is not None else EmptySolution()
+
+    moves = board.iter_moves()
+    if ordering is not None:
+        moves = ordering.order(board, moves)
+
+    if reduction is not None:
+        expansions = reduction.expand(board, moves, sleep)
+    else:
+        expansions = ((move, tuple([])) for move in moves)
+
+    # Each resulting board is only built once the search reaches its move
     possible_solutions = (
-        serial_solve(new_board, steps + (step,))
-        for (step, new_board) in board.available_moves()
+        serial_solve(
+            move.result(),
+            steps + (move.coord,),
+            table,
+            pruner,
+            budget,
+            ordering,
+            reduction,
+            child_sleep,
+            endgame,
+        )
+        for move, child_sleep in expansions
     )
     valid_solutions = (
         steps
@@ -70,124 +174,347 @@ def serial_solve(board, steps=tuple([])):
         if not steps.is_empty()
     )
 
-    return next(valid_solutions, EmptySolution())
+    solution = next(valid_solutions, EmptySolution())
+    if solution.is_empty():
+        table.store(board)
+
+    return solution
 
 
-def parallel_solve(board):
+def parallel_solve(board, num_processes=None, ordering=None):
     """
-    Solve the board in parallel by generating multiple starting points and attempting to find a
-    solution for each of them using multiple, independent processes with access to a shared-memory
-    data structure.
+    Solve the board in parallel with a fixed pool of worker processes sharing a single task queue.
+    The search starts as one task; whenever a worker is idle, busy workers split off the largest
+    unexplored subtrees on their stacks and queue them, so that the load stays balanced no matter
+    how the work is distributed across the board's starting moves.
 
     :param board: An instance of the game board.
+    :param num_processes: Number of worker processes to use; defaults to the number of CPUs.
+    :param ordering: MoveOrdering used by every worker to decide which moves to try first; or None
+                     to try moves in row-major order.
     :return: A valid solution as generated by one of the parallel processes.
     """
-    # Start a shared-memory queue that all processes can mutate; any one process can insert a valid
-    # solution in the queue
-    queue = multiprocessing.Queue()
-
-    # Divide the input into equal parts matching the number of parallel processes to use
-    processes = [
-        multiprocessing.Process(target=solution_search, args=(queue, [single_start_point],))
-        for single_start_point in board.available_moves()
-    ]
-
-    # Start each individual process
-    for p in processes:
-        p.start()
-
-    # The logic that follows involves trying to (asynchronously) retrieve an item from the
-    # shared-memory queue. The queue can contain either a valid solution or an empty solution.
-    solution = EmptySolution()
-    num_failed_solves = 0
-    while True:
-        if num_failed_solves >= len(processes):
-            # If we have failed the same number as times as there are processes, that means all
-            # starting points were not able to return a valid solution. In this case, the only
-            # recourse is to exit, and allow logic higher up the stack to handle an EmptySolution.
-            break
-
-        try:
-            # Attempt to pull from the queue, without blocking. These operations are thread-safe.
-            solution = queue.get(block=False)
-            if solution.is_empty():
-                # One processes has failed to create a solution; keep track of this in a (pseudo-
-                # atomic) counter variable.
-                num_failed_solves += 1
-            else:
-                # A valid solution has been found!
-                break
-        except Queue.Empty:
-            # Since the Queue#get operation is non-blocking, most calls will throw an exception
-            # indicating that there are no values to retrieve from the queue. In this case, simply
-            # try again indefinitely.
+    if board.is_solved():
+        return Solution(tuple([]))
+
+    handle = SolveHandle(board, num_processes, ordering=ordering)
+    try:
+        return handle.result()
+    except BaseException:
+        # Don't leave workers searching in the background if the caller is interrupted
+        handle.cancel()
+        raise
+
+
+def load_board(board_image_file_name, profiles=None):
+    """
+    Parse the input board screenshot into a Board object.
+
+    :param board_image_file_name: Path to the screenshot of the board, either a PNG or raw
+                                  screencap output; or STDIN_FILE_NAME to read it from standard
+                                  input, e.g. piped directly from adb.
+    :param profiles: GeometryProfiles used to locate the board in the screenshot; defaults to
+                     profiles kept in memory for the lifetime of the process.
+    :return: A Board instance representing the input board.
+    """
+    return load_screenshot(board_image_file_name, profiles)[0]
+
+
+def load_screenshot(board_image_file_name, profiles=None):
+    """
+    Parse the input board screenshot into a Board object, along with the geometry of the board
+    within the screenshot.
+
+    :param board_image_file_name: Path to the screenshot of the board, either a PNG or raw
+                                  screencap output; or STDIN_FILE_NAME to read it from standard
+                                  input, e.g. piped directly from adb.
+    :param profiles: GeometryProfiles used to locate the board in the screenshot; defaults to
+                     profiles kept in memory for the lifetime of the process.
+    :return: A tuple of the shape (Board, GridGeometry).
+    """
+    if board_image_file_name == STDIN_FILE_NAME:
+        rows, geometry = read_board_rows(sys.stdin, profiles)
+    else:
+        with open(board_image_file_name, 'rb') as board_image_file:
+            rows, geometry = read_board_rows(board_image_file, profiles)
+
+    return parse_board_rows(rows, geometry), geometry
+
+
+def read_board_rows(stream, profiles=None):
+    """
+    Read only the rows of pixels of a screenshot that are sampled to parse the board.
+
+    The board is located by the profile of the screenshot's resolution. Raw screencap output of a
+    known resolution is never held in memory as a whole: only the bytes of the sampled rows are
+    read, and everything in between is skipped, by seeking in a file or by reading and discarding
+    fixed-size chunks of a pipe. The rest of a pipe is drained after the last sampled row, so that
+    the process writing to it is not killed by a broken pipe. PNG data cannot be decoded
+    partially, and is decoded in full before its sampled rows are taken, as is a screenshot of a
+    resolution that has not been calibrated yet.
+
+    :param stream: A file object containing either a PNG or raw RGBA_8888 screencap output.
+    :param profiles: GeometryProfiles used to locate the board in the screenshot; defaults to
+                     profiles kept in memory for the lifetime of the process.
+    :return: A tuple of the shape (rows, geometry). The rows are the sampled rows, from top to
+             bottom, as a BGR image array with one row of pixels for each row of blocks; the
+             geometry is the GridGeometry of the board in the screenshot.
+    :raises InvalidScreenshotException: If the screenshot is in neither format, or is too small to
+                                        contain the board.
+    :raises CalibrationException: If the resolution of the screenshot has not been seen before,
+                                  and the board cannot be found in it.
+    """
+    if profiles is None:
+        profiles = _profiles
+
+    header = _read_exactly(stream, RAW_HEADER_SIZES[-1])
+    if header.startswith(PNG_SIGNATURE):
+        img = decode_screenshot(header + stream.read())
+        geometry = profiles.geometry(img)
+        return _sample_rows(img, geometry), geometry
+
+    width, height, pixel_format = numpy.frombuffer(header, dtype='<u4', count=3).tolist()
+    if pixel_format != RAW_FORMAT_RGBA_8888:
+        raise InvalidScreenshotException('Screenshot is neither a PNG nor raw RGBA_8888 output')
+
+    # Without the color space, the bytes following the header are the first pixel, whose alpha
+    # byte is always opaque; the most significant byte of a color space never is
+    header_size = RAW_HEADER_SIZES[0] if header[-1] == '\xff' else RAW_HEADER_SIZES[-1]
+    row_size = width * 4
+
+    geometry = profiles.lookup(height, width)
+    if geometry is None:
+        data = header + _read_exactly(stream, header_size + height * row_size - len(header))
+        img = decode_screenshot(data)
+        geometry = profiles.geometry(img)
+        return _sample_rows(img, geometry), geometry
+
+    if geometry.rows()[-1] >= height or geometry.columns()[-1] >= width:
+        raise InvalidScreenshotException('Screenshot is too small to contain the board')
+
+    seekable = _is_seekable(stream)
+    position = len(header)
+    rows = []
+    for row in geometry.rows().tolist():
+        offset = header_size + row * row_size
+        _skip(stream, offset - position, seekable)
+        rows.append(_read_exactly(stream, row_size))
+        position = offset + row_size
+
+    if not seekable:
+        while stream.read(STREAM_CHUNK_SIZE):
             pass
 
-    # Kill the remaining processes; we've already found a solution and they don't need to be around
-    # anymore
-    for p in processes:
-        p.terminate()
+    pixels = numpy.frombuffer(''.join(rows), dtype=numpy.uint8)
+    return pixels.reshape(geometry.size, width, 4)[:, :, 2::-1], geometry
 
-    # Join the processes
-    p.join()
 
-    return solution
+def decode_screenshot(data):
+    """
+    Decode a screenshot held in memory, without writing it to disk. PNG data is decoded with
+    OpenCV; raw screencap output, as produced by screencap without -p, is read directly as an
+    array of RGBA pixels, which skips compressing and decompressing the image altogether.
+
+    :param data: A byte string containing either a PNG or raw RGBA_8888 screencap output.
+    :return: The screenshot as a BGR image array, as returned by cv2.imread.
+    :raises InvalidScreenshotException: If the data is in neither format.
+    """
+    if data.startswith(PNG_SIGNATURE):
+        img = cv2.imdecode(numpy.frombuffer(data, dtype=numpy.uint8), cv2.IMREAD_COLOR)
+        if img is None:
+            raise InvalidScreenshotException('Unable to decode the PNG screenshot')
+        return img
+
+    if len(data) < RAW_HEADER_SIZES[0]:
+        raise InvalidScreenshotException('Screenshot is too short to contain a raw header')
+
+    width, height, pixel_format = numpy.frombuffer(data, dtype='<u4', count=3).tolist()
+    header_size = len(data) - width * height * 4
+    if pixel_format != RAW_FORMAT_RGBA_8888 or header_size not in RAW_HEADER_SIZES:
+        raise InvalidScreenshotException('Screenshot is neither a PNG nor raw RGBA_8888 output')
 
+    pixels = numpy.frombuffer(data, dtype=numpy.uint8, offset=header_size)
+    # Reverse the RGB channels into BGR order, dropping alpha, without copying the pixels
+    return pixels.reshape(height, width, 4)[:, :, 2::-1]
 
-def load_board(board_image_file_name):
+
+def parse_board(img, geometry=None, classifier=None):
     """
-    Parse the input board screenshot into a Board object.
+    Parse a decoded board screenshot into a Board object.
+
+    :param img: The screenshot as a BGR image array, as returned by cv2.imread.
+    :param geometry: GridGeometry of the board in the screenshot; or None to look it up by the
+                     resolution of the screenshot, calibrating it the first time the resolution
+                     is seen.
+    :param classifier: ColorClassifier used to classify the pixels; defaults to one with the
+                       game's palette.
+    :return: A Board instance representing the input board.
+    """
+    if geometry is None:
+        geometry = _profiles.geometry(img)
+
+    return parse_board_rows(_sample_rows(img, geometry), geometry, classifier)
 
-    :param board_image_file_name: Path to the screenshot of the board.
+
+def parse_board_rows(rows, geometry=DEFAULT_GEOMETRY, classifier=None):
+    """
+    Parse the sampled rows of a board screenshot into a Board object. The pixel at the center of
+    every block is gathered in a single indexing operation and classified into the game's palette
+    through the classifier's lookup table. A pixel that matches no color of the palette keeps its
+    own color, quantized to UNMATCHED_COLOR_BITS bits per channel, and each distinct quantized
+    value is mapped to a Color only once.
+
+    :param rows: The rows of pixels of the screenshot given by the geometry, as a BGR image array.
+    :param geometry: GridGeometry of the board in the screenshot.
+    :param classifier: ColorClassifier used to classify the pixels; defaults to one with the
+                       game's palette.
     :return: A Board instance representing the input board.
     """
-    img = cv2.imread(board_image_file_name, cv2.IMREAD_COLOR)
+    if classifier is None:
+        classifier = _classifier
+
+    samples = classifier.sample(rows, geometry.columns())
+    indices = classifier.classify(samples).astype(int)
+
+    palette = list(classifier.colors)
+    unmatched = indices == UNMATCHED
+    if unmatched.any():
+        # Pack each quantized BGR pixel into a single integer whose hexadecimal form is its color
+        # code
+        pixels = samples[unmatched].astype(numpy.uint32) & (0xff << (8 - UNMATCHED_COLOR_BITS))
+        packed = pixels[:, 0] << 16 | pixels[:, 1] << 8 | pixels[:, 2]
+        codes, inverse = numpy.unique(packed, return_inverse=True)
+
+        indices[unmatched] = len(palette) + inverse
+        palette.extend(Color('{code:06x}'.format(code=code)) for code in codes.tolist())
+
+    return Board.from_grid([
+        [palette[idx] for idx in row]
+        for row in indices.reshape(geometry.size, geometry.size).tolist()
+    ])
+
+
+def _sample_rows(img, geometry):
+    """
+    Take the rows of pixels of a decoded screenshot that are sampled to parse the board.
+
+    :param img: The screenshot as a BGR image array.
+    :param geometry: GridGeometry of the board in the screenshot.
+    :return: The sampled rows, from top to bottom, as a BGR image array.
+    :raises InvalidScreenshotException: If the screenshot is too small to contain the board.
+    """
+    rows = geometry.rows()
+    if rows[-1] >= img.shape[0] or geometry.columns()[-1] >= img.shape[1]:
+        raise InvalidScreenshotException('Screenshot is too small to contain the board')
+
+    return img[rows]
+
+
+def _read_exactly(stream, num_bytes):
+    """
+    Read an exact number of bytes from a stream, which may return fewer bytes per read.
 
-    coordinate_map = {}
-    for i in range(10):
-        for j in range(10):
-            pixel_i = IMAGE_BLOCK_START_I + i * IMAGE_BLOCK_OFFSET
-            pixel_j = IMAGE_BLOCK_START_J + j * IMAGE_BLOCK_OFFSET
-            bgr = img[pixel_i][pixel_j]
-            color_code = struct.pack('BBB', *bgr).encode('hex')
-            if color_code == 'e4eff7':
-                coordinate_map[Coordinate(i, j)] = EmptyColor()
-            else:
-                coordinate_map[Coordinate(i, j)] = Color(color_code)
+    :param stream: A file object.
+    :param num_bytes: The number of bytes to read.
+    :return: A byte string of exactly num_bytes bytes.
+    :raises InvalidScreenshotException: If the stream ends first.
+    """
+    chunks = []
+    remaining = num_bytes
+    while remaining > 0:
+        chunk = stream.read(remaining)
+        if not chunk:
+            raise InvalidScreenshotException('Screenshot ended unexpectedly')
+        chunks.append(chunk)
+        remaining -= len(chunk)
+
+    return ''.join(chunks)
+
+
+def _skip(stream, num_bytes, seekable):
+    """
+    Skip over a number of bytes of a stream without keeping them.
+
+    :param stream: A file object.
+    :param num_bytes: The number of bytes to skip.
+    :param seekable: True if the stream supports seeking, e.g. a regular file; False otherwise,
+                     e.g. a pipe.
+    :raises InvalidScreenshotException: If the stream ends first.
+    """
+    if seekable:
+        stream.seek(num_bytes, os.SEEK_CUR)
+        return
+
+    while num_bytes > 0:
+        num_bytes -= len(_read_exactly(stream, min(num_bytes, STREAM_CHUNK_SIZE)))
+
+
+def _is_seekable(stream):
+    """
+    Check if a stream supports seeking.
+
+    :param stream: A file object.
+    :return: True if the stream can seek relative to its current position; False otherwise.
+    """
+    try:
+        stream.seek(0, os.SEEK_CUR)
+    except (AttributeError, IOError):
+        return False
 
-    return Board.from_coordinate_map(coordinate_map)
+    return True
 
 
-def simulate_touch_events(solution):
+def simulate_touch_events(solution, geometry=DEFAULT_GEOMETRY):
     """
     Directly use ADB to simulate touch events that correspond to the given solution steps.
 
     :param solution: A tuple of coordinates describing the full solution.
+    :param geometry: GridGeometry of the board on the screen of the device.
     """
     for idx, step in enumerate(solution):
-        touch_x = IMAGE_BLOCK_START_J + IMAGE_BLOCK_OFFSET * step.j
-        touch_y = IMAGE_BLOCK_START_I + IMAGE_BLOCK_OFFSET * step.i
+        touch_x, touch_y = geometry.locate(step)
 
         print 'Simulating touch events for step {idx}...'.format(idx=idx + 1)
         subprocess.call(['adb', 'shell', 'input', 'tap', str(touch_x), str(touch_y)])
         subprocess.call(['sleep', '1.2'])
 
 
-def solve(board_image_file_name):
+def solve(board_image_file_name, shortest=False, portfolio=False, recalibrate=False):
     """
     Run the full solve procedure on some input board screenshot.
 
-    :param board_image_file_name: Path to the screenshot of the board.
+    :param board_image_file_name: Path to the screenshot of the board, or STDIN_FILE_NAME to read
+                                  it from standard input.
+    :param shortest: True to search for a solution with the fewest moves, which takes fewer touch
+                     events to replay but can take much longer to find.
+    :param portfolio: True to race several search strategies against each other, and report the
+                      one that found the solution.
+    :param recalibrate: True to calibrate the screenshot even if its resolution has a known
+                        profile, and replace the stored profile with the result.
     """
     print 'Reading board image...'
-    board = load_board(board_image_file_name)
+    profiles = GeometryProfiles(
+        PROFILES_PATH,
+        {IMAGE_RESOLUTION: DEFAULT_GEOMETRY},
+        recalibrate=recalibrate,
+    )
+    board, geometry = load_screenshot(board_image_file_name, profiles)
 
     print 'Board:'
     print board
 
     print 'Solving...'
     start_time = time.time()
-    solution = parallel_solve(board)
+    if shortest:
+        solution = parallel_shortest_solve(RegionGraph.from_board(board))
+    elif portfolio:
+        # Imported here since the portfolio strategies are built on serial_solve from this module
+        from portfolio import portfolio_solve
+        result = portfolio_solve(RegionGraph.from_board(board))
+        solution = result.solution
+        print 'Decided by strategy {strategy}'.format(strategy=result.strategy)
+    else:
+        solution = parallel_solve(RegionGraph.from_board(board))
     end_time = time.time()
 
     if not solution.is_empty():
@@ -198,7 +525,7 @@ def solve(board_image_file_name):
         print solution_steps
 
         print 'Using ADB to trigger touch events...'
-        simulate_touch_events(solution_steps)
+        simulate_touch_events(solution_steps, geometry)
 
         print 'Done!'
     else:
@@ -208,14 +535,33 @@ def solve(board_image_file_name):
 
 def main():
     """
-    Main procedure; accept the file name as a command-line parameter and run the solver.
+    Main procedure; accept the file name as a command-line parameter and run the solver. Pass - as
+    the file name to read the screenshot from standard input. Pass --shortest after the file name
+    to search for a solution with the fewest moves, or --portfolio to race several search
+    strategies. Pass --recalibrate to replace the stored geometry profile of the screenshot's
+    resolution.
     """
     if len(sys.argv) < 2:
-        print 'Specify the file name corresponding to the Brick Pop screenshot as the first ' \
-              'positional argument.'
+        print 'Specify the file name corresponding to the Brick Pop screenshot, or - to read it ' \
+              'from standard input, as the first positional argument.'
         return sys.exit(1)
 
-    return solve(sys.argv[1])
+    options = {}
+    if '--shortest' in sys.argv[2:]:
+        options['shortest'] = True
+    elif '--portfolio' in sys.argv[2:]:
+        options['portfolio'] = True
+    if '--recalibrate' in sys.argv[2:]:
+        options['recalibrate'] = True
+
+    return solve(sys.argv[1], **options)
+
+
+class InvalidScreenshotException(Exception):
+    """
+    Raised when a screenshot cannot be decoded.
+    """
+    pass
 
 
 if __name__ == '__main__':
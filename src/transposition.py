@@ -0,0 +1,237 @@
+import ctypes
+import multiprocessing
+from collections import OrderedDict
+
+# Default maximum number of board states retained by a transposition table
+DEFAULT_TRANSPOSITION_TABLE_SIZE = 1 << 18
+# Default number of slots in a shared transposition table; 8 bytes each
+DEFAULT_SHARED_TABLE_SLOTS = 1 << 20
+# Number of consecutive slots a fingerprint may occupy in a shared transposition table
+SHARED_TABLE_BUCKET_SIZE = 4
+# Indices of the hit, miss, and eviction counts in the shared counters of a shared table
+_HITS, _MISSES, _EVICTIONS = range(3)
+
+
+class TranspositionTable:
+    """
+    Bounded record of board states that are known to have no solution. Entries are keyed by the
+    Zobrist hash of each board, which boards derive incrementally from their parent, and the least
+    recently used entry is evicted once the table is full. As with SharedTranspositionTable, two
+    distinct boards sharing a 64-bit hash would be conflated, which is vanishingly unlikely.
+
+    The same bounded table can also record an arbitrary value under any hashable key, through get
+    and put.
+    """
+
+    def __init__(self, max_size=DEFAULT_TRANSPOSITION_TABLE_SIZE):
+        """
+        Create an empty transposition table.
+
+        :param max_size: The maximum number of board states to retain.
+        """
+        self.max_size = max_size
+        self.table = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def lookup(self, board):
+        """
+        Check if a board state has been recorded in the table, refreshing its position in the
+        eviction order if so.
+
+        :param board: The board to look up.
+        :return: True if the board state is known to have no solution; False otherwise.
+        """
+        return self.get(board.zobrist(), False)
+
+    def store(self, board):
+        """
+        Record a board state as having no solution, evicting the least recently used entry if the
+        table is full.
+
+        :param board: The board to record.
+        """
+        self.put(board.zobrist(), True)
+
+    def get(self, key, default=None):
+        """
+        Look up the value recorded under a key, refreshing its position in the eviction order if
+        there is one.
+
+        :param key: The key to look up.
+        :param default: The value to return if nothing is recorded under the key.
+        :return: The value recorded under the key, or default if there is none.
+        """
+        if key not in self.table:
+            self.misses += 1
+            return default
+
+        self.hits += 1
+        value = self.table.pop(key)
+        self.table[key] = value
+        return value
+
+    def put(self, key, value):
+        """
+        Record a value under a key, evicting the least recently used entry if the table is full.
+
+        :param key: The key to record the value under.
+        :param value: The value to record.
+        """
+        self.table.pop(key, None)
+        self.table[key] = value
+
+        if len(self.table) > self.max_size:
+            self.table.popitem(last=False)
+            self.evictions += 1
+
+    def __len__(self):
+        return len(self.table)
+
+    def __repr__(self):
+        return 'TranspositionTable(size={size}/{max_size}, hits={hits}, misses={misses}, ' \
+               'evictions={evictions})'.format(
+                   size=len(self),
+                   max_size=self.max_size,
+                   hits=self.hits,
+                   misses=self.misses,
+                   evictions=self.evictions,
+               )
+
+    def __str__(self):
+        return repr(self)
+
+
+class SharedTranspositionTable:
+    """
+    Fixed-size record of board states known to have no solution, held in shared memory so that
+    every worker process of a parallel solve can both contribute to and benefit from it. It is a
+    drop-in replacement for TranspositionTable.
+
+    Each board is reduced to a 64-bit fingerprint by its Zobrist hash, and fingerprints are
+    stored in an array of slots grouped into buckets of SHARED_TABLE_BUCKET_SIZE. A fingerprint is
+    only ever stored in the bucket selected by its low bits:
+
+    * Collisions: a fingerprint is written to the first empty slot of its bucket. If the bucket
+      is full, the slot selected by the high bits of the fingerprint is overwritten, so that
+      replacement is spread evenly across the bucket without any bookkeeping.
+    * Concurrency: the table takes no locks. Each slot is a single aligned 64-bit word, so readers
+      see either a complete fingerprint or none at all; concurrent writers to the same slot can
+      only cause an entry to be lost, which costs a repeated search but never a wrong answer.
+    * Soundness: two distinct boards sharing a 64-bit fingerprint would cause one to be wrongly
+      treated as unsolvable. For the number of states visited by any realistic search, this is
+      vanishingly unlikely.
+
+    * Statistics: hit, miss, and eviction counts are also kept in shared memory, so they cover
+      every process using the table. They are incremented without locks, so concurrent updates
+      may be lost, and the counts are only approximate.
+
+    Fingerprints are Zobrist hashes, whose keys are mixed by the SplitMix64 finalizer, so they are
+    spread evenly over all 64 bits regardless of how similar two boards are. Zobrist hashes depend
+    on the indices assigned to colors, so all processes sharing a table must be forked from the
+    process that created it after the board has been loaded.
+    """
+
+    def __init__(self, num_slots=DEFAULT_SHARED_TABLE_SLOTS):
+        """
+        Create an empty shared transposition table.
+
+        :param num_slots: Total number of slots; must be a power of two no smaller than
+                          SHARED_TABLE_BUCKET_SIZE.
+        """
+        self.num_slots = num_slots
+        self.slots = multiprocessing.RawArray(ctypes.c_uint64, num_slots)
+        self.counters = multiprocessing.RawArray(ctypes.c_uint64, 3)
+
+    @property
+    def hits(self):
+        """
+        :return: The approximate number of lookups that hit, across every process.
+        """
+        return self.counters[_HITS]
+
+    @property
+    def misses(self):
+        """
+        :return: The approximate number of lookups that missed, across every process.
+        """
+        return self.counters[_MISSES]
+
+    @property
+    def evictions(self):
+        """
+        :return: The approximate number of entries overwritten, across every process.
+        """
+        return self.counters[_EVICTIONS]
+
+    def lookup(self, board):
+        """
+        Check if a board state has been recorded in the table by any process.
+
+        :param board: The board to look up.
+        :return: True if the board state is known to have no solution; False otherwise.
+        """
+        fingerprint = self._fingerprint(board)
+        start = self._bucket(fingerprint)
+        if fingerprint in self.slots[start:start + SHARED_TABLE_BUCKET_SIZE]:
+            self.counters[_HITS] += 1
+            return True
+
+        self.counters[_MISSES] += 1
+        return False
+
+    def store(self, board):
+        """
+        Record a board state as having no solution, replacing an existing entry if the board's
+        bucket is full.
+
+        :param board: The board to record.
+        """
+        fingerprint = self._fingerprint(board)
+        start = self._bucket(fingerprint)
+        bucket = self.slots[start:start + SHARED_TABLE_BUCKET_SIZE]
+
+        if fingerprint in bucket:
+            return
+
+        if 0 in bucket:
+            self.slots[start + bucket.index(0)] = fingerprint
+        else:
+            self.slots[start + (fingerprint >> 32) % SHARED_TABLE_BUCKET_SIZE] = fingerprint
+            self.counters[_EVICTIONS] += 1
+
+    def _bucket(self, fingerprint):
+        """
+        Find the first slot of the bucket that a fingerprint belongs to.
+
+        :param fingerprint: A board fingerprint.
+        :return: Index of the first slot in the bucket.
+        """
+        return fingerprint & (self.num_slots - 1) & ~(SHARED_TABLE_BUCKET_SIZE - 1)
+
+    @staticmethod
+    def _fingerprint(board):
+        """
+        Reduce a board to a non-zero 64-bit fingerprint. Zero is reserved to mark empty slots.
+
+        :param board: The board to fingerprint.
+        :return: A non-zero integer that fits in 64 bits.
+        """
+        return board.zobrist() or 1
+
+    def __len__(self):
+        return sum(1 for slot in self.slots if slot)
+
+    def __repr__(self):
+        return 'SharedTranspositionTable(size={size}/{num_slots}, hits={hits}, ' \
+               'misses={misses}, evictions={evictions})'.format(
+                   size=len(self),
+                   num_slots=self.num_slots,
+                   hits=self.hits,
+                   misses=self.misses,
+                   evictions=self.evictions,
+               )
+
+    def __str__(self):
+        return repr(self)
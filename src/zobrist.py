@@ -0,0 +1,56 @@
+# Mask reducing an integer to 64 bits
+ZOBRIST_MASK = 0xffffffffffffffff
+
+# Cache of the keys generated so far, by (column, row, color index)
+_zobrist_keys = {}
+
+
+def zobrist_key(column, row, color_index):
+    """
+    Get the random 64-bit key for a brick of a single color at a single cell. Cells are addressed
+    by column from the left and row from the bottom of the board, so that bricks that stay in place
+    through a contraction keep the same key.
+
+    Keys are derived deterministically from their inputs with the SplitMix64 finalizer rather
+    than drawn from a shared random generator, so every process assigns the same key to the same
+    cell regardless of the order in which keys are first requested.
+
+    :param column: Column index of the cell, from the left of the board.
+    :param row: Row index of the cell, from the bottom of the board.
+    :param color_index: The index of the brick's Color.
+    :return: A 64-bit integer.
+    """
+    cell = (column, row, color_index)
+    key = _zobrist_keys.get(cell)
+
+    if key is None:
+        key = ((column << 40) | (row << 20) | color_index) + 0x9e3779b97f4a7c15
+        key = ((key ^ (key >> 30)) * 0xbf58476d1ce4e5b9) & ZOBRIST_MASK
+        key = ((key ^ (key >> 27)) * 0x94d049bb133111eb) & ZOBRIST_MASK
+        key ^= key >> 31
+        _zobrist_keys[cell] = key
+
+    return key
+
+
+# Cache of the keys of every bit of a mask, by (stride, color index)
+_mask_zobrist_keys = {}
+
+
+def mask_zobrist_keys(stride, color_index, num_bits):
+    """
+    Get the keys of a single color at every bit of a column-major mask, as laid out by BitBoard,
+    so that the key of a set bit can be looked up directly by its index.
+
+    :param stride: Number of bits occupied by each column of the mask.
+    :param color_index: The index of the Color the mask describes.
+    :param num_bits: The minimum number of bits to return keys for.
+    :return: A list whose element at each bit index is the key of that cell.
+    """
+    keys = _mask_zobrist_keys.setdefault((stride, color_index), [])
+
+    for idx in range(len(keys), num_bits):
+        column, row = divmod(idx, stride)
+        keys.append(zobrist_key(column, row, color_index))
+
+    return keys
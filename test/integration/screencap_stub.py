@@ -0,0 +1,15 @@
+"""
+Stand-in for `adb exec-out screencap`, writing the raw screencap output of a test fixture to
+standard output. Pass -p after the fixture name to write the PNG instead, as `screencap -p` does.
+"""
+
+import sys
+
+import util
+
+if __name__ == '__main__':
+    if '-p' in sys.argv[2:]:
+        with open(util.fixture_path(sys.argv[1]), 'rb') as fixture:
+            sys.stdout.write(fixture.read())
+    else:
+        sys.stdout.write(util.raw_screencap(sys.argv[1]))
@@ -1,6 +1,16 @@
+import os
+import subprocess
+import sys
 import unittest
 
 import util
+from bitboard import BitBoard
+from endgame import EndgameSolver
+from engine import iterative_solve
+from portfolio import portfolio_solve
+from reduction import SleepSetReduction
+from region import RegionGraph
+from shortest import shortest_solve
 from solve import load_board
 from solve import parallel_solve
 from solve import serial_solve
@@ -19,16 +29,69 @@ class TestIntegrationSerialSolve(unittest.TestCase):
     def test_serial_unsolvable(self):
         self.assert_invalid_serial_solve(unsolvable_board)
 
-    def assert_valid_serial_solve(self, board):
-        solution = serial_solve(board)
+    def test_serial_solve_bitboard_four_colors(self):
+        self.assert_valid_serial_solve(BitBoard.from_board(four_board))
+
+    def test_serial_unsolvable_bitboard(self):
+        self.assert_invalid_serial_solve(BitBoard.from_board(unsolvable_board))
+
+    def test_serial_solve_region_graph_four_colors(self):
+        self.assert_valid_serial_solve(RegionGraph.from_board(four_board))
+
+    def test_serial_unsolvable_region_graph(self):
+        self.assert_invalid_serial_solve(RegionGraph.from_board(unsolvable_board))
+
+    def test_serial_solve_reduction_six_colors(self):
+        self.assert_valid_serial_solve(RegionGraph.from_board(six_board), SleepSetReduction())
+
+    def test_serial_unsolvable_reduction(self):
+        self.assert_invalid_serial_solve(unsolvable_board, SleepSetReduction())
+
+    def test_serial_solve_endgame_four_colors(self):
+        self.assert_valid_serial_solve(RegionGraph.from_board(four_board), endgame=EndgameSolver())
+
+    def test_serial_unsolvable_endgame(self):
+        self.assert_invalid_serial_solve(unsolvable_board, endgame=EndgameSolver())
+
+    def assert_valid_serial_solve(self, board, reduction=None, endgame=None):
+        solution = serial_solve(board, reduction=reduction, endgame=endgame)
         self.assertFalse(solution.is_empty())
         self.assertTrue(util.is_solution_valid(board, solution.get_steps()))
 
-    def assert_invalid_serial_solve(self, board):
-        solution = serial_solve(board)
+    def assert_invalid_serial_solve(self, board, reduction=None, endgame=None):
+        solution = serial_solve(board, reduction=reduction, endgame=endgame)
         self.assertTrue(solution.is_empty())
 
 
+class TestIntegrationIterativeSolve(unittest.TestCase):
+    def test_iterative_solve_four_colors(self):
+        self.assert_valid_iterative_solve(four_board)
+
+    def test_iterative_solve_six_colors(self):
+        self.assert_valid_iterative_solve(six_board)
+
+    def test_iterative_unsolvable(self):
+        self.assertTrue(iterative_solve(unsolvable_board).is_empty())
+
+    def assert_valid_iterative_solve(self, board):
+        solution = iterative_solve(board)
+        self.assertFalse(solution.is_empty())
+        self.assertTrue(util.is_solution_valid(board, solution.get_steps()))
+
+
+class TestIntegrationShortestSolve(unittest.TestCase):
+    def test_shortest_solve_three_colors(self):
+        board = RegionGraph.from_board(three_board)
+        solution = shortest_solve(board, step=3)
+
+        self.assertFalse(solution.is_empty())
+        self.assertTrue(util.is_solution_valid(board, solution.get_steps()))
+        self.assertLess(len(solution.get_steps()), len(serial_solve(board).get_steps()))
+
+    def test_shortest_unsolvable(self):
+        self.assertTrue(shortest_solve(unsolvable_board).is_empty())
+
+
 class TestIntegrationParallelSolve(unittest.TestCase):
     def test_parallel_solve_three_colors(self):
         self.assert_valid_parallel_solve(three_board)
@@ -45,6 +108,20 @@ class TestIntegrationParallelSolve(unittest.TestCase):
     def test_parallel_unsolvable(self):
         self.assert_invalid_parallel_solve(unsolvable_board)
 
+    def test_parallel_solve_bitboard_six_colors(self):
+        self.assert_valid_parallel_solve(BitBoard.from_board(six_board))
+
+    def test_parallel_solve_region_graph_six_colors(self):
+        self.assert_valid_parallel_solve(RegionGraph.from_board(six_board))
+
+    def test_portfolio_solve_six_colors(self):
+        result = portfolio_solve(RegionGraph.from_board(six_board))
+        self.assertTrue(util.is_solution_valid(six_board, result.solution.get_steps()))
+
+    def test_portfolio_unsolvable(self):
+        result = portfolio_solve(RegionGraph.from_board(unsolvable_board))
+        self.assertTrue(result.solution.is_empty())
+
     def assert_valid_parallel_solve(self, board):
         solution = parallel_solve(board)
         self.assertFalse(solution.is_empty())
@@ -53,3 +130,32 @@ class TestIntegrationParallelSolve(unittest.TestCase):
     def assert_invalid_parallel_solve(self, board):
         solution = parallel_solve(board)
         self.assertTrue(solution.is_empty())
+
+
+class TestIntegrationLoadBoard(unittest.TestCase):
+    def test_load_board_raw_stdin(self):
+        self.assert_piped_load_board('6-colors.png')
+
+    def test_load_board_png_stdin(self):
+        self.assert_piped_load_board('6-colors.png', '-p')
+
+    def assert_piped_load_board(self, file_name, *stub_args):
+        cwd = os.path.dirname(os.path.abspath(__file__))
+        env = dict(os.environ, PYTHONPATH=os.path.join(cwd, '../../src'))
+
+        stub = subprocess.Popen(
+            [sys.executable, os.path.join(cwd, 'screencap_stub.py'), file_name] + list(stub_args),
+            stdout=subprocess.PIPE,
+        )
+        loader = subprocess.Popen(
+            [sys.executable, '-c', 'import solve; print solve.load_board(solve.STDIN_FILE_NAME)'],
+            stdin=stub.stdout,
+            stdout=subprocess.PIPE,
+            env=env,
+        )
+        stub.stdout.close()
+        output, _ = loader.communicate()
+
+        self.assertEqual(stub.wait(), 0)
+        self.assertEqual(loader.returncode, 0)
+        self.assertEqual(output.strip(), str(load_board(util.fixture_path(file_name))).strip())
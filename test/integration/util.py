@@ -40,3 +40,25 @@ def fixture_path(file_name):
     """
     cwd = os.path.dirname(__file__)
     return os.path.join(cwd, '../fixtures/{file_name}'.format(file_name=file_name))
+
+
+def raw_screencap(file_name, header_size=12):
+    """
+    Generate the raw output of screencap without -p for a test fixture, i.e. a header followed by
+    the uncompressed RGBA_8888 pixels of the screenshot.
+
+    :param file_name: The name of the test fixture file.
+    :param header_size: Size of the header, in bytes: 12 for width, height, and format, or 16 with
+                        the color space that newer versions of Android append.
+    :return: A byte string of raw screencap output.
+    """
+    import cv2
+    import numpy
+
+    img = cv2.imread(fixture_path(file_name), cv2.IMREAD_COLOR)
+    height, width = img.shape[:2]
+    header = numpy.zeros(header_size // 4, dtype='<u4')
+    header[:3] = (width, height, 1)
+    rgba = numpy.dstack((img[:, :, ::-1], numpy.full((height, width), 255, dtype=numpy.uint8)))
+
+    return header.tostring() + rgba.tostring()
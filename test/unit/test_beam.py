@@ -0,0 +1,79 @@
+import time
+import unittest
+
+import mock
+
+import beam
+from board import Board
+from color import Color
+from solution import EmptySolution
+from solution import ScoredSolution
+from test.fixtures.three_color_board import three_color_board
+
+one = Color('one')
+two = Color('two')
+
+unsolvable_board = Board.from_grid([
+    [one, two],
+    [one, two],
+    [two, one],
+])
+
+# Popping the middle pool first joins the outer pools into a single pool of four
+merge_board = Board.from_grid([
+    [one, two, one],
+    [one, two, one],
+])
+
+
+def solution_score(board, solution):
+    score = 0
+    for step in solution.get_steps():
+        pool = [pool for pool in board.pools() if step in pool.indices][0]
+        score += beam.squared_pool_score(pool)
+        board = board.pop_from(step)
+
+    return score if board.is_solved() else None
+
+
+class TestBeam(unittest.TestCase):
+    def test_squared_pool_score(self):
+        self.assertEqual(beam.squared_pool_score(merge_board.pools()[0]), 4)
+
+    def test_beam_solve_solved(self):
+        self.assertEqual(beam.beam_solve(Board.from_grid([])).score, 0)
+
+    def test_beam_solve_valid(self):
+        solution = beam.beam_solve(three_color_board, width=4)
+
+        self.assertIsInstance(solution, ScoredSolution)
+        self.assertEqual(solution_score(three_color_board, solution), solution.score)
+
+    def test_beam_solve_best_score(self):
+        solution = beam.beam_solve(merge_board)
+
+        self.assertEqual(solution.score, 4 + 16)
+        self.assertEqual(len(solution.get_steps()), 2)
+
+    def test_beam_solve_wider_beam(self):
+        narrow = beam.beam_solve(three_color_board, width=1)
+        wide = beam.beam_solve(three_color_board, width=16)
+
+        self.assertGreaterEqual(wide.score, narrow.score)
+
+    def test_beam_solve_score(self):
+        score = mock.MagicMock(return_value=1)
+        solution = beam.beam_solve(merge_board, score=score)
+
+        # With every pop scoring the same, the best solution is the one with the most pops
+        self.assertEqual(solution.score, 3)
+        self.assertGreater(score.call_count, 0)
+
+    def test_beam_solve_unsolvable(self):
+        self.assertEqual(beam.beam_solve(unsolvable_board), EmptySolution())
+
+    def test_beam_solve_deadline(self):
+        with mock.patch.object(beam, 'DEADLINE_CHECK_INTERVAL', 1):
+            solution = beam.beam_solve(three_color_board, deadline=time.time() - 1)
+
+        self.assertEqual(solution, EmptySolution())
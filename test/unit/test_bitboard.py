@@ -0,0 +1,253 @@
+import unittest
+
+import board
+from bitboard import BitBoard
+from bitboard import MutableBitBoard
+from bitboard import popcount
+from board import Board
+from color import Color
+from color import EmptyColor
+from coordinate import Coordinate
+from test.fixtures.three_color_board import three_color_board
+
+defined_color = Color('COLOR')
+other_color = Color('OTHER')
+empty_color = EmptyColor()
+
+
+class TestBitBoardUtils(unittest.TestCase):
+    def test_popcount(self):
+        self.assertEqual(popcount(0), 0)
+        self.assertEqual(popcount(0b1011), 3)
+        self.assertEqual(popcount(1 << 109), 1)
+
+
+class TestBitBoard(unittest.TestCase):
+    def test_from_board(self):
+        instance = BitBoard.from_board(Board.from_grid([
+            [defined_color, empty_color],
+            [defined_color, other_color],
+        ]))
+
+        self.assertEqual(instance.height, 2)
+        self.assertEqual(instance.width, 2)
+        self.assertEqual(instance.colors, (defined_color, other_color))
+        # Column 0 occupies bits 0-1 and column 1 occupies bits 3-4
+        self.assertEqual(instance.masks, (0b00011, 0b01000))
+
+    def test_to_board(self):
+        grid = [
+            [empty_color, defined_color, defined_color],
+            [defined_color, empty_color, other_color],
+            [defined_color, other_color, other_color],
+        ]
+
+        instance = BitBoard.from_board(Board.from_grid(grid))
+
+        self.assertEqual(instance.to_board(), Board.from_grid(grid))
+        self.assertEqual(BitBoard.from_board(Board.from_grid([])).to_board(), Board.from_grid([]))
+
+    def test_color_counts(self):
+        instance = BitBoard.from_board(three_color_board)
+
+        self.assertEqual(instance.color_counts(), three_color_board.color_counts())
+        for coord, new_board in instance.available_moves():
+            self.assertIsNotNone(new_board._color_counts)
+            self.assertEqual(new_board.color_counts(), new_board.to_board().color_counts())
+
+    def test_pools(self):
+        instance = BitBoard.from_board(three_color_board)
+
+        self.assertEqual(
+            [(pool.coord, pool.color, pool.size) for pool in instance.pools()],
+            [(pool.coord, pool.color, pool.size) for pool in three_color_board.pools()],
+        )
+
+    def test_pools_mask(self):
+        instance = BitBoard.from_board(three_color_board)
+
+        for pool in instance.pools():
+            self.assertEqual(popcount(pool.mask), pool.size)
+            self.assertEqual(pool.mask & instance.masks[pool.color_idx], pool.mask)
+            self.assertFalse(hasattr(pool, 'indices'))
+
+    def test_is_solved(self):
+        self.assertTrue(BitBoard.from_board(Board.from_grid([])).is_solved())
+        self.assertFalse(BitBoard.from_board(Board.from_grid([[defined_color]])).is_solved())
+
+    def test_flood_mask(self):
+        instance = BitBoard.from_board(Board.from_grid([
+            [empty_color, defined_color, defined_color],
+            [defined_color, empty_color, empty_color],
+            [defined_color, defined_color, defined_color],
+        ]))
+        mask = instance.masks[0]
+
+        # The bottom-left cell floods into the entire bottom row and the cell above it
+        self.assertEqual(popcount(instance.flood_mask(1, mask)), 4)
+        # The top-right cell only floods into its left neighbor
+        self.assertEqual(popcount(instance.flood_mask(1 << 10, mask)), 2)
+
+    def test_pop_from(self):
+        grid = [
+            [empty_color, defined_color, defined_color],
+            [defined_color, empty_color, other_color],
+            [defined_color, other_color, other_color],
+        ]
+        instance = BitBoard.from_board(Board.from_grid(grid))
+
+        self.assertRaises(
+            board.InvalidPopException,
+            instance.pop_from,
+            Coordinate(0, 0),
+        )
+        self.assertEqual(
+            instance.pop_from(Coordinate(2, 2)).to_board(),
+            Board.from_grid(grid).pop_from(Coordinate(2, 2)),
+        )
+        self.assertEqual(
+            instance.pop_from(Coordinate(0, 1)).to_board(),
+            Board.from_grid(grid).pop_from(Coordinate(0, 1)),
+        )
+
+    def test_pop_from_removes_columns(self):
+        grid = [
+            [defined_color, other_color, defined_color],
+            [defined_color, other_color, defined_color],
+        ]
+        instance = BitBoard.from_board(Board.from_grid(grid)).pop_from(Coordinate(0, 1))
+
+        self.assertEqual(instance.width, 2)
+        self.assertEqual(instance.to_board(), Board.from_grid(grid).pop_from(Coordinate(0, 1)))
+        self.assertTrue(instance.pop_from(Coordinate(0, 0)).is_solved())
+
+    def test_available_moves(self):
+        instance = BitBoard.from_board(three_color_board)
+        available_moves = instance.available_moves()
+
+        self.assertEqual(
+            [coord for coord, _ in available_moves],
+            [coord for coord, _ in three_color_board.available_moves()],
+        )
+        for coord, new_board in available_moves:
+            self.assertEqual(new_board.to_board(), three_color_board.pop_from(coord))
+
+    def test_iter_moves(self):
+        instance = BitBoard.from_board(three_color_board)
+        moves = list(instance.iter_moves())
+
+        self.assertTrue(all(move._result is None for move in moves))
+        self.assertEqual(
+            [(move.coord, move.result()) for move in moves],
+            instance.available_moves(),
+        )
+
+    def test_available_moves_deep(self):
+        # Play out the first available move repeatedly, checking against Board at every step
+        reference = three_color_board
+        instance = BitBoard.from_board(three_color_board)
+
+        while not instance.is_solved():
+            available_moves = instance.available_moves()
+            if not available_moves:
+                break
+
+            coord, instance = available_moves[-1]
+            reference = reference.pop_from(coord)
+            self.assertEqual(instance.to_board(), reference)
+
+    def test_key(self):
+        instance = BitBoard.from_board(Board.from_grid([
+            [defined_color, empty_color],
+            [defined_color, other_color],
+        ]))
+
+        self.assertEqual(
+            instance.key(),
+            (2, 2, (defined_color.index, 0b00011), (other_color.index, 0b01000)),
+        )
+        self.assertEqual(BitBoard.from_board(Board.from_grid([])).key(), (0, 0))
+
+    def test_zobrist(self):
+        instance = BitBoard.from_board(three_color_board)
+
+        self.assertEqual(instance.zobrist(), three_color_board.zobrist())
+        self.assertEqual(BitBoard.from_board(Board.from_grid([])).zobrist(), 0)
+
+    def test_zobrist_incremental(self):
+        instance = BitBoard.from_board(three_color_board)
+        instance.zobrist()
+
+        for coord, new_board in instance.available_moves():
+            self.assertIsNotNone(new_board._zobrist)
+            self.assertEqual(new_board.zobrist(), new_board.to_board().zobrist())
+
+    def test_hash(self):
+        instances = set([BitBoard.from_board(three_color_board) for _ in range(5)])
+        children = set([new_board for _, new_board in three_color_board.available_moves()])
+
+        self.assertEqual(len(instances), 1)
+        self.assertEqual(
+            set([new_board.to_board() for _, new_board in BitBoard.from_board(
+                three_color_board).available_moves()]),
+            children,
+        )
+
+    def test_repr(self):
+        self.assertEqual(repr(BitBoard.from_board(three_color_board)), repr(three_color_board))
+
+    def test_eq(self):
+        instances = [BitBoard.from_board(three_color_board) for _ in range(5)]
+
+        for one in instances:
+            for two in instances:
+                self.assertEqual(one, two)
+
+        self.assertNotEqual(instances[0], instances[0].pop_from(Coordinate(0, 0)))
+
+
+class TestMutableBitBoard(unittest.TestCase):
+    def test_from_bitboard(self):
+        bitboard = BitBoard.from_board(three_color_board)
+        instance = MutableBitBoard.from_bitboard(bitboard)
+
+        self.assertEqual(instance.key(), bitboard.key())
+        self.assertEqual(instance.undo_log, [])
+
+    def test_apply(self):
+        bitboard = BitBoard.from_board(three_color_board)
+        instance = MutableBitBoard.from_bitboard(bitboard)
+        instance.color_counts()
+        instance.zobrist()
+        pool = [pool for pool in instance.pools() if pool.size > 1][0]
+        instance.apply(pool)
+
+        expected = bitboard.pop_from(pool.coord)
+        self.assertEqual(instance.key(), expected.key())
+        self.assertEqual(instance.zobrist(), expected.to_board().zobrist())
+        self.assertEqual(instance.color_counts(), expected.color_counts())
+        self.assertEqual(len(instance.undo_log), 1)
+
+    def test_undo(self):
+        bitboard = BitBoard.from_board(three_color_board)
+        instance = MutableBitBoard.from_bitboard(bitboard)
+        pools = instance.pools()
+
+        for _ in range(3):
+            instance.apply([pool for pool in instance.pools() if pool.size > 1][0])
+        for _ in range(3):
+            instance.undo()
+
+        self.assertEqual(instance.key(), bitboard.key())
+        self.assertEqual(instance.zobrist(), bitboard.zobrist())
+        self.assertIs(instance.pools(), pools)
+        self.assertEqual(instance.undo_log, [])
+
+    def test_snapshot(self):
+        instance = MutableBitBoard.from_bitboard(BitBoard.from_board(three_color_board))
+        instance.apply([pool for pool in instance.pools() if pool.size > 1][0])
+        snapshot = instance.snapshot()
+        instance.undo()
+
+        self.assertIsInstance(snapshot, BitBoard)
+        self.assertNotEqual(snapshot.key(), instance.key())
@@ -1,12 +1,18 @@
 import unittest
+from array import array
+
+import mock
 
 import board
 from board import Board
 from color import Color
 from color import EmptyColor
 from coordinate import Coordinate
+from zobrist import zobrist_key
+from test.fixtures.three_color_board import three_color_board
 
 defined_color = Color('COLOR')
+other_color = Color('OTHER')
 empty_color = EmptyColor()
 
 
@@ -74,6 +80,60 @@ class TestBoard(unittest.TestCase):
         instance = Board.from_grid(grid)
         self.assertEqual(instance.board, grid)
 
+    def test_color_counts(self):
+        grid = [
+            [empty_color, defined_color, defined_color],
+            [defined_color, empty_color, other_color],
+            [defined_color, defined_color, defined_color],
+        ]
+        instance = Board.from_grid(grid)
+
+        self.assertEqual(instance.color_counts(), {defined_color: 6, other_color: 1})
+        self.assertEqual(Board.from_grid([]).color_counts(), {})
+
+    def test_color_counts_incremental(self):
+        instance = three_color_board
+        instance.color_counts()
+
+        for coord, new_board in instance.available_moves():
+            self.assertIsNotNone(new_board._color_counts)
+            self.assertEqual(
+                new_board.color_counts(),
+                Board.from_grid(new_board.board).color_counts(),
+            )
+
+    def test_zobrist(self):
+        instance = Board.from_grid([
+            [defined_color, empty_color],
+            [defined_color, other_color],
+        ])
+
+        self.assertEqual(
+            instance.zobrist(),
+            zobrist_key(0, 0, defined_color.index) ^ zobrist_key(0, 1, defined_color.index) ^
+            zobrist_key(1, 0, other_color.index),
+        )
+        self.assertEqual(Board.from_grid([]).zobrist(), 0)
+
+    def test_zobrist_incremental(self):
+        instance = Board.from_grid(three_color_board.board)
+        instance.zobrist()
+
+        for coord, new_board in instance.available_moves():
+            self.assertIsNotNone(new_board._zobrist)
+            self.assertEqual(new_board.zobrist(), Board.from_grid(new_board.board).zobrist())
+            self.assertNotEqual(new_board.zobrist(), instance.zobrist())
+
+    def test_zobrist_contract(self):
+        instance = Board.from_grid([
+            [defined_color, empty_color, empty_color],
+            [empty_color, empty_color, other_color],
+        ])
+        instance.zobrist()
+        contracted = instance.contract()
+
+        self.assertEqual(contracted.zobrist(), Board.from_grid(contracted.board).zobrist())
+
     def test_is_solved(self):
         self.assertTrue(Board.from_grid([]).is_solved())
         self.assertFalse(Board.from_grid([[]]).is_solved())
@@ -103,6 +163,41 @@ class TestBoard(unittest.TestCase):
             {Coordinate(1, 0), Coordinate(2, 0), Coordinate(2, 1), Coordinate(2, 2)},
         )
 
+    def test_pools(self):
+        grid = [
+            [empty_color, defined_color, defined_color],
+            [defined_color, empty_color, other_color],
+            [defined_color, defined_color, defined_color],
+        ]
+        pools = Board.from_grid(grid).pools()
+
+        self.assertEqual([pool.coord for pool in pools], [
+            Coordinate(0, 1),
+            Coordinate(1, 0),
+            Coordinate(1, 2),
+        ])
+        self.assertEqual([pool.size for pool in pools], [2, 4, 1])
+        self.assertEqual([pool.color for pool in pools], [
+            defined_color,
+            defined_color,
+            other_color,
+        ])
+        self.assertEqual(
+            pools[1].indices,
+            {Coordinate(1, 0), Coordinate(2, 0), Coordinate(2, 1), Coordinate(2, 2)},
+        )
+        self.assertEqual(Board.from_grid([]).pools(), [])
+
+    def test_pools_match_flood_indices(self):
+        for pool in three_color_board.pools():
+            self.assertEqual(three_color_board.flood_indices(pool.coord), pool.indices)
+
+    def test_available_moves_one_per_pool(self):
+        available_moves = three_color_board.available_moves()
+        pools = [pool for pool in three_color_board.pools() if pool.size > 1]
+
+        self.assertEqual([coord for coord, _ in available_moves], [pool.coord for pool in pools])
+
     def test_available_moves(self):
         grid = [
             [empty_color, defined_color, defined_color],
@@ -115,6 +210,16 @@ class TestBoard(unittest.TestCase):
         for coord, new_board in available_moves:
             self.assertEqual(instance.pop_from(coord), new_board)
 
+    def test_iter_moves(self):
+        moves = list(three_color_board.iter_moves())
+
+        self.assertTrue(all(move._result is None for move in moves))
+        self.assertEqual(
+            [(move.coord, move.result()) for move in moves],
+            three_color_board.available_moves(),
+        )
+        self.assertIs(moves[0].result(), moves[0].result())
+
     def test_pop_from(self):
         grid = [
             [empty_color, defined_color, defined_color],
@@ -236,6 +341,41 @@ class TestBoard(unittest.TestCase):
             'COLOR ----- COLOR -----',
         )
 
+    def test_key(self):
+        grid = [
+            [empty_color, defined_color],
+            [defined_color, other_color],
+        ]
+        instance = Board.from_grid(grid)
+
+        indices = [0, defined_color.index, defined_color.index, other_color.index]
+
+        self.assertEqual(instance.key(), array('H', [2, 2] + indices).tostring())
+        self.assertIs(instance.key(), instance.key())
+        self.assertEqual(Board.from_grid([]).key(), array('H', [0, 0]).tostring())
+        self.assertNotEqual(Board.from_grid([]).key(), Board.from_grid([[]]).key())
+
+    def test_key_many_colors(self):
+        colors = [Color('key color {idx}'.format(idx=idx)) for idx in range(300)]
+        instance = Board.from_grid([colors])
+
+        self.assertGreater(colors[-1].index, 255)
+        self.assertEqual(
+            instance.key(),
+            array('H', [1, 300] + [elem.index for elem in colors]).tostring(),
+        )
+
+    def test_hash(self):
+        grid = [
+            [empty_color, defined_color],
+            [defined_color, other_color],
+        ]
+        instances = set([Board.from_grid([list(row) for row in grid]) for _ in range(5)])
+
+        self.assertEqual(len(instances), 1)
+        self.assertIn(Board.from_grid(grid), instances)
+        self.assertNotIn(Board.from_grid([[defined_color]]), instances)
+
     def test_eq(self):
         grid = [
             [empty_color, empty_color, empty_color, defined_color],
@@ -247,3 +387,45 @@ class TestBoard(unittest.TestCase):
         for one in instances:
             for two in instances:
                 self.assertEqual(one, two)
+
+        self.assertNotEqual(instances[0], Board.from_grid([[defined_color]]))
+        self.assertNotEqual(instances[0], repr(instances[0]))
+
+
+class TestMove(unittest.TestCase):
+    def test_result(self):
+        pool = board.Pool(Coordinate(0, 0), defined_color, {Coordinate(0, 0), Coordinate(0, 1)})
+        pop = mock.MagicMock(return_value=Board.from_grid([]))
+        move = board.Move(pool, pop)
+
+        self.assertEqual(move.coord, Coordinate(0, 0))
+        self.assertEqual(pop.call_count, 0)
+        self.assertEqual(move.result(), Board.from_grid([]))
+        self.assertEqual(move.result(), Board.from_grid([]))
+        self.assertEqual(pop.call_count, 1)
+
+    def test_unpack(self):
+        pool = board.Pool(Coordinate(0, 0), defined_color, {Coordinate(0, 0), Coordinate(0, 1)})
+        coord, result = board.Move(pool, lambda: Board.from_grid([]))
+
+        self.assertEqual(coord, Coordinate(0, 0))
+        self.assertEqual(result, Board.from_grid([]))
+
+    def test_repr(self):
+        pool = board.Pool(Coordinate(0, 0), defined_color, {Coordinate(0, 0), Coordinate(0, 1)})
+
+        self.assertEqual(repr(board.Move(pool, None)), 'Move(Pool((0, 0), COLOR, 2))')
+
+
+class TestPool(unittest.TestCase):
+    def test_init(self):
+        pool = board.Pool(Coordinate(0, 0), defined_color, {Coordinate(0, 0), Coordinate(0, 1)})
+
+        self.assertEqual(pool.coord, Coordinate(0, 0))
+        self.assertEqual(pool.color, defined_color)
+        self.assertEqual(pool.size, 2)
+
+    def test_repr(self):
+        pool = board.Pool(Coordinate(0, 0), defined_color, {Coordinate(0, 0), Coordinate(0, 1)})
+
+        self.assertEqual(repr(pool), 'Pool((0, 0), COLOR, 2)')
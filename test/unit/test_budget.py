@@ -0,0 +1,194 @@
+import multiprocessing
+import time
+import unittest
+
+import mock
+
+import budget
+from budget import Budget
+from budget import BudgetExhaustedException
+from budget import SharedNodeBudget
+from budget import SolveResult
+from board import Board
+from color import Color
+from solution import EmptySolution
+from solution import Solution
+from test.fixtures.three_color_board import three_color_board
+
+unsolvable_board = Board.from_grid([
+    [Color('one'), Color('two')],
+    [Color('one'), Color('two')],
+    [Color('two'), Color('one')],
+])
+
+# A board whose search expands a few thousand nodes before proving it has no solution
+large_board = Board.from_grid([
+    [Color(name) for name in row.split()]
+    for row in [
+        'b a c a c b',
+        'a c a b a a',
+        'b d a a c d',
+        'c b d a d b',
+        'a a b d a c',
+        'c b c a a a',
+    ]
+])
+
+
+def stalled_worker(tasks, results, stop, outstanding, idle, table, ordering, budget):
+    # Search indefinitely, only stopping when asked to
+    stop.wait()
+
+
+class TestBudget(unittest.TestCase):
+    def test_init(self):
+        instance = Budget(deadline=1, node_budget=2, check_interval=3)
+
+        self.assertEqual(instance.deadline, 1)
+        self.assertEqual(instance.node_budget, 2)
+        self.assertEqual(instance.check_interval, 3)
+        self.assertEqual(instance.nodes, 0)
+
+    def test_tick_unbounded(self):
+        instance = Budget()
+        for _ in range(1000):
+            instance.tick()
+
+        self.assertEqual(instance.nodes, 1000)
+
+    def test_tick_node_budget(self):
+        instance = Budget(node_budget=2)
+        instance.tick()
+        instance.tick()
+
+        self.assertRaises(BudgetExhaustedException, instance.tick)
+
+    def test_tick_deadline(self):
+        instance = Budget(deadline=time.time() - 1, check_interval=2)
+
+        # The clock is only read every check_interval nodes
+        instance.tick()
+        self.assertRaises(BudgetExhaustedException, instance.tick)
+
+    def test_tick_deadline_not_reached(self):
+        instance = Budget(deadline=time.time() + 60, check_interval=1)
+        instance.tick()
+
+        self.assertEqual(instance.nodes, 1)
+
+
+class TestSolveResult(unittest.TestCase):
+    def test_repr(self):
+        result = SolveResult(budget.UNSOLVABLE, EmptySolution(), 5, 0.25)
+
+        self.assertEqual(
+            repr(result),
+            'SolveResult(unsolvable, EmptySolution(), nodes=5, elapsed=0.250)',
+        )
+        self.assertEqual(str(result), repr(result))
+
+
+class TestBudgetSolve(unittest.TestCase):
+    def test_budget_solve_solved(self):
+        result = budget.budget_solve(three_color_board)
+
+        self.assertEqual(result.status, budget.SOLVED)
+        self.assertFalse(result.solution.is_empty())
+        self.assertGreater(result.nodes, 0)
+        self.assertGreaterEqual(result.elapsed, 0)
+
+    def test_budget_solve_unsolvable(self):
+        result = budget.budget_solve(unsolvable_board)
+
+        self.assertEqual(result.status, budget.UNSOLVABLE)
+        self.assertTrue(result.solution.is_empty())
+
+    def test_budget_solve_node_budget(self):
+        result = budget.budget_solve(three_color_board, node_budget=3)
+
+        self.assertEqual(result.status, budget.BUDGET_EXHAUSTED)
+        self.assertTrue(result.solution.is_empty())
+        self.assertEqual(result.nodes, 4)
+
+    def test_budget_solve_deadline(self):
+        with mock.patch.object(budget, 'DEADLINE_CHECK_INTERVAL', 1):
+            result = budget.budget_solve(three_color_board, deadline=time.time() - 1)
+
+        self.assertEqual(result.status, budget.BUDGET_EXHAUSTED)
+
+    def test_budget_solve_custom_search(self):
+        search = mock.MagicMock(return_value=Solution(tuple([])))
+        result = budget.budget_solve(three_color_board, search=search)
+
+        self.assertEqual(result.status, budget.SOLVED)
+        self.assertEqual(search.call_count, 1)
+
+
+class TestSharedNodeBudget(unittest.TestCase):
+    def test_charge(self):
+        instance = SharedNodeBudget(node_budget=10)
+        instance.charge(4)
+        instance.charge(6)
+
+        self.assertEqual(instance.nodes, 10)
+        self.assertRaises(BudgetExhaustedException, instance.charge, 1)
+        self.assertEqual(instance.nodes, 11)
+
+    def test_charge_unbounded(self):
+        instance = SharedNodeBudget()
+        instance.charge(1 << 20)
+
+        self.assertEqual(instance.nodes, 1 << 20)
+
+    def test_charge_shared(self):
+        instance = SharedNodeBudget()
+        process = multiprocessing.Process(target=instance.charge, args=(5,))
+        process.start()
+        process.join()
+
+        self.assertEqual(instance.nodes, 5)
+
+
+class TestParallelBudgetSolve(unittest.TestCase):
+    def test_parallel_budget_solve_solved(self):
+        result = budget.parallel_budget_solve(three_color_board, num_processes=2)
+
+        self.assertEqual(result.status, budget.SOLVED)
+        self.assertFalse(result.solution.is_empty())
+        self.assertGreaterEqual(result.elapsed, 0)
+
+    def test_parallel_budget_solve_already_solved(self):
+        result = budget.parallel_budget_solve(Board.from_grid([]))
+
+        self.assertEqual(result.status, budget.SOLVED)
+        self.assertEqual(result.solution, Solution(tuple([])))
+
+    def test_parallel_budget_solve_unsolvable(self):
+        result = budget.parallel_budget_solve(unsolvable_board, num_processes=2)
+
+        self.assertEqual(result.status, budget.UNSOLVABLE)
+        self.assertTrue(result.solution.is_empty())
+
+    def test_parallel_budget_solve_node_budget(self):
+        result = budget.parallel_budget_solve(large_board, node_budget=100, num_processes=2)
+
+        self.assertEqual(result.status, budget.BUDGET_EXHAUSTED)
+        self.assertTrue(result.solution.is_empty())
+        self.assertGreater(result.nodes, 100)
+
+    def test_parallel_budget_solve_node_budget_not_reached(self):
+        result = budget.parallel_budget_solve(large_board, node_budget=1 << 20, num_processes=2)
+
+        self.assertEqual(result.status, budget.UNSOLVABLE)
+        self.assertGreater(result.nodes, 100)
+
+    def test_parallel_budget_solve_deadline(self):
+        with mock.patch('parallel.worker', stalled_worker):
+            result = budget.parallel_budget_solve(
+                three_color_board,
+                deadline=time.time() + 0.05,
+                num_processes=2,
+            )
+
+        self.assertEqual(result.status, budget.BUDGET_EXHAUSTED)
+        self.assertTrue(result.solution.is_empty())
@@ -1,5 +1,8 @@
 import unittest
 
+import mock
+
+import color
 from color import Color
 from color import EmptyColor
 
@@ -41,6 +44,18 @@ class TestColor(unittest.TestCase):
     def test_nonempty_hash(self):
         self.assertEqual(hash(non_empty), hash('name'))
 
+    def test_nonempty_index(self):
+        self.assertEqual(Color('name').index, non_empty.index)
+        self.assertNotEqual(Color('other name').index, non_empty.index)
+        self.assertEqual(color.color_index('name'), non_empty.index)
+
+    def test_nonempty_index_registry_full(self):
+        with mock.patch.object(color, 'MAX_COLORS', len(color._color_indices)):
+            self.assertEqual(Color('name').index, non_empty.index)
+            self.assertRaises(color.ColorRegistryFullException, Color, 'never seen name')
+
+        self.assertNotIn('never seen name', color._color_indices)
+
     def test_nonempty_len(self):
         self.assertEqual(len(non_empty), 4)
 
@@ -50,6 +65,9 @@ class TestEmptyColor(unittest.TestCase):
         self.assertIsNotNone(empty)
         self.assertEqual(empty.name, 'EMPTY')
 
+    def test_empty_index(self):
+        self.assertEqual(empty.index, 0)
+
     def test_empty_is_empty(self):
         # EmptyColors are always considered empty
         self.assertTrue(empty.is_empty())
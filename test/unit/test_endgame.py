@@ -0,0 +1,116 @@
+import unittest
+
+from bitboard import BitBoard
+from board import Board
+from color import Color
+from color import EmptyColor
+from coordinate import Coordinate
+from endgame import EndgameSolver
+from region import RegionGraph
+from test.fixtures.three_color_board import three_color_board
+
+one = Color('one')
+two = Color('two')
+three = Color('three')
+empty = EmptyColor()
+
+single_color_board = Board.from_grid([
+    [one, empty, empty],
+    [one, one, one],
+])
+
+unsolvable_board = Board.from_grid([
+    [one, two],
+    [one, two],
+    [two, one],
+])
+
+no_moves_board = Board.from_grid([
+    [one, two],
+    [two, one],
+])
+
+two_color_board = Board.from_grid([
+    [one, two, one],
+    [one, two, one],
+])
+
+
+def is_valid(board, steps):
+    for step in steps:
+        board = board.pop_from(step)
+
+    return board.is_solved()
+
+
+class TestEndgameSolver(unittest.TestCase):
+    def test_init(self):
+        solver = EndgameSolver(max_bricks=4, max_colors=1)
+
+        self.assertEqual((solver.max_bricks, solver.max_colors), (4, 1))
+        self.assertEqual(len(solver), 0)
+        self.assertEqual((solver.hits, solver.misses), (0, 0))
+
+    def test_applies(self):
+        solver = EndgameSolver(max_bricks=4, max_colors=1)
+
+        self.assertTrue(solver.applies(single_color_board))
+        self.assertFalse(solver.applies(unsolvable_board))
+        self.assertTrue(EndgameSolver(max_bricks=6, max_colors=2).applies(unsolvable_board))
+        # Both the colors and the bricks must be few
+        self.assertFalse(EndgameSolver(max_bricks=6, max_colors=1).applies(unsolvable_board))
+        self.assertFalse(EndgameSolver(max_bricks=5, max_colors=2).applies(unsolvable_board))
+
+    def test_solve_solved(self):
+        self.assertEqual(EndgameSolver().solve(Board.from_grid([])), tuple([]))
+
+    def test_solve_single_color(self):
+        solver = EndgameSolver()
+
+        self.assertEqual(solver.solve(single_color_board), (Coordinate(1, 0),))
+        self.assertIsNone(solver.solve(Board.from_grid([[one]])))
+        # Single colors are decided without the table
+        self.assertEqual(len(solver), 0)
+
+    def test_solve_two_colors(self):
+        self.assertTrue(is_valid(two_color_board, EndgameSolver().solve(two_color_board)))
+
+    def test_solve_unsolvable(self):
+        solver = EndgameSolver()
+
+        self.assertIsNone(solver.solve(unsolvable_board))
+        self.assertIsNone(solver.solve(unsolvable_board))
+        self.assertEqual(solver.hits, 1)
+
+    def test_solve_valid(self):
+        for board in [three_color_board, BitBoard.from_board(three_color_board),
+                      RegionGraph.from_board(three_color_board)]:
+            self.assertTrue(is_valid(board, EndgameSolver().solve(board)))
+
+    def test_solve_ignores_colors(self):
+        # Relabeling the colors of a board leaves its solutions unchanged
+        relabeled = Board.from_grid([
+            [three, one, three],
+            [three, one, three],
+        ])
+        solver = EndgameSolver()
+        solver.solve(two_color_board)
+        solver.solve(relabeled)
+
+        self.assertEqual(solver.hits, 1)
+
+    def test_solve_bounded(self):
+        solver = EndgameSolver(max_size=1)
+        solver.solve(two_color_board)
+        solver.solve(unsolvable_board)
+
+        self.assertEqual(len(solver), 1)
+        self.assertGreater(solver.table.evictions, 0)
+        self.assertTrue(is_valid(two_color_board, solver.solve(two_color_board)))
+
+    def test_repr(self):
+        solver = EndgameSolver()
+        solver.solve(no_moves_board)
+
+        self.assertEqual(repr(solver), 'EndgameSolver(size=1, hits=0, misses=1)')
+        self.assertEqual(str(solver), repr(solver))
@@ -0,0 +1,117 @@
+import unittest
+
+import mock
+
+import engine
+from bitboard import BitBoard
+from bitboard import MutableBitBoard
+from board import Board
+from budget import Budget
+from budget import BudgetExhaustedException
+from color import Color
+from ordering import LargestPoolOrdering
+from prune import Pruner
+from region import RegionGraph
+from solution import EmptySolution
+from solution import Solution
+from transposition import TranspositionTable
+from test.fixtures.three_color_board import three_color_board
+
+unsolvable_board = Board.from_grid([
+    [Color('one'), Color('two')],
+    [Color('one'), Color('two')],
+    [Color('two'), Color('one')],
+])
+
+
+def is_solution_valid(board, solution):
+    for step in solution.get_steps():
+        board = board.pop_from(step)
+
+    return board.is_solved()
+
+
+class TestPoppablePools(unittest.TestCase):
+    def test_poppable_pools(self):
+        board = MutableBitBoard.from_bitboard(BitBoard.from_board(three_color_board))
+
+        self.assertEqual(
+            [pool.coord for pool in engine.poppable_pools(board)],
+            [coord for coord, _ in three_color_board.available_moves()],
+        )
+
+    def test_poppable_pools_ordering(self):
+        board = MutableBitBoard.from_bitboard(BitBoard.from_board(three_color_board))
+        pools = engine.poppable_pools(board, LargestPoolOrdering())
+
+        self.assertEqual([pool.size for pool in pools], sorted(
+            [pool.size for pool in pools],
+            reverse=True,
+        ))
+        self.assertEqual(board.undo_log, [])
+
+
+class TestIterativeSolve(unittest.TestCase):
+    def test_iterative_solve_solved(self):
+        self.assertEqual(engine.iterative_solve(Board.from_grid([])), Solution(tuple([])))
+
+    def test_iterative_solve_valid(self):
+        solution = engine.iterative_solve(three_color_board)
+
+        self.assertFalse(solution.is_empty())
+        self.assertTrue(is_solution_valid(three_color_board, solution))
+
+    def test_iterative_solve_bitboard(self):
+        solution = engine.iterative_solve(BitBoard.from_board(three_color_board))
+
+        self.assertTrue(is_solution_valid(three_color_board, solution))
+
+    def test_iterative_solve_unsolvable(self):
+        table = TranspositionTable()
+        solution = engine.iterative_solve(unsolvable_board, table=table, pruner=Pruner([]))
+
+        self.assertEqual(solution, EmptySolution())
+        self.assertGreater(len(table), 0)
+
+    def test_iterative_solve_matches_serial_solve(self):
+        import solve
+
+        self.assertEqual(
+            engine.iterative_solve(three_color_board),
+            solve.serial_solve(three_color_board),
+        )
+
+    def test_iterative_solve_table_hit(self):
+        table = TranspositionTable()
+        table.store(BitBoard.from_board(three_color_board))
+
+        self.assertEqual(engine.iterative_solve(three_color_board, table=table), EmptySolution())
+        self.assertEqual(table.hits, 1)
+
+    def test_iterative_solve_pruner(self):
+        pruner = Pruner()
+        board = Board.from_grid([[Color('one'), Color('two')], [Color('one'), Color('one')]])
+
+        self.assertEqual(engine.iterative_solve(board, pruner=pruner), EmptySolution())
+        self.assertEqual(pruner.counts['singleton_color'], 1)
+
+    def test_iterative_solve_budget(self):
+        self.assertRaises(
+            BudgetExhaustedException,
+            engine.iterative_solve,
+            three_color_board,
+            budget=Budget(node_budget=3),
+        )
+
+    def test_iterative_solve_ordering(self):
+        ordering = mock.MagicMock()
+        ordering.order.side_effect = lambda board, moves: list(reversed(list(moves)))
+        solution = engine.iterative_solve(three_color_board, ordering=ordering)
+
+        self.assertTrue(is_solution_valid(three_color_board, solution))
+        self.assertGreater(ordering.order.call_count, 0)
+
+    def test_iterative_solve_region_graph(self):
+        solution = engine.iterative_solve(RegionGraph.from_board(three_color_board))
+
+        self.assertTrue(is_solution_valid(three_color_board, solution))
@@ -0,0 +1,213 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import cv2
+import mock
+import numpy
+
+from coordinate import Coordinate
+from geometry import BACKGROUND_BGR
+from geometry import CalibrationException
+from geometry import GeometryProfiles
+from geometry import GridGeometry
+from geometry import calibrate
+
+fixtures_path = os.path.join(os.path.dirname(__file__), '../fixtures')
+
+
+def load_fixture(name, size=None):
+    img = cv2.imread(os.path.join(fixtures_path, name), cv2.IMREAD_COLOR)
+    if size is not None:
+        img = cv2.resize(img, size, interpolation=cv2.INTER_AREA)
+
+    return img
+
+
+def sample(img, geometry):
+    return img[geometry.rows()][:, geometry.columns()]
+
+
+def blocks(row_centers, column_centers, radius=30, shape=(1280, 720)):
+    img = numpy.zeros(shape + (3,), dtype=numpy.uint8)
+    img[:, :] = BACKGROUND_BGR
+    for row in row_centers:
+        for column in column_centers:
+            img[row - radius:row + radius, column - radius:column + radius] = (0, 0, 255)
+
+    return img
+
+
+class TestGridGeometry(unittest.TestCase):
+    def test_rows_columns(self):
+        geometry = GridGeometry(625, 70, 142)
+        self.assertEqual(geometry.rows().tolist(), range(625, 625 + 10 * 142, 142))
+        self.assertEqual(geometry.columns().tolist(), range(70, 70 + 10 * 142, 142))
+
+    def test_rows_columns_fractional_offset(self):
+        geometry = GridGeometry(10, 20, 2.5, size=4)
+        self.assertEqual(geometry.rows().tolist(), [10, 12, 15, 18])
+        self.assertEqual(geometry.columns().tolist(), [20, 22, 25, 28])
+
+    def test_locate(self):
+        geometry = GridGeometry(625, 70, 142)
+        self.assertEqual(geometry.locate(Coordinate(0, 0)), (70, 625))
+        self.assertEqual(geometry.locate(Coordinate(2, 3)), (70 + 3 * 142, 625 + 2 * 142))
+
+    def test_eq(self):
+        self.assertEqual(GridGeometry(625, 70, 142), GridGeometry(625, 70, 142))
+        self.assertNotEqual(GridGeometry(625, 70, 142), GridGeometry(625, 70, 143))
+        self.assertNotEqual(GridGeometry(625, 70, 142), None)
+
+    def test_repr(self):
+        self.assertEqual(
+            repr(GridGeometry(625, 70, 142)),
+            'GridGeometry(start_i=625, start_j=70, offset=142)',
+        )
+        self.assertEqual(str(GridGeometry(625, 70, 142)), repr(GridGeometry(625, 70, 142)))
+
+
+class TestCalibrate(unittest.TestCase):
+    def assert_samples_blocks(self, img, geometry):
+        # The pixels sampled must be the colors of the blocks sampled at the measured geometry
+        expected = sample(load_fixture('4-colors.png'), GridGeometry(625, 70, 142))
+        actual = sample(img, geometry)
+        self.assertTrue((numpy.abs(actual.astype(int) - expected) <= 8).all())
+
+    def test_calibrate_fixtures(self):
+        for name in ['3-colors.png', '4-colors.png', '5-colors.png', '6-colors.png']:
+            img = load_fixture(name)
+            geometry = calibrate(img)
+
+            self.assertAlmostEqual(geometry.offset, 144, delta=1)
+            self.assertAlmostEqual(geometry.start_i, 625, delta=6)
+            self.assertAlmostEqual(geometry.start_j, 70, delta=6)
+            self.assertTrue(numpy.array_equal(
+                sample(img, geometry),
+                sample(img, GridGeometry(625, 70, 142)),
+            ))
+
+    def test_calibrate_resized(self):
+        for width, height in [(1080, 1920), (720, 1280)]:
+            img = load_fixture('4-colors.png', (width, height))
+            geometry = calibrate(img)
+
+            self.assertAlmostEqual(geometry.offset, 144 * width / 1440.0, delta=1)
+            self.assert_samples_blocks(img, geometry)
+
+    def test_calibrate_blank(self):
+        img = numpy.zeros((1280, 720, 3), dtype=numpy.uint8)
+        img[:, :] = BACKGROUND_BGR
+        self.assertRaises(CalibrationException, calibrate, img)
+
+    def test_calibrate_single_block(self):
+        img = numpy.zeros((1280, 720, 3), dtype=numpy.uint8)
+        img[:, :] = BACKGROUND_BGR
+        img[1100:1160, 30:90] = (0, 0, 255)
+        self.assertRaises(CalibrationException, calibrate, img)
+
+    def test_calibrate_synthetic(self):
+        geometry = calibrate(blocks(range(600, 1248, 72), range(36, 720, 72)))
+        self.assertEqual(geometry, GridGeometry(528, 36, 72.0))
+
+    def test_calibrate_implausible_pitch(self):
+        img = blocks(range(1000, 1240, 24), range(20, 260, 24), radius=8)
+        self.assertRaises(CalibrationException, calibrate, img)
+
+    def test_calibrate_uneven(self):
+        img = blocks([1000, 1072, 1180], range(36, 720, 72))
+        self.assertRaises(CalibrationException, calibrate, img)
+
+    def test_calibrate_too_many_rows(self):
+        img = blocks(range(400, 1248, 72), range(36, 720, 72))
+        self.assertRaises(CalibrationException, calibrate, img)
+
+    def test_calibrate_outside(self):
+        # Anchored at the bottom row, the top rows of the board would be above the screenshot
+        img = blocks([100, 172], range(36, 720, 72))
+        self.assertRaises(CalibrationException, calibrate, img)
+
+
+class TestGeometryProfiles(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'profiles.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_geometry_known(self):
+        geometry = GridGeometry(625, 70, 142)
+        profiles = GeometryProfiles(profiles={(2560, 1440): geometry})
+
+        self.assertEqual(profiles.geometry(load_fixture('3-colors.png')), geometry)
+        self.assertEqual(profiles.calibrations, 0)
+
+    def test_geometry_calibrates_once(self):
+        profiles = GeometryProfiles()
+        img = load_fixture('3-colors.png', (720, 1280))
+
+        geometry = profiles.geometry(img)
+        self.assertEqual(geometry, calibrate(img))
+        self.assertEqual(profiles.geometry(img), geometry)
+        self.assertEqual(profiles.lookup(1280, 720), geometry)
+        self.assertEqual(profiles.calibrations, 1)
+
+    def test_geometry_recalibrate(self):
+        img = load_fixture('3-colors.png', (720, 1280))
+        stale = GridGeometry(300, 30, 70.0)
+        GeometryProfiles(self.path).store(1280, 720, stale)
+
+        profiles = GeometryProfiles(self.path, recalibrate=True)
+        self.assertIsNone(profiles.lookup(1280, 720))
+        geometry = profiles.geometry(img)
+
+        self.assertEqual(geometry, calibrate(img))
+        self.assertEqual(profiles.geometry(img), geometry)
+        self.assertEqual(profiles.calibrations, 1)
+        self.assertEqual(GeometryProfiles(self.path).lookup(1280, 720), geometry)
+
+    def test_geometry_invalid_kept(self):
+        geometry = GridGeometry(300, 30, 70.0)
+        profiles = GeometryProfiles(profiles={(1280, 720): geometry}, recalibrate=True)
+        img = blocks([100, 172], range(36, 720, 72))
+
+        self.assertRaises(CalibrationException, profiles.geometry, img)
+        self.assertEqual(profiles.profiles[(1280, 720)], geometry)
+
+    def test_lookup_missing(self):
+        self.assertIsNone(GeometryProfiles().lookup(1280, 720))
+
+    def test_persist(self):
+        profiles = GeometryProfiles(self.path)
+        profiles.store(1280, 720, GridGeometry(312, 35, 72.0))
+        self.assertEqual(os.listdir(self.directory), ['profiles.json'])
+
+        with open(self.path) as profiles_file:
+            self.assertEqual(json.load(profiles_file), {
+                '720x1280': {'start_i': 312, 'start_j': 35, 'offset': 72.0, 'size': 10},
+            })
+
+        loaded = GeometryProfiles(self.path, {(2560, 1440): GridGeometry(625, 70, 142)})
+        self.assertEqual(loaded.lookup(1280, 720), GridGeometry(312, 35, 72.0))
+        self.assertEqual(loaded.lookup(2560, 1440), GridGeometry(625, 70, 142))
+
+    def test_persist_failure(self):
+        profiles = GeometryProfiles(self.path)
+        with mock.patch.object(os, 'rename', side_effect=OSError):
+            self.assertRaises(OSError, profiles.store, 1280, 720, GridGeometry(312, 35, 72.0))
+
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_persist_overrides_defaults(self):
+        GeometryProfiles(self.path).store(2560, 1440, GridGeometry(621, 72, 144.0))
+
+        loaded = GeometryProfiles(self.path, {(2560, 1440): GridGeometry(625, 70, 142)})
+        self.assertEqual(loaded.lookup(2560, 1440), GridGeometry(621, 72, 144.0))
+
+    def test_repr(self):
+        profiles = GeometryProfiles(profiles={(2560, 1440): GridGeometry(625, 70, 142)})
+        self.assertEqual(repr(profiles), 'GeometryProfiles(size=1, calibrations=0)')
+        self.assertEqual(str(profiles), repr(profiles))
@@ -0,0 +1,149 @@
+import unittest
+
+import ordering
+from bitboard import BitBoard
+from board import Board
+from color import Color
+from color import EmptyColor
+from coordinate import Coordinate
+from ordering import ClearsColorOrdering
+from ordering import CombinedOrdering
+from ordering import FewestSingletonsOrdering
+from ordering import LargestPoolOrdering
+from ordering import MergesPoolsOrdering
+from ordering import MoveOrdering
+from ordering import RandomOrdering
+from test.fixtures.three_color_board import three_color_board
+
+one = Color('one')
+two = Color('two')
+three = Color('three')
+empty = EmptyColor()
+
+# Pools in row-major order: two ones at (0, 0), all three twos at (0, 1), two threes at (1, 2),
+# two threes at (2, 0), and two ones at (3, 1).
+board = Board.from_grid([
+    [one, two, empty],
+    [one, two, three],
+    [three, two, three],
+    [three, one, one],
+])
+
+
+def move_coords(moves):
+    return [move.coord for move in moves]
+
+
+class TestMoveOrdering(unittest.TestCase):
+    def test_score(self):
+        self.assertRaises(NotImplementedError, MoveOrdering().score, board, None)
+
+    def test_order_preserves_ties(self):
+        class ConstantOrdering(MoveOrdering):
+            def score(self, board, move):
+                return 0
+
+        moves = list(board.iter_moves())
+        self.assertEqual(ConstantOrdering().order(board, moves), moves)
+
+    def test_order_by_pool_is_lazy(self):
+        moves = LargestPoolOrdering().order(board, board.iter_moves())
+
+        self.assertTrue(all(move._result is None for move in moves))
+
+
+class TestLargestPoolOrdering(unittest.TestCase):
+    def test_order(self):
+        self.assertEqual(
+            move_coords(LargestPoolOrdering().order(board, board.iter_moves())),
+            [Coordinate(0, 1), Coordinate(0, 0), Coordinate(1, 2), Coordinate(2, 0),
+             Coordinate(3, 1)],
+        )
+
+    def test_order_bitboard(self):
+        instance = BitBoard.from_board(board)
+
+        self.assertEqual(
+            move_coords(LargestPoolOrdering().order(instance, instance.iter_moves())),
+            move_coords(LargestPoolOrdering().order(board, board.iter_moves())),
+        )
+
+
+class TestClearsColorOrdering(unittest.TestCase):
+    def test_order(self):
+        # Only the twos are cleared entirely by a single pop
+        self.assertEqual(
+            move_coords(ClearsColorOrdering().order(board, board.iter_moves()))[0],
+            Coordinate(0, 1),
+        )
+
+
+class TestMergesPoolsOrdering(unittest.TestCase):
+    def test_order(self):
+        # Popping the threes in the first column drops the ones above them next to the ones in the
+        # bottom row
+        self.assertEqual(
+            move_coords(MergesPoolsOrdering().order(board, board.iter_moves()))[0],
+            Coordinate(2, 0),
+        )
+
+
+class TestFewestSingletonsOrdering(unittest.TestCase):
+    def test_order(self):
+        moves = FewestSingletonsOrdering().order(board, board.iter_moves())
+        singletons = [
+            sum(1 for pool in move.result().pools() if pool.size == 1)
+            for move in moves
+        ]
+
+        self.assertEqual(singletons, sorted(singletons))
+
+
+class TestRandomOrdering(unittest.TestCase):
+    def test_order_seeded(self):
+        moves = list(three_color_board.iter_moves())
+
+        self.assertEqual(
+            move_coords(RandomOrdering(7).order(three_color_board, moves)),
+            move_coords(RandomOrdering(7).order(three_color_board, moves)),
+        )
+
+    def test_order_varies(self):
+        moves = list(three_color_board.iter_moves())
+        orders = set(
+            tuple(move_coords(RandomOrdering(seed).order(three_color_board, moves)))
+            for seed in range(8)
+        )
+
+        self.assertGreater(len(orders), 1)
+
+
+class TestCombinedOrdering(unittest.TestCase):
+    def test_init(self):
+        instance = CombinedOrdering([ClearsColorOrdering(), LargestPoolOrdering()])
+
+        self.assertEqual(instance.name, 'clears_color+largest_pool')
+
+    def test_score(self):
+        instance = CombinedOrdering([ClearsColorOrdering(), LargestPoolOrdering()])
+        move = next(board.iter_moves())
+
+        self.assertEqual(instance.score(board, move), (False, 2))
+
+
+class TestGetOrdering(unittest.TestCase):
+    def test_get_ordering(self):
+        self.assertIsInstance(ordering.get_ordering('largest_pool'), LargestPoolOrdering)
+        self.assertIsInstance(
+            ordering.get_ordering('merges_pools+fewest_singletons'),
+            CombinedOrdering,
+        )
+
+    def test_get_ordering_unknown(self):
+        self.assertRaises(ValueError, ordering.get_ordering, 'largest_pool+nonexistent')
+
+    def test_all_orderings_keep_moves(self):
+        moves = list(three_color_board.iter_moves())
+        for name in ordering.ORDERINGS:
+            ordered = ordering.get_ordering(name).order(three_color_board, moves)
+            self.assertEqual(sorted(move_coords(ordered)), sorted(move_coords(moves)))
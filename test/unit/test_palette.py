@@ -0,0 +1,77 @@
+import unittest
+
+import numpy
+
+from color import Color
+from color import EmptyColor
+from palette import ColorClassifier
+from palette import EMPTY_COLOR_CODE
+from palette import GAME_COLOR_CODES
+from palette import UNMATCHED
+from palette import parse_color_code
+
+
+def pixels(*codes):
+    return numpy.array([[parse_color_code(code) for code in codes]], dtype=numpy.uint8)
+
+
+class TestColorClassifier(unittest.TestCase):
+    def test_parse_color_code(self):
+        self.assertEqual(parse_color_code('e4eff7'), (0xe4, 0xef, 0xf7))
+
+    def test_classify_exact(self):
+        classifier = ColorClassifier()
+        indices = classifier.classify(pixels(EMPTY_COLOR_CODE, *GAME_COLOR_CODES))
+
+        self.assertEqual(indices.tolist(), [range(len(GAME_COLOR_CODES) + 1)])
+        self.assertEqual(classifier.colors[0], EmptyColor())
+        self.assertEqual(
+            [classifier.colors[idx] for idx in indices[0, 1:]],
+            [Color(code) for code in GAME_COLOR_CODES],
+        )
+
+    def test_classify_noisy(self):
+        classifier = ColorClassifier()
+        exact = pixels(EMPTY_COLOR_CODE, *GAME_COLOR_CODES)
+        noise = numpy.random.RandomState(0).randint(-12, 13, (50,) + exact.shape[1:])
+        noisy = numpy.clip(exact.astype(int) + noise, 0, 255).astype(numpy.uint8)
+
+        self.assertTrue((classifier.classify(noisy) == classifier.classify(exact)).all())
+
+    def test_classify_gamma(self):
+        classifier = ColorClassifier()
+        exact = pixels(EMPTY_COLOR_CODE, *GAME_COLOR_CODES)
+        for gamma in [0.9, 1.1]:
+            shifted = numpy.rint(255 * (exact / 255.0) ** gamma).astype(numpy.uint8)
+            self.assertTrue((classifier.classify(shifted) == classifier.classify(exact)).all())
+
+    def test_classify_unmatched(self):
+        classifier = ColorClassifier()
+        self.assertEqual(
+            classifier.classify(pixels('000000', 'ff00ff')).tolist(),
+            [[UNMATCHED, UNMATCHED]],
+        )
+
+    def test_classify_tolerance(self):
+        classifier = ColorClassifier(color_codes=('808080',), tolerance=10)
+        self.assertEqual(
+            classifier.classify(pixels('808080', '848484', 'a0a0a0')).tolist(),
+            [[1, 1, UNMATCHED]],
+        )
+
+    def test_sample(self):
+        rows = numpy.zeros((2, 10, 3), dtype=numpy.uint8)
+        rows[:, 3] = 90
+        rows[:, 4] = 30
+        columns = numpy.array([0, 4])
+
+        self.assertEqual(ColorClassifier().sample(rows, columns)[:, :, 0].tolist(), [[0, 30]] * 2)
+        self.assertEqual(
+            ColorClassifier(patch_radius=1).sample(rows, columns)[:, :, 0].tolist(),
+            [[0, 40]] * 2,
+        )
+
+    def test_repr(self):
+        classifier = ColorClassifier()
+        self.assertEqual(repr(classifier), 'ColorClassifier(colors=6, tolerance=40)')
+        self.assertEqual(str(classifier), repr(classifier))
@@ -0,0 +1,269 @@
+import multiprocessing
+import os
+import signal
+import sys
+import threading
+import time
+import unittest
+from contextlib import contextmanager
+
+import mock
+
+import parallel
+from board import Board
+from color import Color
+from coordinate import Coordinate
+from ordering import LargestPoolOrdering
+from parallel import SearchFrame
+from parallel import SolveHandle
+from parallel import SolveTimeoutException
+from parallel import WorkerFailedException
+from prune import Pruner
+from solution import EmptySolution
+from solution import Solution
+from transposition import SharedTranspositionTable
+from transposition import TranspositionTable
+from test.fixtures.three_color_board import three_color_board
+
+unsolvable_board = Board.from_grid([
+    [Color('one'), Color('two')],
+    [Color('one'), Color('two')],
+    [Color('two'), Color('one')],
+])
+
+
+def search_task(board, stop=None, idle=0, tasks=None, outstanding=None, table=None):
+    return parallel.search_task(
+        tuple([]),
+        board,
+        tasks or mock.MagicMock(),
+        stop or multiprocessing.Event(),
+        outstanding or multiprocessing.Value('i', 1),
+        multiprocessing.Value('i', idle),
+        table if table is not None else TranspositionTable(),
+        Pruner(),
+    )
+
+
+def stalled_worker(tasks, results, stop, outstanding, idle, table, ordering, budget):
+    # Search indefinitely, only stopping when asked to. The stop event is polled rather than waited
+    # on, since setting it blocks until every waiter wakes up, which a killed worker never does
+    while not stop.is_set():
+        time.sleep(0.01)
+
+
+@contextmanager
+def suppress_stderr():
+    with open(os.devnull, 'w') as devnull:
+        old_stderr = sys.stderr
+        sys.stderr = devnull
+        try:
+            yield
+        finally:
+            sys.stderr = old_stderr
+
+
+def failing_search_task(*args):
+    raise ValueError('search failed')
+
+
+class TestSearchFrame(unittest.TestCase):
+    def test_init(self):
+        frame = SearchFrame((Coordinate(0, 0),), three_color_board)
+
+        self.assertEqual(frame.steps, (Coordinate(0, 0),))
+        self.assertEqual(
+            [move.coord for move in frame.moves],
+            [coord for coord, _ in three_color_board.available_moves()],
+        )
+        self.assertFalse(frame.split)
+
+    def test_init_ordering(self):
+        ordering = mock.MagicMock()
+        ordering.order.side_effect = lambda board, moves: list(reversed(moves))
+        frame = SearchFrame(tuple([]), three_color_board, ordering)
+
+        self.assertEqual(
+            [move.coord for move in frame.moves],
+            list(reversed([coord for coord, _ in three_color_board.available_moves()])),
+        )
+        self.assertEqual(ordering.order.call_count, 1)
+
+
+class TestSplitStack(unittest.TestCase):
+    def test_split_stack(self):
+        child_step, child_board = three_color_board.available_moves()[0]
+        stack = [SearchFrame(tuple([]), three_color_board), SearchFrame((child_step,), child_board)]
+        num_moves = len(stack[0].moves)
+        tasks = mock.MagicMock()
+        outstanding = multiprocessing.Value('i', 1)
+
+        num_donated = parallel.split_stack(stack, tasks, outstanding)
+
+        self.assertEqual(num_donated, num_moves // 2)
+        self.assertEqual(len(stack[0].moves), num_moves - num_donated)
+        self.assertEqual(tasks.put.call_count, num_donated)
+        self.assertEqual(outstanding.value, 1 + num_donated)
+        self.assertTrue(stack[0].split)
+        self.assertFalse(stack[1].split)
+
+    def test_split_stack_skips_exhausted_frames(self):
+        stack = [SearchFrame(tuple([]), three_color_board)]
+        stack[0].moves = stack[0].moves[:1]
+        tasks = mock.MagicMock()
+
+        self.assertEqual(parallel.split_stack(stack, tasks, multiprocessing.Value('i', 1)), 1)
+        self.assertEqual(parallel.split_stack(stack, tasks, multiprocessing.Value('i', 1)), 0)
+
+
+class TestSearchTask(unittest.TestCase):
+    def test_search_task_solved(self):
+        self.assertEqual(search_task(Board.from_grid([])), Solution(tuple([])))
+
+    def test_search_task_valid(self):
+        solution = search_task(three_color_board)
+        board = three_color_board
+        for step in solution.get_steps():
+            board = board.pop_from(step)
+
+        self.assertTrue(board.is_solved())
+
+    def test_search_task_unsolvable(self):
+        table = TranspositionTable()
+
+        self.assertIsNone(search_task(unsolvable_board, table=table))
+        self.assertGreater(len(table), 0)
+
+    def test_search_task_cancelled(self):
+        stop = multiprocessing.Event()
+        stop.set()
+
+        with mock.patch.object(parallel, 'SPLIT_CHECK_INTERVAL', 1):
+            self.assertIsNone(search_task(three_color_board, stop=stop))
+
+    def test_search_task_splits_for_idle_workers(self):
+        tasks = mock.MagicMock()
+        outstanding = multiprocessing.Value('i', 1)
+
+        with mock.patch.object(parallel, 'SPLIT_CHECK_INTERVAL', 1):
+            search_task(three_color_board, idle=1, tasks=tasks, outstanding=outstanding)
+
+        self.assertGreater(tasks.put.call_count, 0)
+        self.assertEqual(outstanding.value, 1 + tasks.put.call_count)
+
+
+class TestWorker(unittest.TestCase):
+    def run_worker(self, board, table=None):
+        tasks = multiprocessing.Queue()
+        results = multiprocessing.Queue()
+        tasks.put((tuple([]), board))
+        tasks.put(None)
+
+        parallel.worker(
+            tasks,
+            results,
+            multiprocessing.Event(),
+            multiprocessing.Value('i', 1),
+            multiprocessing.Value('i', 0),
+            table,
+        )
+
+        return results.get(timeout=5)
+
+    def test_worker_valid(self):
+        self.assertFalse(self.run_worker(three_color_board).is_empty())
+
+    def test_worker_unsolvable(self):
+        self.assertEqual(self.run_worker(unsolvable_board), EmptySolution())
+
+    def test_worker_failure(self):
+        tasks = multiprocessing.Queue()
+        results = multiprocessing.Queue()
+        tasks.put((tuple([]), three_color_board))
+
+        with mock.patch.object(parallel, 'search_task', failing_search_task):
+            self.assertRaises(
+                ValueError,
+                parallel.worker,
+                tasks,
+                results,
+                multiprocessing.Event(),
+                multiprocessing.Value('i', 1),
+                multiprocessing.Value('i', 0),
+            )
+
+        # The failure is reported, so that the solve does not wait on the worker forever
+        failure = results.get(timeout=5)
+        self.assertIsInstance(failure, WorkerFailedException)
+        self.assertIn('search failed', str(failure))
+
+    def test_worker_shared_table(self):
+        table = SharedTranspositionTable(num_slots=64)
+
+        self.assertEqual(self.run_worker(unsolvable_board, table), EmptySolution())
+        self.assertGreater(len(table), 0)
+
+
+class TestSolveHandle(unittest.TestCase):
+    def test_result_valid(self):
+        handle = SolveHandle(three_color_board, num_processes=2)
+        solution = handle.result()
+
+        self.assertFalse(solution.is_empty())
+        self.assertTrue(handle.done())
+        self.assertIs(handle.result(), solution)
+        self.assertTrue(all(p.exitcode is not None for p in handle.processes))
+
+    def test_result_ordering(self):
+        handle = SolveHandle(three_color_board, num_processes=2, ordering=LargestPoolOrdering())
+
+        self.assertFalse(handle.result().is_empty())
+
+    def test_result_unsolvable(self):
+        handle = SolveHandle(unsolvable_board, num_processes=2)
+
+        self.assertEqual(handle.result(), EmptySolution())
+        # Dead states found by the workers are visible from the parent process
+        self.assertGreater(len(handle.table), 0)
+        self.assertTrue(all(p.exitcode is not None for p in handle.processes))
+
+    def test_result_timeout(self):
+        with mock.patch.object(parallel, 'worker', stalled_worker):
+            handle = SolveHandle(three_color_board, num_processes=2)
+
+        self.assertRaises(SolveTimeoutException, handle.result, 0.01)
+        self.assertFalse(handle.done())
+
+        handle.cancel()
+        self.assertTrue(handle.done())
+        self.assertTrue(all(p.exitcode is not None for p in handle.processes))
+
+    def test_result_worker_failed(self):
+        with mock.patch.object(parallel, 'search_task', failing_search_task), \
+                suppress_stderr():
+            handle = SolveHandle(three_color_board, num_processes=2)
+            self.assertRaises(WorkerFailedException, handle.result)
+
+        self.assertRaises(WorkerFailedException, handle.result)
+        self.assertTrue(all(p.exitcode is not None for p in handle.processes))
+
+    def test_result_worker_killed(self):
+        with mock.patch.object(parallel, 'worker', stalled_worker):
+            handle = SolveHandle(three_color_board, num_processes=1)
+
+        os.kill(handle.processes[0].pid, signal.SIGKILL)
+
+        self.assertRaises(WorkerFailedException, handle.result, 5)
+        self.assertTrue(all(p.exitcode is not None for p in handle.processes))
+
+    def test_cancel_wakes_result(self):
+        with mock.patch.object(parallel, 'worker', stalled_worker):
+            handle = SolveHandle(three_color_board, num_processes=2)
+
+        canceller = threading.Timer(0.05, handle.cancel)
+        canceller.start()
+
+        self.assertEqual(handle.result(), EmptySolution())
+        self.assertTrue(handle.cancelled)
+        canceller.join()
+        self.assertTrue(all(p.exitcode is not None for p in handle.processes))
@@ -0,0 +1,169 @@
+import os
+import signal
+import unittest
+
+import mock
+
+import portfolio
+from board import Board
+from color import Color
+from parallel import SolveTimeoutException
+from portfolio import BeamStrategy
+from portfolio import DFSStrategy
+from portfolio import PortfolioResult
+from portfolio import RestartStrategy
+from portfolio import Strategy
+from solution import EmptySolution
+from solution import Solution
+from test.fixtures.three_color_board import three_color_board
+
+unsolvable_board = Board.from_grid([
+    [Color('one'), Color('two')],
+    [Color('one'), Color('two')],
+    [Color('two'), Color('one')],
+])
+
+
+class FixedStrategy(Strategy):
+    def __init__(self, name, solution, complete=True):
+        self.name = name
+        self.solution = solution
+        self.complete = complete
+
+    def search(self, board):
+        return self.solution
+
+
+class StalledStrategy(Strategy):
+    name = 'stalled'
+
+    def search(self, board):
+        # Search indefinitely, only stopping when terminated
+        while True:
+            pass
+
+
+class FailingStrategy(Strategy):
+    name = 'failing'
+
+    def search(self, board):
+        raise ValueError
+
+
+class KilledStrategy(Strategy):
+    name = 'killed'
+
+    def search(self, board):
+        # Die without reporting, as if killed by the OOM killer
+        os.kill(os.getpid(), signal.SIGKILL)
+
+
+def is_valid(board, solution):
+    for step in solution.get_steps():
+        board = board.pop_from(step)
+
+    return board.is_solved()
+
+
+class TestStrategy(unittest.TestCase):
+    def test_search(self):
+        self.assertRaises(NotImplementedError, Strategy().search, three_color_board)
+
+    def test_names(self):
+        self.assertEqual(DFSStrategy().name, 'dfs')
+        self.assertEqual(DFSStrategy('largest_pool').name, 'dfs:largest_pool')
+        self.assertEqual(RestartStrategy(3).name, 'restart:3')
+        self.assertEqual(BeamStrategy(8).name, 'beam:8')
+        self.assertFalse(BeamStrategy(8).complete)
+
+    def test_search_valid(self):
+        for strategy in [DFSStrategy(), DFSStrategy('largest_pool'), RestartStrategy(0),
+                         BeamStrategy(8)]:
+            self.assertTrue(is_valid(three_color_board, strategy.search(three_color_board)))
+
+    def test_repr(self):
+        self.assertEqual(repr(DFSStrategy()), 'Strategy(dfs)')
+        self.assertEqual(str(DFSStrategy()), repr(DFSStrategy()))
+
+
+class TestPortfolio(unittest.TestCase):
+    def test_default_strategies(self):
+        strategies = portfolio.default_strategies(6)
+
+        self.assertEqual(
+            [strategy.name for strategy in strategies],
+            ['dfs', 'dfs:' + portfolio.DEFAULT_PORTFOLIO_ORDERING, 'beam:128', 'restart:0',
+             'restart:1', 'restart:2'],
+        )
+        self.assertEqual(len(portfolio.default_strategies(1)), 4)
+
+    def test_portfolio_worker_failure(self):
+        results = mock.MagicMock()
+
+        self.assertRaises(
+            ValueError,
+            portfolio.portfolio_worker,
+            FailingStrategy(),
+            three_color_board,
+            results,
+        )
+        results.put.assert_called_once_with(('failing', None))
+
+    def test_portfolio_solve_valid(self):
+        result = portfolio.portfolio_solve(three_color_board)
+
+        self.assertIsInstance(result, PortfolioResult)
+        names = [strategy.name for strategy in portfolio.default_strategies()]
+        self.assertIn(result.strategy, names)
+        self.assertTrue(is_valid(three_color_board, result.solution))
+
+    def test_portfolio_solve_first_solution(self):
+        solution = Solution(tuple([]))
+        result = portfolio.portfolio_solve(
+            three_color_board,
+            [StalledStrategy(), FixedStrategy('fixed', solution)],
+        )
+
+        self.assertEqual((result.strategy, result.solution), ('fixed', solution))
+
+    def test_portfolio_solve_unsolvable(self):
+        result = portfolio.portfolio_solve(unsolvable_board, [StalledStrategy(), DFSStrategy()])
+
+        self.assertEqual(result.strategy, 'dfs')
+        self.assertTrue(result.solution.is_empty())
+
+    def test_portfolio_solve_incomplete(self):
+        # An incomplete strategy failing to find a solution does not decide the race
+        result = portfolio.portfolio_solve(three_color_board, [
+            FixedStrategy('incomplete', EmptySolution(), complete=False),
+            FailingStrategy(),
+        ])
+
+        self.assertIsNone(result.strategy)
+        self.assertTrue(result.solution.is_empty())
+
+    def test_portfolio_solve_killed(self):
+        result = portfolio.portfolio_solve(three_color_board, [
+            KilledStrategy(),
+            FixedStrategy('incomplete', EmptySolution(), complete=False),
+        ])
+
+        self.assertIsNone(result.strategy)
+        self.assertTrue(result.solution.is_empty())
+
+    def test_portfolio_solve_timeout(self):
+        self.assertRaises(
+            SolveTimeoutException,
+            portfolio.portfolio_solve,
+            three_color_board,
+            [StalledStrategy()],
+            0.1,
+        )
+
+    def test_repr(self):
+        result = PortfolioResult('dfs', EmptySolution(), 1.5)
+
+        self.assertEqual(repr(result), 'PortfolioResult(dfs, {solution}, elapsed=1.500)'.format(
+            solution=EmptySolution(),
+        ))
+        self.assertEqual(str(result), repr(result))
@@ -0,0 +1,66 @@
+import unittest
+
+from bitboard import BitBoard
+from board import Board
+from color import Color
+from color import EmptyColor
+from prune import Pruner
+from prune import PruningRule
+from prune import SingletonColorRule
+from test.fixtures.three_color_board import three_color_board
+
+one = Color('one')
+two = Color('two')
+empty = EmptyColor()
+
+singleton_board = Board.from_grid([
+    [one, two],
+    [one, one],
+])
+no_moves_board = Board.from_grid([
+    [one, two],
+    [two, one],
+])
+
+
+class TestPruningRule(unittest.TestCase):
+    def test_is_dead(self):
+        self.assertRaises(NotImplementedError, PruningRule().is_dead, three_color_board)
+
+
+class TestSingletonColorRule(unittest.TestCase):
+    def test_is_dead(self):
+        rule = SingletonColorRule()
+
+        self.assertTrue(rule.is_dead(singleton_board))
+        self.assertTrue(rule.is_dead(BitBoard.from_board(singleton_board)))
+        self.assertFalse(rule.is_dead(no_moves_board))
+        self.assertFalse(rule.is_dead(three_color_board))
+        self.assertFalse(rule.is_dead(Board.from_grid([])))
+
+
+class TestPruner(unittest.TestCase):
+    def test_init(self):
+        pruner = Pruner()
+
+        self.assertEqual([rule.name for rule in pruner.rules], ['singleton_color'])
+        self.assertEqual(pruner.counts, {'singleton_color': 0})
+
+    def test_prune(self):
+        pruner = Pruner()
+
+        self.assertTrue(pruner.prune(singleton_board))
+        self.assertTrue(pruner.prune(singleton_board))
+        self.assertFalse(pruner.prune(no_moves_board))
+        self.assertFalse(pruner.prune(three_color_board))
+        self.assertEqual(pruner.counts, {'singleton_color': 2})
+
+    def test_prune_no_rules(self):
+        self.assertFalse(Pruner([]).prune(singleton_board))
+
+    def test_repr(self):
+        pruner = Pruner()
+        pruner.prune(singleton_board)
+
+        self.assertEqual(repr(pruner), 'Pruner(singleton_color=1)')
+        self.assertEqual(str(pruner), repr(pruner))
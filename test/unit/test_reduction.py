@@ -0,0 +1,140 @@
+import unittest
+
+from bitboard import BitBoard
+from board import Board
+from color import Color
+from reduction import SleepSetReduction
+from test.fixtures.three_color_board import three_color_board
+
+a = Color('a')
+b = Color('b')
+c = Color('c')
+d = Color('d')
+
+# The two a pools and the b pool can be popped in any order: no pop moves a brick of another pool
+independent_board = Board.from_grid([
+    [c, b, c],
+    [a, b, a],
+    [a, d, a],
+])
+
+# Popping the b pool drops the a pool above it, so the two pops do not commute
+dependent_board = Board.from_grid([
+    [a, c],
+    [a, d],
+    [b, c],
+    [b, d],
+])
+
+# The a and b pools are two columns apart, and neither touches the bottom row
+separated_board = Board.from_grid([
+    [a, c, b],
+    [a, d, b],
+    [c, d, c],
+])
+
+
+class TestSleepSetReduction(unittest.TestCase):
+    def test_init(self):
+        self.assertEqual(SleepSetReduction().skipped, 0)
+
+    def test_independent(self):
+        reduction = SleepSetReduction()
+        for board in [independent_board, BitBoard.from_board(independent_board)]:
+            left, middle, right = list(board.iter_moves())
+
+            self.assertTrue(reduction.independent(left, right))
+            self.assertTrue(reduction.independent(left, middle))
+            self.assertTrue(reduction.independent(middle, right))
+
+    def test_dependent(self):
+        reduction = SleepSetReduction()
+        for board in [dependent_board, BitBoard.from_board(dependent_board)]:
+            top, bottom = list(board.iter_moves())
+
+            self.assertFalse(reduction.independent(top, bottom))
+            self.assertFalse(reduction.independent(bottom, top))
+
+    def test_independent_columns(self):
+        reduction = SleepSetReduction()
+        for board in [separated_board, BitBoard.from_board(separated_board)]:
+            moves = {move.pool.color: move for move in board.iter_moves()}
+
+            self.assertTrue(reduction.independent(moves[a], moves[b], board))
+            # Neither pool had to be popped to tell
+            self.assertTrue(all(move._result is None for move in moves.values()))
+            self.assertTrue(reduction.independent(moves[a], moves[d], board))
+            self.assertIsNotNone(moves[d]._result)
+
+        for board in [dependent_board, BitBoard.from_board(dependent_board)]:
+            top, bottom = list(board.iter_moves())
+
+            self.assertFalse(reduction.independent(top, bottom, board))
+            self.assertIsNone(top._result)
+            self.assertIsNone(bottom._result)
+
+    def test_independent_columns_agrees(self):
+        reduction = SleepSetReduction()
+        for board in [independent_board, dependent_board, separated_board, three_color_board]:
+            for instance in [board, BitBoard.from_board(board)]:
+                moves = list(instance.iter_moves())
+                for one in moves:
+                    for two in moves:
+                        if one is not two:
+                            self.assertEqual(
+                                reduction.independent(one, two, instance),
+                                reduction.independent(one, two),
+                            )
+
+    def test_expand(self):
+        reduction = SleepSetReduction()
+        moves = list(independent_board.iter_moves())
+        expansions = list(reduction.expand(independent_board, moves, tuple([])))
+
+        self.assertEqual([move for move, _ in expansions], moves)
+        self.assertEqual(
+            [sleep for _, sleep in expansions],
+            [tuple([]), (moves[0].pool,), (moves[0].pool, moves[1].pool)],
+        )
+        self.assertEqual(reduction.skipped, 0)
+
+    def test_expand_sleep(self):
+        reduction = SleepSetReduction()
+        moves = list(independent_board.iter_moves())
+        expansions = list(reduction.expand(independent_board, moves, (moves[0].pool,)))
+
+        self.assertEqual([move for move, _ in expansions], moves[1:])
+        # The sleeping move stays asleep beneath every move it is independent of
+        self.assertEqual(
+            [sleep for _, sleep in expansions],
+            [(moves[0].pool,), (moves[0].pool, moves[1].pool)],
+        )
+        self.assertEqual(reduction.skipped, 1)
+
+    def test_expand_sleep_child(self):
+        reduction = SleepSetReduction()
+        moves = list(independent_board.iter_moves())
+        sleep = list(reduction.expand(independent_board, moves, tuple([])))[1][1]
+        child = moves[1].result()
+
+        # The left a pool was already explored before the middle b pool, so it is not explored
+        # again beneath it
+        expansions = reduction.expand(child, child.iter_moves(), sleep)
+        self.assertEqual([move.coord for move, _ in expansions], [moves[2].coord])
+        self.assertEqual(reduction.skipped, 1)
+
+    def test_expand_dependent(self):
+        reduction = SleepSetReduction()
+        moves = list(dependent_board.iter_moves())
+
+        self.assertEqual(
+            [sleep for _, sleep in reduction.expand(dependent_board, moves, tuple([]))],
+            [tuple([]), tuple([])],
+        )
+
+    def test_repr(self):
+        reduction = SleepSetReduction()
+        reduction.skipped = 3
+
+        self.assertEqual(repr(reduction), 'SleepSetReduction(skipped=3)')
+        self.assertEqual(str(reduction), repr(reduction))
@@ -0,0 +1,131 @@
+import pickle
+import unittest
+
+from bitboard import BitBoard
+from board import Board
+from board import InvalidPopException
+from color import Color
+from color import EmptyColor
+from coordinate import Coordinate
+from region import RegionGraph
+from test.fixtures.three_color_board import three_color_board
+
+defined_color = Color('COLOR')
+other_color = Color('OTHER')
+empty_color = EmptyColor()
+
+
+def edge_masks(graph):
+    return {
+        region.mask: set(other.mask for other in graph.neighbors(region))
+        for region in graph.pools()
+    }
+
+
+class TestRegionGraph(unittest.TestCase):
+    def test_from_board(self):
+        instance = RegionGraph.from_board(Board.from_grid([
+            [defined_color, other_color],
+            [defined_color, other_color],
+            [other_color, defined_color],
+        ]))
+
+        self.assertEqual(
+            [(region.coord, region.color, region.size) for region in instance.pools()],
+            [
+                (Coordinate(0, 0), defined_color, 2),
+                (Coordinate(0, 1), other_color, 2),
+                (Coordinate(2, 0), other_color, 1),
+                (Coordinate(2, 1), defined_color, 1),
+            ],
+        )
+        self.assertEqual(instance.key(), BitBoard.from_board(instance.to_board()).key())
+
+    def test_from_bitboard(self):
+        bitboard = BitBoard.from_board(three_color_board)
+
+        self.assertIs(RegionGraph.from_board(bitboard).bitboard, bitboard)
+
+    def test_neighbors(self):
+        instance = RegionGraph.from_board(Board.from_grid([
+            [defined_color, other_color],
+            [defined_color, other_color],
+            [other_color, defined_color],
+        ]))
+        top_left, top_right, bottom_left, bottom_right = instance.pools()
+
+        self.assertEqual(instance.neighbors(top_left), set([top_right, bottom_left]))
+        self.assertEqual(instance.neighbors(top_right), set([top_left, bottom_right]))
+        self.assertEqual(instance.neighbors(bottom_left), set([top_left, bottom_right]))
+        self.assertIs(instance.edges(), instance.edges())
+
+    def test_is_solved(self):
+        self.assertTrue(RegionGraph.from_board(Board.from_grid([])).is_solved())
+        self.assertFalse(RegionGraph.from_board(three_color_board).is_solved())
+
+    def test_iter_moves(self):
+        instance = RegionGraph.from_board(three_color_board)
+
+        self.assertEqual(
+            [(move.coord, move.result().to_board()) for move in instance.iter_moves()],
+            three_color_board.available_moves(),
+        )
+
+    def test_pop_lazy(self):
+        instance = RegionGraph.from_board(three_color_board)
+        new_graph = instance.available_moves()[0][1]
+
+        self.assertIsNone(new_graph._regions)
+        self.assertFalse(new_graph.is_solved())
+        self.assertIsNone(new_graph._regions)
+        self.assertEqual(
+            [(region.coord, region.mask) for region in new_graph.pools()],
+            [(pool.coord, pool.mask) for pool in new_graph.bitboard.pools()],
+        )
+        self.assertIsNone(new_graph._origin)
+
+    def test_pop_carries_regions(self):
+        instance = RegionGraph.from_board(three_color_board)
+        # Popping the bottom right pool leaves every region in the first column in place
+        new_graph = instance.pop_from(Coordinate(9, 9))
+
+        self.assertIn(instance.pools()[0], new_graph.pools())
+
+    def test_pop_edges(self):
+        instance = RegionGraph.from_board(three_color_board)
+        instance.edges()
+
+        for _, new_graph in instance.available_moves():
+            new_graph.pools()
+            self.assertIsNotNone(new_graph._edges)
+            self.assertEqual(
+                edge_masks(new_graph),
+                edge_masks(RegionGraph.from_board(new_graph.bitboard)),
+            )
+
+    def test_pop_from(self):
+        instance = RegionGraph.from_board(three_color_board)
+
+        self.assertEqual(
+            instance.pop_from(Coordinate(0, 0)).to_board(),
+            three_color_board.pop_from(Coordinate(0, 0)),
+        )
+        self.assertRaises(InvalidPopException, instance.pop_from, Coordinate(0, 2))
+
+    def test_pickle(self):
+        new_graph = RegionGraph.from_board(three_color_board).available_moves()[0][1]
+        unpickled = pickle.loads(pickle.dumps(new_graph))
+
+        self.assertIsNone(unpickled._origin)
+        self.assertEqual(unpickled, new_graph)
+        self.assertEqual(len(unpickled.pools()), len(new_graph.pools()))
+
+    def test_repr(self):
+        self.assertEqual(repr(RegionGraph.from_board(three_color_board)), repr(three_color_board))
+
+    def test_eq(self):
+        instance = RegionGraph.from_board(three_color_board)
+
+        self.assertEqual(instance, RegionGraph.from_board(three_color_board))
+        self.assertNotEqual(instance, instance.pop_from(Coordinate(0, 0)))
+        self.assertEqual(len(set([instance, RegionGraph.from_board(three_color_board)])), 1)
@@ -0,0 +1,86 @@
+import itertools
+import time
+import unittest
+
+import restart
+from board import Board
+from budget import BudgetExhaustedException
+from color import Color
+from solution import EmptySolution
+from transposition import TranspositionTable
+from test.fixtures.three_color_board import three_color_board
+
+one = Color('one')
+two = Color('two')
+
+unsolvable_board = Board.from_grid([
+    [one, two],
+    [one, two],
+    [two, one],
+])
+
+
+def is_valid(board, solution):
+    for step in solution.get_steps():
+        board = board.pop_from(step)
+
+    return board.is_solved()
+
+
+class TestRestart(unittest.TestCase):
+    def test_luby(self):
+        self.assertEqual(
+            [restart.luby(index) for index in range(1, 16)],
+            [1, 1, 2, 1, 1, 2, 4, 1, 1, 2, 1, 1, 2, 4, 8],
+        )
+
+    def test_luby_schedule(self):
+        self.assertEqual(
+            list(itertools.islice(restart.luby_schedule(10), 7)),
+            [10, 10, 20, 10, 10, 20, 40],
+        )
+
+    def test_geometric_schedule(self):
+        self.assertEqual(
+            list(itertools.islice(restart.geometric_schedule(10, 1.5), 4)),
+            [10, 15, 22, 33],
+        )
+
+    def test_restart_solve_valid(self):
+        solution = restart.restart_solve(three_color_board, schedule=restart.luby_schedule(1))
+
+        self.assertTrue(is_valid(three_color_board, solution))
+
+    def test_restart_solve_seeded(self):
+        self.assertEqual(
+            restart.restart_solve(three_color_board, seed=3).get_steps(),
+            restart.restart_solve(three_color_board, seed=3).get_steps(),
+        )
+
+    def test_restart_solve_unsolvable(self):
+        table = TranspositionTable()
+        solution = restart.restart_solve(
+            unsolvable_board,
+            schedule=restart.luby_schedule(1),
+            table=table,
+        )
+
+        self.assertIsInstance(solution, EmptySolution)
+        self.assertGreater(len(table), 0)
+
+    def test_restart_solve_deadline(self):
+        self.assertRaises(
+            BudgetExhaustedException,
+            restart.restart_solve,
+            three_color_board,
+            schedule=itertools.repeat(0),
+            deadline=time.time() - 1,
+        )
+
+    def test_restart_solve_schedule_exhausted(self):
+        self.assertRaises(
+            BudgetExhaustedException,
+            restart.restart_solve,
+            three_color_board,
+            schedule=[0, 0],
+        )
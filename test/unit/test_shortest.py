@@ -0,0 +1,207 @@
+import random
+import unittest
+
+import mock
+
+import shortest
+from bitboard import BitBoard
+from board import Board
+from budget import Budget
+from budget import BudgetExhaustedException
+from color import Color
+from prune import Pruner
+from solution import EmptySolution
+from solution import Solution
+from transposition import TranspositionTable
+
+colors = [Color('one'), Color('two'), Color('three')]
+
+unsolvable_board = Board.from_grid([
+    [colors[0], colors[1]],
+    [colors[0], colors[1]],
+    [colors[1], colors[0]],
+])
+
+
+def random_board(seed, height=4, width=4):
+    rng = random.Random(seed)
+    return Board.from_grid([[rng.choice(colors) for _ in range(width)] for _ in range(height)])
+
+
+def shortest_length(board):
+    # Breadth-first search over every reachable board, for reference
+    frontier = set([board])
+    length = 0
+    while frontier:
+        if any(frontier_board.is_solved() for frontier_board in frontier):
+            return length
+        frontier = set(
+            new_board
+            for frontier_board in frontier
+            for _, new_board in frontier_board.available_moves()
+        )
+        length += 1
+
+    return None
+
+
+def is_solution_valid(board, solution):
+    for step in solution.get_steps():
+        board = board.pop_from(step)
+
+    return board.is_solved()
+
+
+solvable_boards = [
+    board
+    for board in map(random_board, range(40))
+    if shortest_length(board) is not None
+][:6]
+
+
+class TestShortest(unittest.TestCase):
+    def test_lower_bound(self):
+        self.assertEqual(shortest.lower_bound(Board.from_grid([])), 0)
+        self.assertEqual(shortest.lower_bound(unsolvable_board), 2)
+
+    def test_bounded_search_solved(self):
+        self.assertEqual(
+            shortest.bounded_search(
+                Board.from_grid([]),
+                tuple([]),
+                0,
+                TranspositionTable(),
+                TranspositionTable(),
+                Pruner(),
+            ),
+            (Solution(tuple([])), shortest.UNBOUNDED),
+        )
+
+    def test_bounded_search_limit(self):
+        board = solvable_boards[0]
+        length = shortest_length(board)
+        bounds = TranspositionTable()
+
+        solution, next_limit = shortest.bounded_search(
+            board,
+            tuple([]),
+            length - 1,
+            TranspositionTable(),
+            bounds,
+            Pruner(),
+        )
+
+        self.assertIsNone(solution)
+        self.assertEqual(next_limit, length)
+        self.assertEqual(bounds.get(board.zobrist()), length - 1)
+
+    def test_bounded_search_unsolvable(self):
+        table = TranspositionTable()
+
+        self.assertEqual(
+            shortest.bounded_search(
+                unsolvable_board,
+                tuple([]),
+                10,
+                table,
+                TranspositionTable(),
+                Pruner([]),
+            ),
+            (None, shortest.UNBOUNDED),
+        )
+        self.assertTrue(table.lookup(unsolvable_board))
+
+    def test_shortest_solve_optimal(self):
+        for board in solvable_boards:
+            solution = shortest.shortest_solve(board)
+
+            self.assertTrue(is_solution_valid(board, solution))
+            self.assertEqual(len(solution.get_steps()), shortest_length(board))
+
+    def test_shortest_solve_bitboard(self):
+        board = solvable_boards[0]
+        solution = shortest.shortest_solve(BitBoard.from_board(board))
+
+        self.assertEqual(len(solution.get_steps()), shortest_length(board))
+
+    def test_shortest_solve_step(self):
+        for board in solvable_boards:
+            solution = shortest.shortest_solve(board, step=3)
+
+            self.assertTrue(is_solution_valid(board, solution))
+            self.assertLessEqual(len(solution.get_steps()), shortest_length(board) + 2)
+
+    def test_shortest_solve_unsolvable(self):
+        self.assertEqual(shortest.shortest_solve(unsolvable_board), EmptySolution())
+        self.assertEqual(shortest.shortest_solve(Board.from_grid([])), Solution(tuple([])))
+
+    def test_shortest_solve_bounds_size(self):
+        board = solvable_boards[0]
+        with mock.patch.object(shortest, 'bounded_search', wraps=shortest.bounded_search) as search:
+            solution = shortest.shortest_solve(board, bounds_size=2)
+
+        self.assertEqual(len(solution.get_steps()), shortest_length(board))
+        # Every call of every iteration shares the same bounds
+        bounds = search.call_args_list[0][0][4]
+        self.assertEqual(bounds.max_size, 2)
+        self.assertEqual(len(bounds), 2)
+        self.assertGreater(bounds.evictions, 0)
+
+    def test_shortest_solve_budget(self):
+        self.assertRaises(
+            BudgetExhaustedException,
+            shortest.shortest_solve,
+            solvable_boards[0],
+            budget=Budget(node_budget=1),
+        )
+
+    def test_expand_frontier(self):
+        board = solvable_boards[0]
+        frontier = shortest.expand_frontier(board, 5)
+
+        self.assertGreaterEqual(len(frontier), 5)
+        for steps, frontier_board in frontier:
+            expected = board
+            for step in steps:
+                expected = expected.pop_from(step)
+            self.assertEqual(frontier_board, expected)
+
+    def test_expand_frontier_exhausted(self):
+        # Neither board resulting from the first moves has any moves of its own
+        self.assertEqual(
+            [steps for steps, _ in shortest.expand_frontier(unsolvable_board, 5)],
+            [steps for steps, _ in shortest.expand_frontier(unsolvable_board, 2)],
+        )
+        self.assertEqual(len(shortest.expand_frontier(unsolvable_board, 5)), 2)
+
+    def test_expand_frontier_solved(self):
+        # Some boards two moves deep are solved, while the others could be expanded further
+        board = random_board(92, 3, 4)
+        frontier = shortest.expand_frontier(board, 8)
+
+        self.assertEqual(set(len(steps) for steps, _ in frontier), set([2]))
+        self.assertTrue(any(frontier_board.is_solved() for _, frontier_board in frontier))
+
+    def test_parallel_shortest_solve(self):
+        board = solvable_boards[0]
+        solution = shortest.parallel_shortest_solve(board, num_processes=2)
+
+        self.assertTrue(is_solution_valid(board, solution))
+        self.assertEqual(len(solution.get_steps()), shortest_length(board))
+
+    def test_parallel_shortest_solve_solved_frontier(self):
+        board = random_board(92, 3, 4)
+        solution = shortest.parallel_shortest_solve(board, num_processes=2)
+
+        self.assertTrue(is_solution_valid(board, solution))
+        self.assertEqual(len(solution.get_steps()), shortest_length(board))
+
+    def test_parallel_shortest_solve_unsolvable(self):
+        self.assertEqual(
+            shortest.parallel_shortest_solve(unsolvable_board, num_processes=2),
+            EmptySolution(),
+        )
+        self.assertEqual(
+            shortest.parallel_shortest_solve(Board.from_grid([]), num_processes=2),
+            Solution(tuple([])),
+        )
@@ -3,9 +3,11 @@ import unittest
 from solution import Solution
 from solution import EmptySolution
 from solution import EmptySolutionException
+from solution import ScoredSolution
 
 defined_solution = Solution((1, 2, 3))
 empty_solution = EmptySolution()
+scored_solution = ScoredSolution((1, 2, 3), 25)
 
 
 class TestSolution(unittest.TestCase):
@@ -25,6 +27,20 @@ class TestSolution(unittest.TestCase):
         self.assertEqual(str(defined_solution), 'Solution((1, 2, 3))')
 
 
+class TestScoredSolution(unittest.TestCase):
+    def test_scored_init(self):
+        self.assertEqual(scored_solution.get_steps(), (1, 2, 3))
+        self.assertEqual(scored_solution.score, 25)
+        self.assertFalse(scored_solution.is_empty())
+
+    def test_scored_eq(self):
+        self.assertEqual(scored_solution, defined_solution)
+
+    def test_scored_repr(self):
+        self.assertEqual(repr(scored_solution), 'ScoredSolution((1, 2, 3), 25)')
+        self.assertEqual(str(scored_solution), repr(scored_solution))
+
+
 class TestEmptySolution(unittest.TestCase):
     def test_empty_init(self):
         self.assertIsNotNone(empty_solution)
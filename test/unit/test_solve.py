@@ -1,17 +1,29 @@
 import os
 import subprocess
 import sys
+import tempfile
 import unittest
+from StringIO import StringIO
 from contextlib import contextmanager
 
+import cv2
 import mock
+import numpy
 
 import solve
 from board import Board
 from color import Color
 from coordinate import Coordinate
+from endgame import EndgameSolver
+from geometry import CalibrationException
+from geometry import GeometryProfiles
+from geometry import GridGeometry
+from palette import ColorClassifier
+from prune import Pruner
+from reduction import SleepSetReduction
 from solution import EmptySolution
 from solution import Solution
+from transposition import TranspositionTable
 from test.fixtures.three_color_board import three_color_board
 
 
@@ -26,6 +38,15 @@ def suppress_stdout():
             sys.stdout = old_stdout
 
 
+def raw_screencap(img, header_size=12):
+    height, width = img.shape[:2]
+    header = numpy.zeros(header_size // 4, dtype='<u4')
+    header[:3] = (width, height, 1)
+    rgba = numpy.dstack((img[:, :, ::-1], numpy.full((height, width), 255, dtype=numpy.uint8)))
+
+    return header.tostring() + rgba.tostring()
+
+
 class TestSolve(unittest.TestCase):
     def test_solution_search_solved(self):
         available_moves = [(Coordinate(0, 0), Board.from_grid([]))]
@@ -51,11 +72,246 @@ class TestSolve(unittest.TestCase):
         solve.solution_search(mock_queue, available_moves)
         mock_queue.put.assert_any_call(Solution((Coordinate(0, 0), Coordinate(1, 0))))
 
+    def test_solution_search_records_dead_states(self):
+        grid = [
+            [Color('one'), Color('two')],
+            [Color('one'), Color('two')],
+            [Color('two'), Color('one')],
+        ]
+        board = Board.from_grid(grid)
+        table = TranspositionTable()
+
+        mock_queue = mock.MagicMock()
+        self.assertFalse(solve.solution_search(
+            mock_queue,
+            board.available_moves(),
+            table=table,
+            pruner=Pruner([]),
+        ))
+        mock_queue.put.assert_called_once_with(EmptySolution())
+        self.assertGreater(len(table), 0)
+
+    def test_serial_solve_table(self):
+        table = TranspositionTable()
+        solution = solve.serial_solve(three_color_board, table=table)
+
+        self.assertFalse(solution.is_empty())
+        self.assertGreater(table.misses, 0)
+
+    def test_serial_solve_table_hit(self):
+        board = Board.from_grid([[Color('one'), Color('two')]])
+        table = TranspositionTable()
+        table.store(board)
+
+        self.assertTrue(solve.serial_solve(board, table=table).is_empty())
+        self.assertEqual(table.hits, 1)
+
+    def test_serial_solve_pruner(self):
+        board = Board.from_grid([
+            [Color('one'), Color('two')],
+            [Color('one'), Color('one')],
+        ])
+        pruner = Pruner()
+
+        self.assertTrue(solve.serial_solve(board, pruner=pruner).is_empty())
+        self.assertEqual(pruner.counts['singleton_color'], 1)
+
+    def test_parallel_solve_solved(self):
+        self.assertEqual(solve.parallel_solve(Board.from_grid([])), Solution(tuple([])))
+
+    def test_parallel_solve_interrupted(self):
+        with mock.patch.object(solve, 'SolveHandle') as mock_handle:
+            mock_handle.return_value.result.side_effect = KeyboardInterrupt
+
+            self.assertRaises(KeyboardInterrupt, solve.parallel_solve, three_color_board)
+            self.assertEqual(mock_handle.return_value.cancel.call_count, 1)
+
+    def test_serial_solve_ordering(self):
+        ordering = mock.MagicMock()
+        ordering.order.side_effect = lambda board, moves: list(reversed(list(moves)))
+        solution = solve.serial_solve(three_color_board, ordering=ordering)
+
+        self.assertFalse(solution.is_empty())
+        self.assertGreater(ordering.order.call_count, 0)
+
+    def test_serial_solve_reduction(self):
+        reduction = SleepSetReduction()
+        solution = solve.serial_solve(three_color_board, reduction=reduction)
+        board = three_color_board
+        for step in solution.get_steps():
+            board = board.pop_from(step)
+
+        self.assertTrue(board.is_solved())
+        self.assertGreater(reduction.skipped, 0)
+
+    def test_serial_solve_endgame(self):
+        endgame = EndgameSolver(max_bricks=30)
+        solution = solve.serial_solve(three_color_board, endgame=endgame)
+        board = three_color_board
+        for step in solution.get_steps():
+            board = board.pop_from(step)
+
+        self.assertTrue(board.is_solved())
+        self.assertGreater(len(endgame), 0)
+
+    def test_serial_solve_reduction_unsolvable(self):
+        board = Board.from_grid([
+            [Color('one'), Color('two')],
+            [Color('one'), Color('two')],
+            [Color('two'), Color('one')],
+        ])
+
+        self.assertEqual(
+            solve.serial_solve(board, reduction=SleepSetReduction()),
+            EmptySolution(),
+        )
+
     def test_load_board(self):
         fixture_path = os.path.join(os.path.dirname(__file__), '../fixtures/3-colors.png')
         board = solve.load_board(fixture_path)
         self.assertEqual(board, three_color_board)
 
+    def test_load_board_stdin(self):
+        fixture_path = os.path.join(os.path.dirname(__file__), '../fixtures/3-colors.png')
+        with open(fixture_path, 'rb') as fixture:
+            stdin = StringIO(fixture.read())
+
+        with mock.patch.object(sys, 'stdin', stdin):
+            self.assertEqual(solve.load_board(solve.STDIN_FILE_NAME), three_color_board)
+
+    def test_load_board_raw(self):
+        fixture_path = os.path.join(os.path.dirname(__file__), '../fixtures/3-colors.png')
+        raw = raw_screencap(cv2.imread(fixture_path, cv2.IMREAD_COLOR))
+        raw_file = tempfile.NamedTemporaryFile(suffix='.raw')
+        raw_file.write(raw)
+        raw_file.flush()
+
+        with raw_file:
+            self.assertEqual(solve.load_board(raw_file.name), three_color_board)
+
+    def test_read_board_rows_raw(self):
+        img = numpy.random.RandomState(0).randint(0, 256, (2560, 1440, 3)).astype(numpy.uint8)
+        expected = img[solve.DEFAULT_GEOMETRY.rows()]
+
+        for header_size in [12, 16]:
+            raw = raw_screencap(img, header_size)
+            # Pipes cannot seek, so the rows in between are read and discarded
+            pipe = mock.MagicMock(spec=['read'])
+            pipe.read.side_effect = StringIO(raw).read
+            for stream in [StringIO(raw), pipe]:
+                rows, geometry = solve.read_board_rows(stream)
+                self.assertTrue(numpy.array_equal(rows, expected))
+                self.assertEqual(geometry, solve.DEFAULT_GEOMETRY)
+
+            self.assertEqual(pipe.read(), '')
+
+    def test_read_board_rows_invalid(self):
+        img = numpy.zeros((solve.IMAGE_BLOCK_START_I, 1440, 3), dtype=numpy.uint8)
+        truncated = raw_screencap(numpy.zeros((2560, 1440, 3), dtype=numpy.uint8))[:1000]
+        unknown_format = numpy.array([1, 1, 5, 0], dtype='<u4').tostring()
+        # A profile that places the board below the bottom of the screenshot
+        profiles = GeometryProfiles(profiles={img.shape[:2]: solve.DEFAULT_GEOMETRY})
+
+        for data in ['', raw_screencap(img), truncated, unknown_format]:
+            self.assertRaises(
+                solve.InvalidScreenshotException,
+                solve.read_board_rows,
+                StringIO(data),
+                profiles,
+            )
+
+    def test_read_board_rows_uncalibrated(self):
+        img = numpy.zeros((1280, 720, 3), dtype=numpy.uint8)
+        img[:, :] = (0xe4, 0xef, 0xf7)
+        profiles = GeometryProfiles()
+
+        self.assertRaises(
+            CalibrationException,
+            solve.read_board_rows,
+            StringIO(raw_screencap(img)),
+            profiles,
+        )
+
+    def test_read_board_rows_calibrates(self):
+        fixture_path = os.path.join(os.path.dirname(__file__), '../fixtures/3-colors.png')
+        img = cv2.resize(cv2.imread(fixture_path, cv2.IMREAD_COLOR), (720, 1280))
+        profiles = GeometryProfiles()
+
+        for data in [raw_screencap(img), cv2.imencode('.png', img)[1].tostring()]:
+            rows, geometry = solve.read_board_rows(StringIO(data), profiles)
+            self.assertEqual(solve.parse_board_rows(rows, geometry), three_color_board)
+            self.assertEqual(profiles.lookup(1280, 720), geometry)
+
+        self.assertEqual(profiles.calibrations, 1)
+
+    def test_decode_screenshot_png(self):
+        fixture_path = os.path.join(os.path.dirname(__file__), '../fixtures/3-colors.png')
+        with open(fixture_path, 'rb') as fixture:
+            img = solve.decode_screenshot(fixture.read())
+
+        self.assertTrue(numpy.array_equal(img, cv2.imread(fixture_path, cv2.IMREAD_COLOR)))
+
+    def test_decode_screenshot_raw(self):
+        bgr = numpy.array([[[1, 2, 3], [4, 5, 6]]], dtype=numpy.uint8)
+        pixels = '\x03\x02\x01\xff\x06\x05\x04\xff'
+        for header in [
+            numpy.array([2, 1, 1], dtype='<u4').tostring(),
+            numpy.array([2, 1, 1, 0], dtype='<u4').tostring(),
+        ]:
+            self.assertTrue(numpy.array_equal(solve.decode_screenshot(header + pixels), bgr))
+
+    def test_decode_screenshot_invalid(self):
+        unknown_format = numpy.array([1, 1, 5], dtype='<u4').tostring() + '\x00' * 4
+        for data in ['', 'not a screenshot', unknown_format, solve.PNG_SIGNATURE + 'corrupt']:
+            self.assertRaises(
+                solve.InvalidScreenshotException,
+                solve.decode_screenshot,
+                data,
+            )
+
+    def test_parse_board(self):
+        img = numpy.zeros((2560, 1440, 3), dtype=numpy.uint8)
+        img[:, :] = (0xe4, 0xef, 0xf7)
+        img[solve.IMAGE_BLOCK_START_I + 9 * solve.IMAGE_BLOCK_OFFSET, solve.IMAGE_BLOCK_START_J] = \
+            (0x11, 0x22, 0x33)
+        board = solve.parse_board(img)
+
+        self.assertEqual(len(board.board), solve.DEFAULT_GEOMETRY.size)
+        self.assertEqual(board.board[9][0], Color('102030'))
+        self.assertTrue(all(
+            color.is_empty()
+            for row in board.board
+            for color in row
+            if color != Color('102030')
+        ))
+
+    def test_parse_board_unmatched_bounded(self):
+        # Unmatched pixels are quantized, so that noise never creates more than a bounded number
+        # of colors
+        rng = numpy.random.RandomState(0)
+        names = set()
+        for _ in range(5):
+            rows = rng.randint(0, 256, (10, 1440, 3)).astype(numpy.uint8)
+            board = solve.parse_board_rows(rows, classifier=ColorClassifier(color_codes=()))
+            names.update(
+                color.name for row in board.board for color in row if not color.is_empty()
+            )
+
+        self.assertGreater(len(names), 100)
+        self.assertTrue(all(int(name, 16) & 0x0f0f0f == 0 for name in names))
+
+    def test_parse_board_noisy(self):
+        fixture_path = os.path.join(os.path.dirname(__file__), '../fixtures/3-colors.png')
+        img = cv2.imread(fixture_path, cv2.IMREAD_COLOR)
+        noise = numpy.random.RandomState(0).randint(-10, 11, img.shape)
+        noisy = numpy.clip(img.astype(int) + noise, 0, 255).astype(numpy.uint8)
+
+        self.assertEqual(solve.parse_board(noisy), three_color_board)
+        self.assertEqual(
+            solve.parse_board(noisy, classifier=ColorClassifier(patch_radius=4)),
+            three_color_board,
+        )
+
     def test_simulate_touch_events(self):
         solution = (Coordinate(0, 0),)
         with mock.patch.object(subprocess, 'call') as mock_subprocess, suppress_stdout():
@@ -64,37 +320,77 @@ class TestSolve(unittest.TestCase):
             mock_subprocess.assert_any_call(['sleep', '1.2'])
 
     def test_solve_valid(self):
+        geometry = GridGeometry(600, 60, 120)
+        screenshot = (mock.MagicMock(), geometry)
         mock_solution = Solution((Coordinate(0, 0),))
         patch = mock.patch.object
 
-        with patch(solve, 'load_board') as mock_load_board, \
+        with patch(solve, 'load_screenshot', return_value=screenshot) as mock_load, \
                 patch(solve, 'parallel_solve', return_value=mock_solution) as mock_parallel_solve, \
                 patch(solve, 'simulate_touch_events') as mock_simulate_touch_events, \
                 patch(sys, 'exit') as mock_exit, \
                 suppress_stdout():
             solve.solve('file name')
 
-            mock_load_board.assert_called_with('file name')
+            self.assertEqual(mock_load.call_args[0][0], 'file name')
             self.assertEqual(mock_parallel_solve.call_count, 1)
             self.assertEqual(mock_exit.call_count, 0)
-            mock_simulate_touch_events.assert_called_with((Coordinate(0, 0),))
+            mock_simulate_touch_events.assert_called_with((Coordinate(0, 0),), geometry)
 
     def test_solve_unsolvable(self):
+        geometry = GridGeometry(600, 60, 120)
+        screenshot = (mock.MagicMock(), geometry)
         mock_solution = EmptySolution()
         patch = mock.patch.object
 
-        with patch(solve, 'load_board') as mock_load_board, \
+        with patch(solve, 'load_screenshot', return_value=screenshot) as mock_load, \
                 patch(solve, 'parallel_solve', return_value=mock_solution) as mock_parallel_solve, \
                 patch(solve, 'simulate_touch_events') as mock_simulate_touch_events, \
                 patch(sys, 'exit') as mock_exit, \
                 suppress_stdout():
             solve.solve('file name')
 
-            mock_load_board.assert_called_with('file name')
+            self.assertEqual(mock_load.call_args[0][0], 'file name')
             self.assertEqual(mock_parallel_solve.call_count, 1)
             self.assertEqual(mock_exit.call_count, 1)
             self.assertEqual(mock_simulate_touch_events.call_count, 0)
 
+    def test_solve_shortest(self):
+        geometry = GridGeometry(600, 60, 120)
+        screenshot = (mock.MagicMock(), geometry)
+        mock_solution = Solution((Coordinate(0, 0),))
+        patch = mock.patch.object
+
+        with patch(solve, 'load_screenshot', return_value=screenshot), \
+                patch(solve, 'parallel_solve') as mock_parallel_solve, \
+                patch(solve, 'parallel_shortest_solve') as mock_shortest, \
+                patch(solve, 'simulate_touch_events') as mock_simulate_touch_events, \
+                suppress_stdout():
+            mock_shortest.return_value = mock_solution
+            solve.solve('file name', shortest=True)
+
+            self.assertEqual(mock_shortest.call_count, 1)
+            self.assertEqual(mock_parallel_solve.call_count, 0)
+            mock_simulate_touch_events.assert_called_with((Coordinate(0, 0),), geometry)
+
+    def test_solve_portfolio(self):
+        geometry = GridGeometry(600, 60, 120)
+        screenshot = (mock.MagicMock(), geometry)
+        mock_result = mock.MagicMock(solution=Solution((Coordinate(0, 0),)), strategy='dfs')
+        patch = mock.patch.object
+        patch_portfolio = mock.patch('portfolio.portfolio_solve', return_value=mock_result)
+
+        with patch(solve, 'load_screenshot', return_value=screenshot), \
+                patch(solve, 'parallel_solve') as mock_parallel_solve, \
+                patch_portfolio as mock_portfolio, \
+                patch(solve, 'simulate_touch_events') as mock_simulate_touch_events, \
+                suppress_stdout():
+            solve.solve('file name', portfolio=True)
+
+            self.assertEqual(mock_portfolio.call_count, 1)
+            self.assertEqual(mock_parallel_solve.call_count, 0)
+            mock_simulate_touch_events.assert_called_with((Coordinate(0, 0),), geometry)
+
     def test_main_insufficient_args(self):
         sys.argv = []
         with mock.patch.object(sys, 'exit') as mock_exit, \
@@ -114,3 +410,33 @@ class TestSolve(unittest.TestCase):
 
             self.assertEqual(mock_exit.call_count, 0)
             mock_solve.assert_called_with('file')
+
+    def test_main_shortest(self):
+        sys.argv = ['python', 'file', '--shortest']
+        with mock.patch.object(sys, 'exit') as mock_exit, \
+                mock.patch.object(solve, 'solve') as mock_solve, \
+                suppress_stdout():
+            solve.main()
+
+            self.assertEqual(mock_exit.call_count, 0)
+            mock_solve.assert_called_with('file', shortest=True)
+
+    def test_main_portfolio(self):
+        sys.argv = ['python', 'file', '--portfolio']
+        with mock.patch.object(sys, 'exit') as mock_exit, \
+                mock.patch.object(solve, 'solve') as mock_solve, \
+                suppress_stdout():
+            solve.main()
+
+            self.assertEqual(mock_exit.call_count, 0)
+            mock_solve.assert_called_with('file', portfolio=True)
+
+    def test_main_recalibrate(self):
+        sys.argv = ['python', 'file', '--shortest', '--recalibrate']
+        with mock.patch.object(sys, 'exit') as mock_exit, \
+                mock.patch.object(solve, 'solve') as mock_solve, \
+                suppress_stdout():
+            solve.main()
+
+            self.assertEqual(mock_exit.call_count, 0)
+            mock_solve.assert_called_with('file', shortest=True, recalibrate=True)
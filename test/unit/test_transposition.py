@@ -0,0 +1,149 @@
+import multiprocessing
+import unittest
+
+from board import Board
+from color import Color
+import transposition
+from transposition import SharedTranspositionTable
+from transposition import TranspositionTable
+
+boards = [Board.from_grid([[Color(str(idx))]]) for idx in range(3)]
+
+
+class TestTranspositionTable(unittest.TestCase):
+    def test_init(self):
+        table = TranspositionTable(max_size=2)
+
+        self.assertEqual(table.max_size, 2)
+        self.assertEqual(len(table), 0)
+        self.assertEqual((table.hits, table.misses, table.evictions), (0, 0, 0))
+
+    def test_lookup_store(self):
+        table = TranspositionTable()
+
+        self.assertFalse(table.lookup(boards[0]))
+        table.store(boards[0])
+        self.assertTrue(table.lookup(boards[0]))
+        self.assertTrue(table.lookup(Board.from_grid([[Color('0')]])))
+        self.assertFalse(table.lookup(boards[1]))
+        self.assertEqual((table.hits, table.misses), (2, 2))
+
+    def test_store_duplicate(self):
+        table = TranspositionTable()
+        table.store(boards[0])
+        table.store(boards[0])
+
+        self.assertEqual(len(table), 1)
+
+    def test_eviction(self):
+        table = TranspositionTable(max_size=2)
+        table.store(boards[0])
+        table.store(boards[1])
+
+        # Looking up the oldest entry makes the other entry the least recently used
+        self.assertTrue(table.lookup(boards[0]))
+        table.store(boards[2])
+
+        self.assertEqual(len(table), 2)
+        self.assertEqual(table.evictions, 1)
+        self.assertTrue(table.lookup(boards[0]))
+        self.assertFalse(table.lookup(boards[1]))
+        self.assertTrue(table.lookup(boards[2]))
+
+    def test_get_put(self):
+        table = TranspositionTable(max_size=2)
+
+        self.assertIsNone(table.get('one'))
+        self.assertEqual(table.get('one', 'default'), 'default')
+        table.put('one', None)
+        table.put('two', (1, 2))
+        self.assertIsNone(table.get('one', 'default'))
+        table.put('three', 3)
+
+        self.assertEqual(table.get('two', 'default'), 'default')
+        self.assertEqual(table.get('three'), 3)
+        self.assertEqual((table.hits, table.misses, table.evictions), (2, 3, 1))
+
+    def test_repr(self):
+        table = TranspositionTable(max_size=2)
+        table.store(boards[0])
+        table.lookup(boards[0])
+
+        self.assertEqual(
+            repr(table),
+            'TranspositionTable(size=1/2, hits=1, misses=0, evictions=0)',
+        )
+        self.assertEqual(str(table), repr(table))
+
+
+class TestSharedTranspositionTable(unittest.TestCase):
+    def test_init(self):
+        table = SharedTranspositionTable(num_slots=16)
+
+        self.assertEqual(table.num_slots, 16)
+        self.assertEqual(len(table), 0)
+        self.assertEqual((table.hits, table.misses, table.evictions), (0, 0, 0))
+
+    def test_lookup_store(self):
+        table = SharedTranspositionTable(num_slots=16)
+
+        self.assertFalse(table.lookup(boards[0]))
+        table.store(boards[0])
+        table.store(boards[0])
+        self.assertTrue(table.lookup(boards[0]))
+        self.assertTrue(table.lookup(Board.from_grid([[Color('0')]])))
+        self.assertFalse(table.lookup(boards[1]))
+        self.assertEqual(len(table), 1)
+        self.assertEqual((table.hits, table.misses), (2, 2))
+
+    def test_bucket_replacement(self):
+        # A table with a single bucket forces every fingerprint to collide
+        table = SharedTranspositionTable(num_slots=transposition.SHARED_TABLE_BUCKET_SIZE)
+        colliding = [
+            Board.from_grid([[Color(str(idx))]])
+            for idx in range(transposition.SHARED_TABLE_BUCKET_SIZE + 1)
+        ]
+        for board in colliding:
+            table.store(board)
+
+        self.assertEqual(len(table), transposition.SHARED_TABLE_BUCKET_SIZE)
+        self.assertEqual(table.evictions, 1)
+        self.assertTrue(table.lookup(colliding[-1]))
+
+    def test_counts_shared(self):
+        table = SharedTranspositionTable(num_slots=16)
+        table.store(boards[0])
+
+        process = multiprocessing.Process(target=table.lookup, args=(boards[0],))
+        process.start()
+        process.join()
+
+        self.assertEqual(table.hits, 1)
+
+    def test_fingerprint_distinct(self):
+        grids = [
+            [[Color(str(one)), Color(str(two))], [Color(str(three)), Color(str(four))]]
+            for one in range(3) for two in range(3) for three in range(3) for four in range(3)
+        ]
+        fingerprints = set(SharedTranspositionTable._fingerprint(Board.from_grid(grid))
+                           for grid in grids)
+
+        self.assertEqual(len(fingerprints), len(grids))
+
+    def test_fingerprint(self):
+        self.assertEqual(
+            SharedTranspositionTable._fingerprint(boards[0]),
+            boards[0].zobrist(),
+        )
+        self.assertEqual(SharedTranspositionTable._fingerprint(Board.from_grid([])), 1)
+
+    def test_repr(self):
+        table = SharedTranspositionTable(num_slots=16)
+        table.store(boards[0])
+        table.lookup(boards[0])
+
+        self.assertEqual(
+            repr(table),
+            'SharedTranspositionTable(size=1/16, hits=1, misses=0, evictions=0)',
+        )
+        self.assertEqual(str(table), repr(table))
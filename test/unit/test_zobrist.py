@@ -0,0 +1,36 @@
+import unittest
+
+import zobrist
+
+
+class TestZobrist(unittest.TestCase):
+    def test_zobrist_key(self):
+        key = zobrist.zobrist_key(1, 2, 3)
+
+        self.assertEqual(key, zobrist.zobrist_key(1, 2, 3))
+        self.assertLessEqual(key, zobrist.ZOBRIST_MASK)
+        self.assertEqual(
+            len(set([
+                zobrist.zobrist_key(column, row, color_index)
+                for column in range(10)
+                for row in range(10)
+                for color_index in range(7)
+            ])),
+            700,
+        )
+
+    def test_zobrist_key_deterministic(self):
+        # Keys must not depend on the order they are first generated in, so that every process
+        # agrees on them
+        key = zobrist.zobrist_key(4, 5, 6)
+        zobrist._zobrist_keys.clear()
+
+        self.assertEqual(zobrist.zobrist_key(4, 5, 6), key)
+
+    def test_mask_zobrist_keys(self):
+        keys = zobrist.mask_zobrist_keys(11, 2, 22)
+
+        self.assertGreaterEqual(len(keys), 22)
+        self.assertEqual(keys[0], zobrist.zobrist_key(0, 0, 2))
+        self.assertEqual(keys[13], zobrist.zobrist_key(1, 2, 2))
+        self.assertIs(zobrist.mask_zobrist_keys(11, 2, 5), keys)